@@ -2,7 +2,8 @@
 
 from importlib.metadata import PackageNotFoundError, version
 
-from pyiges.iges import Iges, read
+from pyiges.batch import convert_many
+from pyiges.iges import Iges, aread, read
 from pyiges.reader import read_as_mesh
 
 try:
@@ -10,4 +11,4 @@ try:
 except PackageNotFoundError:
     __version__ = "unknown"
 
-__all__ = ["read", "read_as_mesh", "Iges", "__version__"]
+__all__ = ["read", "aread", "read_as_mesh", "convert_many", "Iges", "__version__"]
@@ -0,0 +1,7 @@
+"""Run the pyiges command line interface with ``python -m pyiges``."""
+
+import sys
+
+from pyiges.cli import main
+
+sys.exit(main())
@@ -0,0 +1,194 @@
+"""Conversion of many IGES files with a pool of worker processes."""
+
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from tqdm import tqdm
+
+from pyiges import exporters
+from pyiges.iges import Iges
+
+
+def _convert_file(path, output, format, delta):
+    """Convert one file and return its report, catching any error."""
+    report = {"path": path, "output": output, "n_triangles": 0, "error": None}
+    start = time.perf_counter()
+    try:
+        iges = Iges(path)
+        report["read_time"] = time.perf_counter() - start
+        report["n_triangles"] = iges.export(output, format=format, delta=delta)
+    except Exception:
+        report["error"] = traceback.format_exc()
+    report.setdefault("read_time", time.perf_counter() - start)
+    report["time"] = time.perf_counter() - start
+    return report
+
+
+def _failed_report(path, output, error):
+    """Return the report of a file whose worker process died."""
+    return {
+        "path": path,
+        "output": output,
+        "n_triangles": 0,
+        "read_time": 0.0,
+        "time": 0.0,
+        "error": error,
+    }
+
+
+# queue of the indices of the files started by a worker process
+_started = None
+
+
+def _track_started(queue):
+    """Initialize a worker process with the queue of started files."""
+    global _started
+    _started = queue
+
+
+def _convert_tracked(index, *args):
+    """Announce the start of a conversion, then convert the file."""
+    _started.put(index)
+    return _convert_file(*args)
+
+
+def _convert_in_pools(order, paths, outputs, format, delta, workers):
+    """Yield ``(index, report)`` of every file, replacing pools broken by dead workers.
+
+    When a worker process dies, its pool breaks and all unfinished
+    conversions fail.  Files that had not started are submitted to a
+    new pool.  A single file that had started is reported as failed,
+    several are converted again one by one to find the culprit.
+    """
+    rounds = [(list(order), workers)]
+    while rounds:
+        indices, n_workers = rounds.pop(0)
+        started = multiprocessing.SimpleQueue()
+        unfinished = set(indices)
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_track_started, initargs=(started,)
+        ) as executor:
+            futures = {
+                executor.submit(_convert_tracked, i, paths[i], outputs[i], format, delta): i
+                for i in indices
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    report = future.result()
+                except BrokenProcessPool:
+                    # the worker process died, e.g. out of memory
+                    error = traceback.format_exc()
+                    break
+                unfinished.discard(i)
+                yield i, report
+            # conversions that finished before the pool broke
+            for future, i in futures.items():
+                if i in unfinished and future.done() and future.exception() is None:
+                    unfinished.discard(i)
+                    yield i, future.result()
+        if not unfinished:
+            continue
+        suspects = set()
+        while not started.empty():
+            suspects.add(started.get())
+        suspects &= unfinished
+        if len(suspects) > 1:
+            rounds.extend(([i], 1) for i in indices if i in suspects)
+        else:
+            # the culprit, or all files when no conversion could start
+            suspects = suspects or unfinished
+            for i in suspects:
+                yield i, _failed_report(paths[i], outputs[i], error)
+        rest = [i for i in indices if i in unfinished and i not in suspects]
+        if rest:
+            rounds.append((rest, n_workers))
+
+
+def _output_names(paths, out_dir, format):
+    """Return an output filename per path, numbering repeated names."""
+    outputs, seen = [], {}
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        count = seen.get(stem, 0)
+        seen[stem] = count + 1
+        name = f"{stem}_{count}" if count else stem
+        outputs.append(os.path.join(out_dir, f"{name}.{format}"))
+    return outputs
+
+
+def convert_many(paths, out_dir, format="stl", workers=None, delta=0.025, progress=tqdm):
+    """Convert IGES files to mesh files with a pool of worker processes.
+
+    Files are submitted largest first so that the long conversions do
+    not end up last on an otherwise idle pool.  Every worker process
+    imports ``pyiges`` once and is reused for many files.  Errors are
+    recorded in the report of their file instead of stopping the
+    batch.  When a worker process dies, the file it converted is
+    reported as failed and the others are converted in a new pool.
+
+    Parameters
+    ----------
+    paths : sequence[str | os.PathLike]
+        IGES files.
+
+    out_dir : str | os.PathLike
+        Output directory, created if needed.  Each file is written as
+        ``<stem>.<format>``, with a number appended to repeated stems.
+
+    format : str, optional
+        Mesh format, one of ``"stl"``, ``"ply"``, ``"obj"`` or
+        ``"glb"``, see :meth:`pyiges.Iges.export`.
+
+    workers : int, optional
+        Number of worker processes.  Defaults to the number of CPUs.
+        With ``workers=0`` the files are converted in this process.
+
+    delta : float, optional
+        Resolution of the surfaces.
+
+    progress : function, optional
+        Report progress over the converted files, ``tqdm`` by default.
+        See :meth:`pyiges.Iges.to_vtk`.
+
+    Returns
+    -------
+    list[dict]
+        Report per file in the order of ``paths``, with the keys
+        ``"path"``, ``"output"``, ``"n_triangles"``, ``"read_time"``
+        and ``"time"`` in seconds, and ``"error"``, the traceback of
+        the error or ``None``.
+
+    Examples
+    --------
+    >>> import glob
+    >>> reports = pyiges.convert_many(glob.glob("parts/*.igs"), "meshes", workers=64)
+    >>> failed = [report["path"] for report in reports if report["error"]]
+    """
+    if format not in exporters.WRITERS:
+        raise ValueError(
+            f"Unsupported format {format!r}, use one of {', '.join(exporters.WRITERS)}"
+        )
+    paths = [os.fspath(path) for path in paths]
+    outputs = _output_names(paths, os.fspath(out_dir), format)
+    os.makedirs(out_dir, exist_ok=True)
+    order = sorted(
+        range(len(paths)),
+        key=lambda i: os.path.getsize(paths[i]) if os.path.isfile(paths[i]) else 0,
+        reverse=True,
+    )
+
+    reports = [None] * len(paths)
+    if workers == 0:
+        for i in progress(order, desc="Converting files"):
+            reports[i] = _convert_file(paths[i], outputs[i], format, delta)
+        return reports
+
+    results = _convert_in_pools(order, paths, outputs, format, delta, workers)
+    for i, report in progress(results, total=len(paths), desc="Converting files"):
+        reports[i] = report
+    return reports
@@ -1,21 +1,57 @@
-"""Optional-dependency probes for the ``[full]`` install variant."""
-
-try:
-    import geomdl
-    import pyvista
-    from vtkmodules.vtkFiltersCore import vtkAppendPolyData
-
-    _IS_FULL_MODULE = True
-except (ModuleNotFoundError, ImportError) as exc:
-    pyvista = None
-    geomdl = None
-    vtkAppendPolyData = None
-    _IS_FULL_MODULE = False
-    _PROBLEM_MSG = (
-        "Import from '{}' failed, to support this feature please install pyiges[full]".format(
-            exc.name
+"""Optional-dependency probes for the ``[full]`` install variant.
+
+The dependencies are imported on first use, so reading, writing and
+exporting files never imports ``pyvista`` or VTK.  ``geomdl`` and
+``vtkAppendPolyData`` are resolved on first access and are ``None``
+when the ``[full]`` variant is not installed.
+"""
+
+import functools
+import importlib
+
+
+class _LazyModule:
+    """Stand-in for an optional module, imported on first attribute access."""
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(importlib.import_module(self._name), attr)
+
+
+pyvista = _LazyModule("pyvista")
+
+
+@functools.lru_cache(maxsize=None)
+def _problem_message():
+    """Import the ``[full]`` dependencies and return why they failed, if they did."""
+    try:
+        import geomdl  # noqa: F401
+        import pyvista  # noqa: F401
+        from vtkmodules.vtkFiltersCore import vtkAppendPolyData  # noqa: F401
+    except (ModuleNotFoundError, ImportError) as exc:
+        return (
+            "Import from '{}' failed, to support this feature please install pyiges[full]".format(
+                exc.name
+            )
         )
-    )
+
+
+def __getattr__(name):
+    if name == "_IS_FULL_MODULE":
+        return _problem_message() is None
+    if name == "_PROBLEM_MSG":
+        return _problem_message()
+    if name == "geomdl":
+        return importlib.import_module("geomdl") if _problem_message() is None else None
+    if name == "vtkAppendPolyData":
+        if _problem_message() is not None:
+            return None
+        from vtkmodules.vtkFiltersCore import vtkAppendPolyData
+
+        return vtkAppendPolyData
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def assert_full_module_variant(inner_func):
@@ -27,8 +63,9 @@ def assert_full_module_variant(inner_func):
     """
 
     def safe_func(*a, **kw):
-        if not _IS_FULL_MODULE:
-            raise Exception(_PROBLEM_MSG)
+        problem = _problem_message()
+        if problem is not None:
+            raise Exception(problem)
         return inner_func(*a, **kw)
 
     return safe_func
@@ -0,0 +1,94 @@
+"""Command line interface of pyiges.
+
+Examples
+--------
+Split a model into four self-contained IGES files for parallel
+processing.
+
+.. code:: bash
+
+   $ pyiges shard impeller.igs -n 4 -o shards
+
+Convert many files to STL with eight worker processes.
+
+.. code:: bash
+
+   $ pyiges convert parts/*.igs -o meshes -f stl -j 8
+"""
+
+import argparse
+import os
+import sys
+
+from pyiges import exporters
+from pyiges.batch import convert_many
+from pyiges.iges import read
+
+
+def _shard(args):
+    iges = read(args.filename)
+    stem = os.path.splitext(os.path.basename(args.filename))[0]
+    os.makedirs(args.output, exist_ok=True)
+    filenames = [os.path.join(args.output, f"{stem}_{i}.igs") for i in range(args.n)]
+    for shard, filename in zip(iges.shard(args.n, filenames), filenames):
+        print(f"{filename}: {len(shard)} entities")
+
+
+def _convert(args):
+    reports = convert_many(args.filenames, args.output, args.format, args.workers, args.delta)
+    for report in reports:
+        if report["error"]:
+            print(f"{report['path']}: failed\n{report['error']}")
+        else:
+            print(
+                f"{report['output']}: {report['n_triangles']} triangles in {report['time']:.2f} s"
+            )
+    return 1 if any(report["error"] for report in reports) else 0
+
+
+def main(argv=None):
+    """Run the ``pyiges`` command.
+
+    Parameters
+    ----------
+    argv : list[str], optional
+        Command line arguments.  Defaults to ``sys.argv[1:]``.
+
+    Returns
+    -------
+    int
+        Exit status, 1 if any file failed to convert.
+    """
+    parser = argparse.ArgumentParser(prog="pyiges", description="Pythonic IGES reader")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    shard = commands.add_parser(
+        "shard", help="split a model into dependency-closed IGES files, see Iges.shard"
+    )
+    shard.add_argument("filename", help="IGES file")
+    shard.add_argument("-n", type=int, default=2, help="number of shards (default: 2)")
+    shard.add_argument("-o", "--output", default=".", help="output directory (default: .)")
+    shard.set_defaults(func=_shard)
+
+    convert = commands.add_parser(
+        "convert", help="convert files to meshes with a process pool, see convert_many"
+    )
+    convert.add_argument("filenames", nargs="+", help="IGES files")
+    convert.add_argument("-o", "--output", default=".", help="output directory (default: .)")
+    convert.add_argument(
+        "-f", "--format", default="stl", choices=list(exporters.WRITERS), help="(default: stl)"
+    )
+    convert.add_argument(
+        "-j", "--workers", type=int, default=None, help="worker processes (default: CPUs)"
+    )
+    convert.add_argument(
+        "-d", "--delta", type=float, default=0.025, help="surface resolution (default: 0.025)"
+    )
+    convert.set_defaults(func=_convert)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,45 @@
 """Module for the entity class."""
 
 import os
+import re
 
 from pyiges.constants import line_font_pattern
 
+# count and type letter at the start of a Hollerith string field
+_HOLLERITH = re.compile(r" *(\d+)H")
+
+
+def _split_fields(text, param_sep):
+    """Split the parameter data of a record into its fields.
+
+    Unlike ``str.split``, delimiters inside Hollerith strings such as
+    ``12HHello, World`` do not end a field.
+
+    Parameters
+    ----------
+    text : str
+        Parameter data without the record delimiter.
+
+    param_sep : str
+        Parameter delimiter.
+
+    Returns
+    -------
+    list[str]
+        Fields including their surrounding spaces.
+    """
+    if "H" not in text:
+        return text.split(param_sep)
+    fields, start = [], 0
+    while True:
+        match = _HOLLERITH.match(text, start)
+        end = text.find(param_sep, match.end() + int(match.group(1)) if match else start)
+        if end < 0:
+            fields.append(text[start:])
+            return fields
+        fields.append(text[start:end])
+        start = end + 1
+
 
 class Entity:
     """Generic IGES entity.
@@ -26,7 +62,7 @@ class Entity:
     0
     None
     None
-    0
+    None
     200
     0
     8
@@ -47,16 +83,18 @@ class Entity:
         space-padded 2-digit values that must be normalised before
         casting to ``int``.
         """
-        string = string.strip()
+        raw, string = string, string.strip()
         if type == "string":
             self.d[key] = string
         else:
             # Status numbers are made of four 2-digit numbers, together making an 8-digit number.
             # It includes spaces, so  0 0 0 0 is a valid 8-digit for which int casting won't work.
             if key == "status_number":
-                # Get a list of four 2-digit numbers with spaces removed.
+                # Get a list of four 2-digit numbers with spaces removed, keeping the
+                # columns of the field since its leading digits may be blank.
+                raw = raw.rjust(8)
                 separated_status_numbers = [
-                    string[i : i + 2].replace(" ", "0") for i in range(0, len(string), 2)
+                    raw[i : i + 2].replace(" ", "0") for i in range(0, len(raw), 2)
                 ]
 
                 # Join these status numbers together as a single string.
@@ -90,5 +128,80 @@ class Entity:
 
         return s
 
+    @property
+    def bounds(self):
+        """Bounds of the entity as ``(xmin, xmax, ymin, ymax, zmin, zmax)``.
+
+        ``None`` for entities without supported geometry.
+        """
+        return None
+
     def _add_parameters(self, parameters):
         self.parameters.append(parameters)
+
+    def _directory_pointers(self):
+        """Return the directory pointers held in the directory entry.
+
+        The structure, line font, level and color fields reference an
+        entity when negative, the view, transform and label display
+        fields when positive.
+        """
+        pointers = []
+        for key in ("structure", "line_font_pattern", "level", "color_number"):
+            if self.d.get(key) is not None and self.d[key] < 0:
+                pointers.append(-self.d[key])
+        for key in ("view", "transform", "label_assoc"):
+            if self.d.get(key):
+                pointers.append(self.d[key])
+        return pointers
+
+    def _fields(self):
+        """Return the parameter fields with Hollerith strings kept whole.
+
+        The reader splits the parameter data on every delimiter, also
+        inside strings.  The positions of :func:`_pointer_fields` index
+        these fields instead.
+        """
+        param_sep = self.iges._separators[0]
+        return _split_fields(param_sep.join(self.parameters[0]), param_sep)
+
+    def _pointer_fields(self):
+        """Return the positions of the pointers in the parameter data.
+
+        Entities parsed into a dedicated class override this.  Here only
+        the generic entities with a fixed pointer layout are handled:
+        curves on surfaces (142), trimmed surfaces (144), subfigure
+        definitions (308) and singular subfigure instances (408).
+        Entities with a malformed pointer count have no pointers.
+        """
+        if not self.parameters:
+            return []
+        entity_type = self.d.get("entity_type_number")
+        if entity_type not in (142, 144, 308, 408):
+            return []
+        fields = self._fields()
+        try:
+            if entity_type == 142:
+                positions = [2, 3, 4]
+            elif entity_type == 144:
+                positions = [1, 4, *range(5, 5 + int(fields[3]))]
+            elif entity_type == 308:
+                positions = list(range(4, 4 + int(fields[3])))
+            else:
+                positions = [1]
+        except (IndexError, ValueError):
+            return []
+        return [position for position in positions if position < len(fields)]
+
+    def _parameter_pointers(self):
+        """Return the directory pointers held in the parameter data."""
+        positions = self._pointer_fields()
+        if not positions:
+            return []
+        fields = self._fields()
+        pointers = []
+        for position in positions:
+            field = fields[position].strip()
+            if field and int(field) > 0:
+                pointers.append(int(field))
+        return pointers
@@ -0,0 +1,237 @@
+"""Streaming writers for triangle mesh file formats.
+
+The writers consume the ``(points, cells, entity_ids)`` blocks yielded
+by :meth:`pyiges.Iges.iter_tessellation` and only need ``numpy``, so
+meshes can be exported in the minimal install without ``pyvista``.
+Only triangle blocks are written.
+"""
+
+import json
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+
+
+def _triangle_blocks(blocks):
+    """Yield the ``(points, triangles)`` of the triangle blocks."""
+    for points, cells, _ in blocks:
+        if cells.shape[1] == 3 and len(cells):
+            yield points, cells
+
+
+def write_stl(file, blocks):
+    """Write triangle blocks as binary STL.
+
+    Parameters
+    ----------
+    file : file object
+        Seekable binary file.  The triangle count in the header is
+        written once all blocks have been consumed.
+
+    blocks : iterable
+        ``(points, cells, entity_ids)`` blocks.
+
+    Returns
+    -------
+    int
+        Number of triangles written.
+    """
+    dtype = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")])
+    start = file.tell()
+    file.write(b"pyiges binary STL".ljust(80, b" "))
+    file.write(struct.pack("<I", 0))
+
+    n_triangles = 0
+    for points, triangles in _triangle_blocks(blocks):
+        corners = points[triangles]
+        normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        norm = np.linalg.norm(normals, axis=1, keepdims=True)
+        records = np.zeros(len(triangles), dtype=dtype)
+        records["normal"] = np.divide(normals, norm, out=np.zeros_like(normals), where=norm > 0)
+        records["vertices"] = corners
+        file.write(records.tobytes())
+        n_triangles += len(triangles)
+
+    end = file.tell()
+    file.seek(start + 80)
+    file.write(struct.pack("<I", n_triangles))
+    file.seek(end)
+    return n_triangles
+
+
+def write_ply(file, blocks):
+    """Write triangle blocks as binary little endian PLY.
+
+    Vertices are written directly and faces are buffered in a
+    temporary file, then appended.  The element counts in the header
+    are zero padded so they can be filled in at the end.
+
+    Parameters
+    ----------
+    file : file object
+        Seekable binary file.
+
+    blocks : iterable
+        ``(points, cells, entity_ids)`` blocks.
+
+    Returns
+    -------
+    int
+        Number of triangles written.
+    """
+    face_dtype = np.dtype([("count", "u1"), ("vertices", "<i4", (3,))])
+    header = (
+        "ply\n"
+        "format binary_little_endian 1.0\n"
+        "comment written by pyiges\n"
+        "element vertex {:010d}\n"
+        "property float x\n"
+        "property float y\n"
+        "property float z\n"
+        "element face {:010d}\n"
+        "property list uchar int vertex_indices\n"
+        "end_header\n"
+    )
+    start = file.tell()
+    file.write(header.format(0, 0).encode("ascii"))
+
+    n_points = n_triangles = 0
+    with tempfile.TemporaryFile() as faces:
+        for points, triangles in _triangle_blocks(blocks):
+            file.write(points.astype("<f4").tobytes())
+            records = np.empty(len(triangles), dtype=face_dtype)
+            records["count"] = 3
+            records["vertices"] = triangles + n_points
+            faces.write(records.tobytes())
+            n_points += len(points)
+            n_triangles += len(triangles)
+
+        faces.seek(0)
+        shutil.copyfileobj(faces, file)
+
+    end = file.tell()
+    file.seek(start)
+    file.write(header.format(n_points, n_triangles).encode("ascii"))
+    file.seek(end)
+    return n_triangles
+
+
+def write_obj(file, blocks):
+    """Write triangle blocks as Wavefront OBJ.
+
+    Each block's vertices are written before its faces, so the file
+    is produced in a single pass.
+
+    Parameters
+    ----------
+    file : file object
+        Binary file.
+
+    blocks : iterable
+        ``(points, cells, entity_ids)`` blocks.
+
+    Returns
+    -------
+    int
+        Number of triangles written.
+    """
+    file.write(b"# written by pyiges\n")
+    n_points = n_triangles = 0
+    for points, triangles in _triangle_blocks(blocks):
+        np.savetxt(file, points, fmt="v %.9g %.9g %.9g")
+        np.savetxt(file, triangles + n_points + 1, fmt="f %d %d %d")
+        n_points += len(points)
+        n_triangles += len(triangles)
+    return n_triangles
+
+
+def write_glb(file, blocks):
+    """Write triangle blocks as a binary glTF 2.0 (GLB) mesh.
+
+    Positions and indices are buffered in temporary files while the
+    blocks are consumed, since the JSON chunk describing them has to
+    precede the binary data.
+
+    Parameters
+    ----------
+    file : file object
+        Binary file.
+
+    blocks : iterable
+        ``(points, cells, entity_ids)`` blocks.
+
+    Returns
+    -------
+    int
+        Number of triangles written.
+    """
+    n_points = n_triangles = 0
+    lower = np.full(3, np.inf)
+    upper = np.full(3, -np.inf)
+    with tempfile.TemporaryFile() as positions, tempfile.TemporaryFile() as indices:
+        for points, triangles in _triangle_blocks(blocks):
+            points = points.astype("<f4")
+            lower = np.minimum(lower, points.min(axis=0))
+            upper = np.maximum(upper, points.max(axis=0))
+            positions.write(points.tobytes())
+            indices.write((triangles + n_points).astype("<u4").tobytes())
+            n_points += len(points)
+            n_triangles += len(triangles)
+
+        positions_length = 12 * n_points
+        indices_length = 12 * n_triangles
+        gltf = {
+            "asset": {"version": "2.0", "generator": "pyiges"},
+            "scene": 0,
+            "scenes": [{"nodes": [0]}],
+            "nodes": [{"mesh": 0}],
+            "meshes": [{"primitives": [{"attributes": {"POSITION": 0}, "indices": 1}]}],
+            "buffers": [{"byteLength": positions_length + indices_length}],
+            "bufferViews": [
+                {"buffer": 0, "byteOffset": 0, "byteLength": positions_length, "target": 34962},
+                {
+                    "buffer": 0,
+                    "byteOffset": positions_length,
+                    "byteLength": indices_length,
+                    "target": 34963,
+                },
+            ],
+            "accessors": [
+                {
+                    "bufferView": 0,
+                    "componentType": 5126,
+                    "count": n_points,
+                    "type": "VEC3",
+                    "min": lower.tolist() if n_points else [0, 0, 0],
+                    "max": upper.tolist() if n_points else [0, 0, 0],
+                },
+                {
+                    "bufferView": 1,
+                    "componentType": 5125,
+                    "count": 3 * n_triangles,
+                    "type": "SCALAR",
+                },
+            ],
+        }
+        content = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+        content += b" " * (-len(content) % 4)
+        binary_length = positions_length + indices_length
+
+        file.write(struct.pack("<4sII", b"glTF", 2, 28 + len(content) + binary_length))
+        file.write(struct.pack("<I4s", len(content), b"JSON"))
+        file.write(content)
+        file.write(struct.pack("<I4s", binary_length, b"BIN\0"))
+        for chunk in (positions, indices):
+            chunk.seek(0)
+            shutil.copyfileobj(chunk, file)
+    return n_triangles
+
+
+WRITERS = {
+    "stl": write_stl,
+    "ply": write_ply,
+    "obj": write_obj,
+    "glb": write_glb,
+}
@@ -1,9 +1,13 @@
 """IGES entity classes for points, curves, surfaces, and B-Rep elements."""
 
+import abc
+import functools
 import os
+import warnings
 
 import numpy as np
 
+from pyiges import nurbs
 from pyiges.check_imports import assert_full_module_variant
 from pyiges.check_imports import pyvista as pv
 from pyiges.entity import Entity
@@ -22,6 +26,89 @@ def parse_float(str_value):
         return float(str_value.lower().replace("d", "e"))
 
 
+def _bounds_from_points(points):
+    """Return the bounds of an ``(n, 3)`` array of points in ``pyvista`` order."""
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    bounds = np.empty(6)
+    bounds[::2] = points.min(axis=0)
+    bounds[1::2] = points.max(axis=0)
+    return tuple(bounds)
+
+
+def _grid_triangles(n_u, n_v):
+    """Return two triangles per quad of a grid with ``u`` varying fastest.
+
+    The triangles are ordered counterclockwise around ``S_u x S_v``.
+    """
+    row, col = np.meshgrid(np.arange(n_v - 1), np.arange(n_u - 1), indexing="ij")
+    v1 = (col + row * n_u).ravel()
+    v2 = v1 + n_u
+    return np.column_stack((v1, v1 + 1, v2 + 1, v1, v2 + 1, v2)).reshape(-1, 3)
+
+
+def _sample_count(delta):
+    """Return the number of samples per direction for a resolution ``delta``."""
+    return max(int(1 / delta + 0.5), 2)
+
+
+def _grid_mesh(points, n_u, n_v, kind):
+    """Return the ``pyvista`` mesh of an ``n_u`` by ``n_v`` grid of points."""
+    if kind == "structured":
+        mesh = pv.StructuredGrid()
+        mesh.points = points
+        mesh.dimensions = (n_u, n_v, 1)
+        return mesh
+    cells = _grid_triangles(n_u, n_v) if kind == "triangle" else _grid_quads(n_u, n_v)
+    faces = np.column_stack((np.full(len(cells), cells.shape[1]), cells)).ravel()
+    return pv.PolyData(points, faces)
+
+
+def _polyline(points):
+    """Return ``points`` as a ``pyvista.PolyData`` with a single polyline cell."""
+    lines = np.arange(-1, len(points))
+    lines[0] = len(points)
+    return pv.PolyData(points, lines=lines)
+
+
+def _unit_normals(tangent_u, tangent_v):
+    """Return normalized cross products, zero where the surface is degenerate."""
+    normals = np.cross(tangent_u, tangent_v)
+    norm = np.linalg.norm(normals, axis=-1, keepdims=True)
+    return np.divide(normals, norm, out=np.zeros_like(normals), where=norm > 0)
+
+
+def _grid_quads(n_u, n_v):
+    """Return the quads of a grid ordered like :func:`_grid_triangles`."""
+    row, col = np.meshgrid(np.arange(n_v - 1), np.arange(n_u - 1), indexing="ij")
+    v1 = (col + row * n_u).ravel()
+    v2 = v1 + n_u
+    return np.column_stack((v1, v1 + 1, v2 + 1, v2))
+
+
+def _subsample_indices(n_samples, stride):
+    """Return every ``stride``-th grid index, always keeping the last one."""
+    return np.unique(np.append(np.arange(0, n_samples, stride), n_samples - 1))
+
+
+def _subsample_error(grid, kept, axis):
+    """Return how far a grid deviates from its subsampling along one axis.
+
+    The grid lines ``kept`` along ``axis`` are linearly interpolated
+    back to every grid point and the largest distance is returned.
+    Since bilinear interpolation does not increase the maximum, the
+    sum of the errors along both axes bounds the error of subsampling
+    both at once.
+    """
+    n_samples = grid.shape[axis]
+    index = np.arange(n_samples)
+    cell = np.clip(np.searchsorted(kept, index, side="right") - 1, 0, len(kept) - 2)
+    t = (index - kept[cell]) / (kept[cell + 1] - kept[cell])
+    start = np.take(grid, kept[cell], axis=axis)
+    end = np.take(grid, kept[cell + 1], axis=axis)
+    t = t.reshape((-1, 1, 1) if axis == 0 else (1, -1, 1))
+    return np.linalg.norm(grid - start - (end - start) * t, axis=2).max()
+
+
 class Point(Entity):
     """IGES Point."""
 
@@ -30,6 +117,10 @@ class Point(Entity):
         self._x = parse_float(parameters[1])
         self._y = parse_float(parameters[2])
         self._z = parse_float(parameters[3])
+        # optional pointer to a subfigure used as display symbol
+        self.symbol_pointer = (
+            int(parameters[4]) if len(parameters) > 4 and parameters[4].strip() else 0
+        )
 
     @property
     def x(self):
@@ -46,11 +137,19 @@ class Point(Entity):
         """Z coordinate."""
         return self._z
 
+    def _pointer_fields(self):
+        return [4] if self.symbol_pointer else []
+
     @property
     def coordinate(self):
         """Coordinate of the point as a numpy array."""
         return np.array([self._x, self._y, self._z])
 
+    @property
+    def bounds(self):
+        """Bounds of the point as ``(xmin, xmax, ymin, ymax, zmin, zmax)``."""
+        return (self._x, self._x, self._y, self._y, self._z, self._z)
+
     def __repr__(self):
         """Return a multi-line string with the point coordinates."""
         s = "--- IGES Point ---" + os.linesep
@@ -90,6 +189,21 @@ class Line(Entity):
         """Starting and ending point of the line as a ``numpy`` array."""
         return np.array([[self._x1, self._y1, self._z1], [self._x2, self._y2, self._z2]])
 
+    @property
+    def bounds(self):
+        """Bounds of the line as ``(xmin, xmax, ymin, ymax, zmin, zmax)``."""
+        return _bounds_from_points(self.coordinates)
+
+    def length(self):
+        """Return the length of the line segment."""
+        start, end = self.coordinates
+        return np.linalg.norm(end - start)
+
+    def _sample(self, n_samples):
+        """Return ``n_samples`` evenly spaced points from start to end."""
+        start, end = self.coordinates
+        return start + np.linspace(0, 1, n_samples)[:, None] * (end - start)
+
     def __repr__(self):
         """Return a multi-line string with the line endpoints."""
         s = "--- IGES Line ---" + os.linesep
@@ -190,8 +304,9 @@ class ConicArc(Entity):
 
     Arc defined by the equation
     ``A*x**2 + B*x*y + C*y**2 + D*x + E*y + F = 0``
-    with a Transformation Matrix (Entity 124). Can define an ellipse,
-    parabola, or hyperbola.
+    in the plane ``z = ZT`` with a Transformation Matrix (Entity 124).
+    Can define an ellipse, parabola, or hyperbola.  Elliptical arcs run
+    counterclockwise from the start to the end point.
     """
 
     # The definitions of the terms ellipse, parabola, and hyperbola
@@ -208,7 +323,7 @@ class ConicArc(Entity):
     # A parabola if Q2 = 0 and Q1 != 0.
 
     def _add_parameters(self, parameters):
-        """Parse the six conic coefficients and two endpoints.
+        """Parse the six conic coefficients, the plane and two endpoints.
 
         Index	Type	Name	Description
         1	REAL	A	coefficient of xt^2
@@ -217,60 +332,246 @@ class ConicArc(Entity):
         4	REAL	D	coefficient of xt
         5	REAL	E	coefficient of yt
         6	REAL	F	scalar coefficient
-        7	REAL	X1	x coordinate of start point
-        8	REAL	Y1	y coordinate of start point
-        9	REAL	Z1	z coordinate of start point
+        7	REAL	ZT	z coordinate of the plane of definition
+        8	REAL	X1	x coordinate of start point
+        9	REAL	Y1	y coordinate of start point
         10	REAL	X2	x coordinate of end point
         11	REAL	Y2	y coordinate of end point
-        12	REAL	Z2	z coordinate of end point
         """
         super()._add_parameters(parameters)
-        self.a = parameters[1]  #  coefficient of xt^2
-        self.b = parameters[2]  #  coefficient of xtyt
-        self.c = parameters[3]  #  coefficient of yt^2
-        self.d = parameters[4]  #  coefficient of xt
-        self.e = parameters[5]  #  coefficient of yt
-        self.f = parameters[6]  #  scalar coefficient
-        self.x1 = parameters[7]  #  x coordinate of start point
-        self.y1 = parameters[8]  #  y coordinate of start point
-        self.z1 = parameters[9]  #  z coordinate of start point
-        self.x2 = parameters[10]  #  x coordinate of end point
-        self.y2 = parameters[11]  #  y coordinate of end point
-        self.z2 = parameters[12]  #  z coordinate of end point
+        # A to F, not stored as attributes since ``d`` holds the directory entry
+        self._coefficients = np.array([parse_float(param) for param in parameters[1:7]])
+        self.z = parse_float(parameters[7])  #  z coordinate of the plane
+        self.x1 = parse_float(parameters[8])  #  x coordinate of start point
+        self.y1 = parse_float(parameters[9])  #  y coordinate of start point
+        self.x2 = parse_float(parameters[10])  #  x coordinate of end point
+        self.y2 = parse_float(parameters[11])  #  y coordinate of end point
+        self._transform = self.d.get("transform", None)
+
+    @property
+    def coefficients(self):
+        """Coefficients ``(A, B, C, D, E, F)`` of the conic equation."""
+        return self._coefficients
+
+    @property
+    def conic_type(self):
+        """Type of the parent conic, ``"ellipse"``, ``"hyperbola"`` or ``"parabola"``.
+
+        Classified by the invariants ``Q1``, ``Q2`` and ``Q3`` of the
+        IGES specification.  ``None`` for degenerate conics.
+        """
+        return _classify_conics(self.coefficients[None])[0]
+
+    @property
+    def transform(self):
+        """Return the referenced :class:`Transformation` entity, if any."""
+        if self._transform:
+            return self.iges[self._transform]
+
+    @property
+    def bounds(self):
+        """Bounds of the arc as ``(xmin, xmax, ..., zmax)``.
+
+        Computed from a dense sampling, padded by an eighth of the
+        longest chord so that they enclose the arc between samples.
+        """
+        points = self.tessellate(256)
+        pad = np.linalg.norm(np.diff(points, axis=0), axis=1).max() / 8
+        bounds = np.array(_bounds_from_points(points))
+        return tuple(bounds + np.tile([-pad, pad], 3))
+
+    def tessellate(self, n_samples=20):
+        """Sample the arc from its start to its end point.
+
+        Parameters
+        ----------
+        n_samples : int, optional
+            Number of points along the arc.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(n_samples, 3)`` array of points, with the transformation
+            applied.
+
+        Examples
+        --------
+        >>> points = conic.tessellate(50)
+        """
+        return conic_arc_points([self], n_samples)[0]
+
+    _sample = tessellate
 
     def __repr__(self):
         """Return a multi-line string with the conic coefficients."""
         info = "Conic Arc\nIGES Type 104\n"
-        info += f"Start:  ({self.x1:f}, {self.y1:f}, {self.z1:f})\n"
-        info += f"End:    ({self.x2:f}, {self.y2:f}, {self.z2:f})\n"
-        info += "Coefficient of x**2: %f" % self.a
-        info += "Coefficient of x*y:  %f" % self.b
-        info += "Coefficient of y**2: %f" % self.c
-        info += "Coefficient of x:    %f" % self.d
-        info += "Coefficient of y:    %f" % self.e
-        info += "Scalar coefficient:  %f" % self.f
+        info += f"Start:  ({self.x1:f}, {self.y1:f}, {self.z:f})\n"
+        info += f"End:    ({self.x2:f}, {self.y2:f}, {self.z:f})\n"
+        a, b, c, d, e, f = self._coefficients
+        info += "Coefficient of x**2: %f\n" % a
+        info += "Coefficient of x*y:  %f\n" % b
+        info += "Coefficient of y**2: %f\n" % c
+        info += "Coefficient of x:    %f\n" % d
+        info += "Coefficient of y:    %f\n" % e
+        info += "Scalar coefficient:  %f" % f
         return info
 
     @assert_full_module_variant
-    def to_vtk(self):
-        """Tessellate the conic arc as a ``pyvista.PolyData`` (not yet implemented)."""
-        # a*x**2 + b*x*y + c*y**2 + d*x + e*y + f = 0
-        # from sympy import Symbol
-        # from sympy.solvers import Solve
-        # a = Symbol('a')
-        # b = Symbol('b')
-        # c = Symbol('c')
-        # d = Symbol('d')
-        # e = Symbol('e')
-        # f = Symbol('f')
-        # x = Symbol('x')
-        # y = Symbol('y')
-        # solve(a*x**2 + b*x*y + c*y**2 + d*x + e*y + f, x)
-
-        # x0 = (-b*y - d + sqrt(-4*a*c*y**2 - 4*a*e*y - 4*a*f + b**2*y**2 + 2*b*d*y + d**2))/(2*a)
-        # x1 = -(b*y + d + sqrt(-4*a*c*y**2 - 4*a*e*y - 4*a*f + b**2*y**2 + 2*b*d*y + d**2))/(2*a)
-
-        raise NotImplementedError("Not yet implemented")
+    def to_vtk(self, n_samples=20):
+        """Tessellate the conic arc as a ``pyvista.PolyData`` polyline.
+
+        Parameters
+        ----------
+        n_samples : int, optional
+            Number of points along the arc.
+
+        Returns
+        -------
+        mesh : ``pyvista.PolyData``
+            ``pyvista`` mesh
+        """
+        return _polyline(self.tessellate(n_samples))
+
+
+def _classify_conics(coefficients):
+    """Return the conic type of every row of ``(A, B, C, D, E, F)`` coefficients."""
+    a, b, c, d, e, f = coefficients.T
+    q1 = np.linalg.det(
+        np.stack(
+            [
+                np.stack([a, b / 2, d / 2], axis=-1),
+                np.stack([b / 2, c, e / 2], axis=-1),
+                np.stack([d / 2, e / 2, f], axis=-1),
+            ],
+            axis=-2,
+        )
+    )
+    q2 = a * c - b**2 / 4
+    q3 = a + c
+    scale = np.abs(coefficients).max(axis=1)
+    scale = np.where(scale > 0, scale, 1)
+    parabola = np.abs(q2) <= 1e-12 * scale**2
+    # Q2 > 0 with Q1 * Q3 > 0 is an imaginary ellipse without real points
+    degenerate = (np.abs(q1) <= 1e-12 * scale**3) | (~parabola & (q2 > 0) & (q1 * q3 > 0))
+    kind = np.where(parabola, "parabola", np.where(q2 > 0, "ellipse", "hyperbola"))
+    return [None if flag else str(name) for name, flag in zip(kind, degenerate)]
+
+
+def conic_arc_points(arcs, n_samples=20):
+    """Sample many conic arcs at once.
+
+    The conics are brought to their principal axes by a batched
+    eigendecomposition of their quadratic forms, sampled by their
+    closed form parametrizations and mapped back, so the work is
+    vectorized over all arcs.  Transformations are applied in a single
+    batch as well.
+
+    * Ellipses are sampled uniformly in the angle ``t`` of
+      ``(a cos(t), b sin(t))``, counterclockwise from start to end.
+      Coincident end points give the full ellipse.
+    * Hyperbolas are sampled uniformly in ``s`` of ``(±a cosh(s),
+      b sinh(s))`` on the branch of the start point.
+    * Parabolas are sampled uniformly along their axis of curvature.
+    * Degenerate conics are sampled as straight lines.
+
+    Parameters
+    ----------
+    arcs : sequence[ConicArc]
+        Conic arcs to sample.
+
+    n_samples : int, optional
+        Number of points per arc.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(len(arcs), n_samples, 3)`` array of points.
+
+    Examples
+    --------
+    >>> from pyiges.geometry import conic_arc_points
+    >>> points = conic_arc_points(iges.conic_arcs(), 50)
+    """
+    n_arcs = len(arcs)
+    coefficients = np.array([arc.coefficients for arc in arcs]).reshape(n_arcs, 6)
+    ends = np.array([[arc.x1, arc.y1, arc.x2, arc.y2] for arc in arcs]).reshape(n_arcs, 2, 2)
+    a, b, c, d, e, f = coefficients.T
+    kinds = np.array(_classify_conics(coefficients), dtype=object)
+    ellipse, hyperbola, parabola = (kinds == kind for kind in ("ellipse", "hyperbola", "parabola"))
+    central = ellipse | hyperbola
+
+    # principal axes as the columns of a proper rotation
+    quadratic = np.stack([np.stack([a, b / 2], -1), np.stack([b / 2, c], -1)], -2)
+    eigenvalues, rotation = np.linalg.eigh(quadratic)
+    rotation[..., 1] *= np.sign(np.linalg.det(rotation))[:, None]
+
+    # center and constant of the central conics in principal axes
+    linear = np.stack([d, e], -1)
+    center = np.zeros((n_arcs, 2))
+    center[central] = np.linalg.solve(quadratic[central], -linear[central, :, None] / 2)[..., 0]
+    constant = f + np.einsum("ij,ij->i", linear, center) / 2
+    local_ends = np.einsum("nji,nkj->nki", rotation, ends - center[:, None])
+
+    t = np.linspace(0, 1, n_samples)
+    local = np.empty((n_arcs, n_samples, 2))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        semi_axes = np.sqrt(np.abs(constant[:, None] / eigenvalues))
+
+        # ellipses: counterclockwise angle from the start to the end point
+        angles = np.arctan2(
+            local_ends[..., 1] / semi_axes[:, 1:], local_ends[..., 0] / semi_axes[:, :1]
+        )
+        sweep = np.mod(angles[:, 1] - angles[:, 0], 2 * np.pi)
+        sweep = np.where(sweep < 1e-12, 2 * np.pi, sweep)
+        angle = angles[:, :1] + sweep[:, None] * t
+        ellipse_points = semi_axes[:, None] * np.stack((np.cos(angle), np.sin(angle)), -1)
+
+        # hyperbolas: the transverse axis is the one crossing the conic
+        transverse = np.where(-constant / eigenvalues[:, 0] > 0, 0, 1)
+        rows = np.arange(n_arcs)
+        conjugate = 1 - transverse
+        lengths_t = semi_axes[rows, transverse]
+        lengths_c = semi_axes[rows, conjugate]
+        branch = np.sign(local_ends[rows, 0, transverse])
+        s = np.arcsinh(local_ends[rows, :, conjugate] / lengths_c[:, None])
+        s = s[:, :1] + (s[:, 1:] - s[:, :1]) * t
+        hyperbola_points = np.empty((n_arcs, n_samples, 2))
+        hyperbola_points[rows, :, transverse] = (branch * lengths_t)[:, None] * np.cosh(s)
+        hyperbola_points[rows, :, conjugate] = lengths_c[:, None] * np.sinh(s)
+
+        # parabolas: lambda X**2 + D' X + E' Y + F = 0 along the curved axis X
+        axis = np.argmax(np.abs(eigenvalues), axis=1)
+        other = 1 - axis
+        linear_local = np.einsum("nji,nj->ni", rotation, linear)
+        x = np.einsum("nkj,nj->nk", ends, rotation[rows, :, axis])
+        x = x[:, :1] + (x[:, 1:] - x[:, :1]) * t
+        y = (
+            -(
+                eigenvalues[rows, axis][:, None] * x**2
+                + linear_local[rows, axis][:, None] * x
+                + f[:, None]
+            )
+            / linear_local[rows, other][:, None]
+        )
+        parabola_points = np.empty((n_arcs, n_samples, 2))
+        parabola_points[rows, :, axis] = x
+        parabola_points[rows, :, other] = y
+
+    local[ellipse] = ellipse_points[ellipse]
+    local[hyperbola] = hyperbola_points[hyperbola]
+    local[parabola] = parabola_points[parabola]
+    points = np.empty((n_arcs, n_samples, 3))
+    points[..., :2] = center[:, None] + np.einsum("nij,nkj->nki", rotation, local)
+    degenerate = ~(central | parabola)
+    points[degenerate, :, :2] = (
+        ends[degenerate, :1] + (ends[degenerate, 1:] - ends[degenerate, :1]) * t[:, None]
+    )
+    points[..., 2] = np.array([arc.z for arc in arcs]).reshape(n_arcs, 1)
+
+    affines = np.array(
+        [np.eye(4) if arc.transform is None else arc.transform.to_affine() for arc in arcs]
+    ).reshape(n_arcs, 4, 4)
+    return np.einsum("nij,nkj->nki", affines[:, :3, :3], points) + affines[:, None, :3, 3]
 
 
 class RationalBSplineCurve(Entity):
@@ -336,6 +637,136 @@ class RationalBSplineCurve(Entity):
             s += f"Unit normal: {self.XNORM} {self.YNORM} {self.ZNORM}"
         return s
 
+    @property
+    def bounds(self):
+        """Bounds of the control polygon as ``(xmin, xmax, ..., zmax)``.
+
+        The curve lies within the convex hull of its control points,
+        so these bounds always enclose the curve.
+        """
+        return _bounds_from_points(self.control_points)
+
+    @property
+    def domain(self):
+        """Parameter range ``(start, end)`` covered by the knot vector."""
+        return nurbs.domain(self.T, self.M)
+
+    def evaluate(self, t):
+        """Evaluate the curve at an array of parameter values.
+
+        Parameters
+        ----------
+        t : array_like
+            Parameter values within :attr:`domain`.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(n, 3)`` curve points.
+        """
+        return self.derivatives(t, 0)[0]
+
+    def derivatives(self, t, order=1):
+        """Evaluate the curve and its derivatives with respect to ``t``.
+
+        Parameters
+        ----------
+        t : array_like
+            Parameter values within :attr:`domain`.
+
+        order : int, optional
+            Highest derivative to compute.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(order + 1, n, 3)`` array, the first entry holds the
+            curve points.
+        """
+        return nurbs.curve_derivatives(self.T, self.M, self.control_points, self.W, t, order)
+
+    def closest_point(self, points, samples_per_span=8, tolerance=1e-9, max_iterations=20):
+        """Project points onto the curve.
+
+        The projection is seeded from the nearest of
+        ``samples_per_span`` evaluated samples per knot span and
+        refined with a Newton iteration vectorized over all points.
+
+        Parameters
+        ----------
+        points : array_like
+            ``(n, 3)`` query points.
+
+        samples_per_span : int, optional
+            Number of seed samples per knot span.  Increase for curves
+            with strongly varying curvature.
+
+        tolerance : float, optional
+            Stop refining a point once its Newton step moves it less
+            than this distance.
+
+        max_iterations : int, optional
+            Maximum number of Newton iterations.
+
+        Returns
+        -------
+        closest : numpy.ndarray
+            ``(n, 3)`` closest points on the curve.
+
+        t : numpy.ndarray
+            ``(n,)`` curve parameters of the closest points.
+
+        distance : numpy.ndarray
+            ``(n,)`` distance between each point and the curve.
+
+        Examples
+        --------
+        >>> curve = iges.bsplines()[0]
+        >>> closest, t, distance = curve.closest_point([[0.5, 0.1, 0.0]])
+        """
+        return nurbs.curve_closest_point(
+            self.T,
+            self.M,
+            self.control_points,
+            self.W,
+            points,
+            samples_per_span,
+            tolerance,
+            max_iterations,
+        )
+
+    def length(self, points_per_span=6):
+        """Return the arc length of the curve.
+
+        Integrated with Gauss–Legendre quadrature over each knot span,
+        so no tessellation is needed.
+
+        Parameters
+        ----------
+        points_per_span : int, optional
+            Number of quadrature points per knot span.
+
+        Returns
+        -------
+        float
+            Length of the curve.
+
+        Examples
+        --------
+        >>> iges.bsplines()[0].length()
+        """
+        return self._length_and_centroid(points_per_span)[0]
+
+    def _length_and_centroid(self, points_per_span=6):
+        """Return the length and the length-weighted centroid of the curve.
+
+        Both come from the same quadrature, which
+        :meth:`pyiges.Iges.geometric_properties` relies on to evaluate
+        every curve once.  The centroid is ``nan`` for a curve of zero
+        length.
+        """
+        return nurbs.curve_length(self.T, self.M, self.control_points, self.W, points_per_span)
+
     @assert_full_module_variant
     def to_geomdl(self):
         """Return a ``geomdl.NURBS.Curve`` built from this entity's parameters."""
@@ -348,6 +779,31 @@ class RationalBSplineCurve(Entity):
         curve.knotvector = self.T  # Set knot vector
         return curve
 
+    def tessellate(self, delta=0.01):
+        """Return points evenly spaced in parameter along the curve.
+
+        Like ``geomdl``, ``round(1 / delta)`` points are evaluated
+        across the domain.  Unlike :func:`to_vtk` this does not require
+        ``pyvista``.
+
+        Parameters
+        ----------
+        delta : float, optional
+            Evaluation delta.  Smaller values give denser
+            tessellations at the cost of compute time.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(n, 3)`` array of polyline points.
+        """
+        n_samples = _sample_count(delta)
+        return self.evaluate(np.linspace(*self.domain, n_samples))
+
+    def _sample(self, n_samples):
+        """Return ``n_samples`` points evenly spaced in the parameter."""
+        return self.evaluate(np.linspace(*self.domain, n_samples))
+
     @assert_full_module_variant
     def to_vtk(self, delta=0.01):
         """Tessellate the curve as a ``pyvista.PolyData`` polyline.
@@ -355,23 +811,10 @@ class RationalBSplineCurve(Entity):
         Parameters
         ----------
         delta : float, optional
-            Evaluation delta passed to ``geomdl``. Smaller values give
-            denser tessellations at the cost of compute time.
+            Evaluation delta, see :func:`tessellate`. Smaller values
+            give denser tessellations at the cost of compute time.
         """
-        # Create a 3-dimensional B-spline Curve
-        curve = self.to_geomdl()
-        curve.delta = delta
-
-        # spline segfaults here sometimes...
-        # return pv.Spline(np.array(curve.evalpts))
-
-        n_points = len(curve.evalpts)
-        faces = np.arange(-1, n_points)
-        faces[0] = n_points
-        line = pv.PolyData()
-        line.points = np.array(curve.evalpts)
-        line.lines = faces
-        return line
+        return _polyline(self.tessellate(delta))
 
 
 class RationalBSplineSurface(Entity):
@@ -510,6 +953,230 @@ class RationalBSplineSurface(Entity):
         """End second parameter value."""
         return self._v1
 
+    @property
+    def bounds(self):
+        """Bounds of the control net as ``(xmin, xmax, ..., zmax)``.
+
+        The surface lies within the convex hull of its control points,
+        so these bounds always enclose the surface.
+        """
+        return _bounds_from_points(self._cp)
+
+    @property
+    def domain(self):
+        """Parameter ranges ``(u_start, u_end, v_start, v_end)``.
+
+        ``u`` is the first and ``v`` the second parametric direction,
+        both taken from the knot sequences.
+        """
+        return nurbs.domain(self._knot1, self._m1) + nurbs.domain(self._knot2, self._m2)
+
+    def _nurbs_args(self):
+        """Return knots, degrees, control net and weights in ``nurbs`` layout."""
+        shape = (self._k2 + 1, self._k1 + 1)
+        return (
+            self._knot1,
+            self._m1,
+            self._knot2,
+            self._m2,
+            self._cp.reshape(shape + (3,)),
+            self._weights.reshape(shape),
+        )
+
+    def _control_net(self):
+        """Return the ``(n_v, n_u, 3)`` control net."""
+        return self._nurbs_args()[4]
+
+    def evaluate(self, u, v):
+        """Evaluate the surface at pairs of parameter values.
+
+        Parameters
+        ----------
+        u, v : array_like
+            Parameter values in the first and second direction, see
+            :attr:`domain`.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(n, 3)`` surface points.
+        """
+        return self.derivatives(u, v, 0)[0, 0]
+
+    def derivatives(self, u, v, order=1):
+        """Evaluate the surface and its partial derivatives.
+
+        Parameters
+        ----------
+        u, v : array_like
+            Parameter values in the first and second direction, see
+            :attr:`domain`.
+
+        order : int, optional
+            Highest total derivative order to compute.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(order + 1, order + 1, n, 3)`` array where ``[k, l]``
+            holds the derivative taken ``k`` times with respect to
+            ``u`` and ``l`` times with respect to ``v``.
+        """
+        u, v = np.broadcast_arrays(np.asarray(u, dtype=float), np.asarray(v, dtype=float))
+        return nurbs.surface_derivatives(*self._nurbs_args(), u.ravel(), v.ravel(), order)
+
+    def closest_point(self, points, samples_per_span=4, tolerance=1e-9, max_iterations=20):
+        """Project points onto the surface.
+
+        The projection is seeded from the nearest point of a coarse
+        grid with ``samples_per_span`` samples per knot span in each
+        direction and refined with a two dimensional Newton iteration
+        vectorized over all points.
+
+        Parameters
+        ----------
+        points : array_like
+            ``(n, 3)`` query points.
+
+        samples_per_span : int, optional
+            Number of seed samples per knot span and direction.
+
+        tolerance : float, optional
+            Stop refining a point once its Newton step moves it less
+            than this distance.
+
+        max_iterations : int, optional
+            Maximum number of Newton iterations.
+
+        Returns
+        -------
+        closest : numpy.ndarray
+            ``(n, 3)`` closest points on the surface.
+
+        uv : numpy.ndarray
+            ``(n, 2)`` surface parameters of the closest points.
+
+        distance : numpy.ndarray
+            ``(n,)`` distance between each point and the surface.
+
+        Examples
+        --------
+        >>> closest, uv, distance = bsurf.closest_point([[-28.0, -13.0, -20.0]])
+        """
+        return nurbs.surface_closest_point(
+            *self._nurbs_args(), points, samples_per_span, tolerance, max_iterations
+        )
+
+    def area(self, points_per_span=6):
+        """Return the area of the untrimmed surface.
+
+        Integrated with Gauss–Legendre quadrature over each pair of
+        knot spans, so no tessellation is needed.
+
+        Parameters
+        ----------
+        points_per_span : int, optional
+            Number of quadrature points per knot span and direction.
+
+        Returns
+        -------
+        float
+            Area of the surface.
+
+        Examples
+        --------
+        >>> bsurf.area()
+        """
+        return self._area_and_centroid(points_per_span)[0]
+
+    def _area_and_centroid(self, points_per_span=6):
+        """Return the area and the area-weighted centroid of the untrimmed surface.
+
+        Like :meth:`RationalBSplineCurve._length_and_centroid`, both
+        come from a single quadrature.
+        """
+        return nurbs.surface_area(*self._nurbs_args(), points_per_span)
+
+    def sample_points(self, n, seed=None, with_normals=True):
+        """Draw points uniformly distributed over the untrimmed surface.
+
+        Parameters are drawn by rejection sampling against a bound of
+        the area element in each parameter cell, see
+        :func:`pyiges.nurbs.surface_sample_parameters`.  No mesh is
+        created.
+
+        Parameters
+        ----------
+        n : int
+            Number of points.
+
+        seed : int | numpy.random.Generator, optional
+            Seed or generator used to draw the samples.
+
+        with_normals : bool, optional
+            Also return the unit normal at each point.
+
+        Returns
+        -------
+        points : numpy.ndarray
+            ``(n, 3)`` sampled points.
+
+        normals : numpy.ndarray
+            ``(n, 3)`` unit normals, only returned when
+            ``with_normals`` is set.
+
+        Examples
+        --------
+        >>> points, normals = bsurf.sample_points(1000, seed=0)
+        """
+        rng = np.random.default_rng(seed)
+        u, v = nurbs.surface_sample_parameters(*self._nurbs_args(), n, rng)
+        ders = self.derivatives(u, v, 1 if with_normals else 0)
+        if not with_normals:
+            return ders[0, 0]
+        return ders[0, 0], _unit_normals(ders[1, 0], ders[0, 1])
+
+    def _evaluate_grid(self, delta, order=0):
+        """Evaluate the surface and its derivatives on a uniform grid.
+
+        Like ``geomdl``, ``round(1 / delta)`` samples are taken across
+        the domain in each direction.
+        """
+        return self._evaluate_samples(_sample_count(delta), order=order)
+
+    def _evaluate_samples(self, n_u, n_v=None, order=0):
+        """Evaluate the surface and its derivatives on an ``n_u`` by ``n_v`` grid."""
+        u_start, u_end, v_start, v_end = self.domain
+        u = np.linspace(u_start, u_end, n_u)
+        v = np.linspace(v_start, v_end, n_u if n_v is None else n_v)
+        return nurbs.surface_grid_derivatives(*self._nurbs_args(), u, v, order)
+
+    def tessellate(self, delta=0.025):
+        """Return a triangulation of the surface as ``numpy`` arrays.
+
+        Unlike :func:`to_vtk` this does not require ``pyvista``.
+
+        Parameters
+        ----------
+        delta : float, optional
+            Resolution of the surface, see :func:`to_vtk`.
+
+        Returns
+        -------
+        points : numpy.ndarray
+            ``(n, 3)`` array of vertices.
+
+        triangles : numpy.ndarray
+            ``(m, 3)`` array of vertex indices.
+
+        Examples
+        --------
+        >>> points, triangles = bsurf.tessellate(delta=0.05)
+        """
+        grid = self._evaluate_grid(delta)[0, 0]
+        n_v, n_u = grid.shape[:2]
+        return grid.reshape(-1, 3), _grid_triangles(n_u, n_v)
+
     def _add_parameters(self, input_parameters):
         super()._add_parameters(input_parameters)
         parameters = np.array([parse_float(param) for param in input_parameters], dtype=float)
@@ -611,7 +1278,7 @@ class RationalBSplineSurface(Entity):
         return surf
 
     @assert_full_module_variant
-    def to_vtk(self, delta=0.025):
+    def to_vtk(self, delta=0.025, normals=False, curvature=False, kind="triangle"):
         """Return a pyvista.PolyData mesh.
 
         Parameters
@@ -620,42 +1287,827 @@ class RationalBSplineSurface(Entity):
             Resolution of the surface.  Higher number result in a
             denser mesh at the cost of compute time.
 
+        normals : bool, optional
+            Add the exact unit surface normals, computed from the
+            partial derivatives, as the active ``"Normals"`` point
+            data.  This makes ``compute_normals`` unnecessary for
+            smooth shading.
+
+        curvature : bool, optional
+            Add the ``"Gaussian Curvature"`` and ``"Mean Curvature"``
+            point data arrays.  As with ``pyvista``'s ``curvature``
+            filter, the mean curvature is positive where the surface
+            bends away from its normals.
+
+        kind : str, optional
+            Cell layout of the mesh.  ``"triangle"`` splits every grid
+            cell into two triangles, ``"quad"`` keeps one quad per cell
+            and ``"structured"`` returns a ``pyvista.StructuredGrid``
+            whose connectivity is implicit in the grid dimensions.
+
         Returns
         -------
-        mesh : ``pyvista.PolyData``
+        mesh : ``pyvista.PolyData`` | ``pyvista.StructuredGrid``
             ``pyvista`` mesh
 
         Examples
         --------
         >>> mesh = bsurf.to_vtk()
         >>> mesh.plot()
-        """
-        surf = self.to_geomdl()
-        # Set evaluation delta
-        surf.delta = delta
 
-        # Evaluate surface points
-        surf.evaluate()
+        Shade with the exact normals and color by curvature
 
-        faces = []
-        for face in surf.faces:
-            faces.extend([3] + face.vertex_ids)
+        >>> mesh = bsurf.to_vtk(normals=True, curvature=True)
+        >>> mesh.plot(scalars="Mean Curvature", smooth_shading=True)
 
-        return pv.PolyData(np.array(surf.vertices), np.array(faces))
+        Return the (u, v) grid without explicit connectivity
 
+        >>> grid = bsurf.to_vtk(kind="structured")
+        """
+        if kind not in ("triangle", "quad", "structured"):
+            raise ValueError(f"Invalid kind '{kind}', expected 'triangle', 'quad' or 'structured'")
+        order = 2 if curvature else 1 if normals else 0
+        ders = self._evaluate_grid(delta, order)
+        n_v, n_u = ders.shape[2:4]
+        ders = ders.reshape(order + 1, order + 1, -1, 3)
+
+        mesh = _grid_mesh(ders[0, 0], n_u, n_v, kind)
+        if normals:
+            mesh.point_data.set_array(_unit_normals(ders[1, 0], ders[0, 1]), "Normals")
+            mesh.point_data.active_normals_name = "Normals"
+        if curvature:
+            gaussian, mean = nurbs.surface_curvature(ders)
+            mesh.point_data.set_array(gaussian, "Gaussian Curvature")
+            mesh.point_data.set_array(mean, "Mean Curvature")
+        return mesh
+
+
+class AnalyticSurface(Entity, abc.ABC):
+    """Base class of the surfaces evaluated in closed form.
+
+    Subclasses build an ``(n_v, n_u, 3)`` grid of points in
+    :func:`_grid`, for example by sampling their defining curves once
+    and combining the samples with ``numpy``.  Tessellation, bounds and
+    the conversion to ``pyvista`` work like those of
+    :class:`RationalBSplineSurface`, so the surfaces take part in
+    :meth:`pyiges.Iges.to_vtk` and the other tessellation methods.
+    """
 
-class CircularArc(Entity):
-    """IGES Type 100 circular arc.
+    @abc.abstractmethod
+    def _grid(self, n_u, n_v):
+        """Return the ``(n_v, n_u, 3)`` grid of points before transformation."""
 
-    Simple circular arc of constant radius. Usually defined with a
-    Transformation Matrix Entity (Type 124).
-    """
+    def _curves(self):
+        """Return the curve entities sampled by :func:`_grid`."""
+        return []
 
-    def _add_parameters(self, parameters):
-        # Index in list    Type of data    Name    Description
-        # 1                REAL            Z       z displacement on XT,YT plane
-        # 2                REAL            X       x coordinate of center
-        # 3                REAL            Y       y coordinate of center
+    @functools.cached_property
+    def _sampleable(self):
+        """Whether all defining curves can be sampled.
+
+        Warns and returns ``False`` when a curve is missing or of a type
+        without a sampling kernel, such as copious data (106).  Such
+        surfaces have no bounds and are left out of tessellation.
+        """
+        try:
+            curves = self._curves()
+        except KeyError:
+            curves = [None]
+        for curve in curves:
+            if not _can_sample(curve):
+                _warn_unsupported(self, curve, "curve")
+                return False
+        return True
+
+    @property
+    def transform(self):
+        """Return the referenced :class:`Transformation` entity, if any."""
+        if self.d.get("transform"):
+            return self.iges[self.d["transform"]]
+
+    def _evaluate_samples(self, n_u, n_v=None, order=0):
+        """Evaluate the surface on an ``n_u`` by ``n_v`` grid.
+
+        Only positions are available, in the layout of
+        :func:`pyiges.nurbs.surface_grid_derivatives`.
+        """
+        if order:
+            raise ValueError(f"{type(self).__name__} does not support derivatives")
+        grid = self._grid(n_u, n_u if n_v is None else n_v)
+        if self.transform is not None:
+            affine = self.transform.to_affine()
+            grid = grid @ affine[:3, :3].T + affine[:3, 3]
+        return grid[None, None]
+
+    def _evaluate_grid(self, delta, order=0):
+        """Evaluate the surface on the uniform grid given by ``delta``."""
+        return self._evaluate_samples(_sample_count(delta), order=order)
+
+    def _control_net(self):
+        """Return a coarse grid of points standing in for a control net."""
+        return self._evaluate_samples(9)[0, 0]
+
+    @property
+    def bounds(self):
+        """Bounds of the surface as ``(xmin, xmax, ..., zmax)``.
+
+        Computed from a ``33`` by ``33`` grid, padded by an eighth of
+        the longest grid edge so that they enclose the surface between
+        samples.
+        """
+        if not self._sampleable:
+            return None
+        grid = self._evaluate_samples(33)[0, 0]
+        edges = np.concatenate(
+            (np.diff(grid, axis=0).reshape(-1, 3), np.diff(grid, axis=1).reshape(-1, 3))
+        )
+        pad = np.linalg.norm(edges, axis=1).max() / 8
+        return tuple(np.array(_bounds_from_points(grid)) + np.tile([-pad, pad], 3))
+
+    def tessellate(self, delta=0.025):
+        """Return a triangulation of the surface as ``numpy`` arrays.
+
+        Parameters
+        ----------
+        delta : float, optional
+            Resolution of the surface, see :func:`to_vtk`.
+
+        Returns
+        -------
+        points : numpy.ndarray
+            ``(n, 3)`` array of vertices.
+
+        triangles : numpy.ndarray
+            ``(m, 3)`` array of vertex indices.
+        """
+        grid = self._evaluate_grid(delta)[0, 0]
+        n_v, n_u = grid.shape[:2]
+        return grid.reshape(-1, 3), _grid_triangles(n_u, n_v)
+
+    @assert_full_module_variant
+    def to_vtk(self, delta=0.025, kind="triangle"):
+        """Return a pyvista.PolyData mesh.
+
+        Parameters
+        ----------
+        delta : float, optional
+            Resolution of the surface.  Higher number result in a
+            denser mesh at the cost of compute time.
+
+        kind : str, optional
+            Cell layout of the mesh, see
+            :func:`RationalBSplineSurface.to_vtk`.
+
+        Returns
+        -------
+        mesh : ``pyvista.PolyData`` | ``pyvista.StructuredGrid``
+            ``pyvista`` mesh
+        """
+        if kind not in ("triangle", "quad", "structured"):
+            raise ValueError(f"Invalid kind '{kind}', expected 'triangle', 'quad' or 'structured'")
+        grid = self._evaluate_grid(delta)[0, 0]
+        n_v, n_u = grid.shape[:2]
+        return _grid_mesh(grid.reshape(-1, 3), n_u, n_v, kind)
+
+
+def _can_sample(curve):
+    """Return whether ``curve`` is an entity with a usable sampling kernel."""
+    return hasattr(curve, "_sample") and getattr(curve, "_sampleable", True)
+
+
+def _warn_unsupported(entity, reference, role):
+    """Warn that ``entity`` leaves out an unsupported or missing ``reference``."""
+    kind = "missing" if reference is None else f"type {reference.d['entity_type_number']}"
+    warnings.warn(
+        f"{type(entity).__name__} at pointer {entity.sequence_number} references an "
+        f"unsupported {role} ({kind}) that is left out"
+    )
+
+
+def _resample_by_length(points, n_samples):
+    """Resample a polyline at ``n_samples`` points evenly spaced by arc length."""
+    length = np.concatenate(([0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))))
+    if length[-1] == 0:
+        return np.repeat(points[:1], n_samples, axis=0)
+    target = np.linspace(0, length[-1], n_samples)
+    return np.column_stack([np.interp(target, length, points[:, i]) for i in range(3)])
+
+
+class Plane(AnalyticSurface):
+    """IGES Type 108 plane.
+
+    The plane ``A*x + B*y + C*z = D``.  A bounded plane (form 1) is
+    tessellated as a fan from the centroid of its bounding curve, which
+    is exact for star shaped boundaries.  An unbounded plane (form 0)
+    is shown as the square of edge length ``SIZE`` around its display
+    symbol location.
+    """
+
+    def _add_parameters(self, parameters):
+        """Parse the plane coefficients, boundary pointer and display symbol.
+
+        Index	Type	Name	Description
+        1	REAL	A	coefficient of x
+        2	REAL	B	coefficient of y
+        3	REAL	C	coefficient of z
+        4	REAL	D	scalar coefficient
+        5	Pointer	PTR	bounding curve, 0 when unbounded
+        6	REAL	X	x coordinate of the display symbol
+        7	REAL	Y	y coordinate of the display symbol
+        8	REAL	Z	z coordinate of the display symbol
+        9	REAL	SIZE	size of the display symbol
+        """
+        super()._add_parameters(parameters)
+        self.coefficients = np.array([parse_float(param) for param in parameters[1:5]])
+        self.curve_pointer = int(parameters[5])
+        self.symbol = np.array([parse_float(param) for param in parameters[6:9]])
+        self.size = parse_float(parameters[9])
+
+    @property
+    def curve(self):
+        """Bounding curve entity, ``None`` for unbounded planes."""
+        if self.curve_pointer:
+            return self.iges[self.curve_pointer]
+
+    def _pointer_fields(self):
+        return [5]
+
+    def _curves(self):
+        return [] if self.curve is None else [self.curve]
+
+    @property
+    def normal(self):
+        """Unit normal ``(A, B, C)`` of the plane."""
+        normal = self.coefficients[:3]
+        return normal / np.linalg.norm(normal)
+
+    def _grid(self, n_u, n_v):
+        if self.curve is not None:
+            boundary = self.curve._sample(n_u)
+            center = boundary[:-1].mean(axis=0)
+            return center + np.linspace(0, 1, n_v)[:, None, None] * (boundary - center)
+
+        # square in the plane around the projection of the display symbol
+        normal = self.normal
+        offset = self.coefficients[3] / np.linalg.norm(self.coefficients[:3])
+        origin = self.symbol - (self.symbol @ normal - offset) * normal
+        axis_u = np.cross(normal, np.eye(3)[np.argmin(np.abs(normal))])
+        axis_u /= np.linalg.norm(axis_u)
+        axis_v = np.cross(normal, axis_u)
+        u = np.linspace(-0.5, 0.5, n_u) * self.size
+        v = np.linspace(-0.5, 0.5, n_v) * self.size
+        return origin + u[None, :, None] * axis_u + v[:, None, None] * axis_v
+
+    def __repr__(self):
+        """Return a multi-line string with the plane equation."""
+        a, b, c, d = self.coefficients
+        info = "Plane\nIGES Type 108\n"
+        info += f"Equation: {a:f}*x + {b:f}*y + {c:f}*z = {d:f}\n"
+        info += "Bounded" if self.curve_pointer else "Unbounded"
+        return info
+
+
+class RuledSurface(AnalyticSurface):
+    """IGES Type 118 ruled surface.
+
+    Straight lines join points of two curves.  Form 0 joins points at
+    equal relative arc length and form 1 at equal relative parameter
+    values.  Both curves are sampled once and blended linearly.
+    """
+
+    def _add_parameters(self, parameters):
+        """Parse the two curve pointers and the direction flags.
+
+        Index	Type	Name	Description
+        1	Pointer	DE1	first curve
+        2	Pointer	DE2	second curve
+        3	INT	DIRFLG	0: join first to first, 1: first to last
+        4	INT	DEVFLG	1: developable, 0: possibly not
+        """
+        super()._add_parameters(parameters)
+        self.curve_pointers = (int(parameters[1]), int(parameters[2]))
+        self.reversed = int(parameters[3]) == 1
+        self.developable = int(parameters[4]) == 1
+
+    @property
+    def curves(self):
+        """The two rail curve entities."""
+        return tuple(self.iges[pointer] for pointer in self.curve_pointers)
+
+    def _pointer_fields(self):
+        return [1, 2]
+
+    def _curves(self):
+        return list(self.curves)
+
+    def _grid(self, n_u, n_v):
+        first, second = self.curves
+        if self.d.get("form_number") == 1:
+            first, second = first._sample(n_u), second._sample(n_u)
+        else:
+            # resample dense samples at equal relative arc length
+            n_dense = 8 * n_u
+            first = _resample_by_length(first._sample(n_dense), n_u)
+            second = _resample_by_length(second._sample(n_dense), n_u)
+        if self.reversed:
+            second = second[::-1]
+        v = np.linspace(0, 1, n_v)[:, None, None]
+        return (1 - v) * first + v * second
+
+    def __repr__(self):
+        """Return a short description of the ruled surface."""
+        return f"Ruled Surface\nIGES Type 118\nCurves: {self.curve_pointers}"
+
+
+class SurfaceOfRevolution(AnalyticSurface):
+    """IGES Type 120 surface of revolution.
+
+    A generatrix curve rotated about an axis line from the start to the
+    terminate angle.  The generatrix is sampled once and all rotations
+    are applied to the samples in a single batch.
+    """
+
+    def _add_parameters(self, parameters):
+        """Parse the axis and generatrix pointers and the angles.
+
+        Index	Type	Name	Description
+        1	Pointer	L	axis of revolution (a line)
+        2	Pointer	C	generatrix curve
+        3	REAL	SA	start angle in radians
+        4	REAL	TA	terminate angle in radians
+        """
+        super()._add_parameters(parameters)
+        self.axis_pointer = int(parameters[1])
+        self.curve_pointer = int(parameters[2])
+        self.start_angle = parse_float(parameters[3])
+        self.terminate_angle = parse_float(parameters[4])
+
+    @property
+    def axis(self):
+        """Axis of revolution as a :class:`Line`."""
+        return self.iges[self.axis_pointer]
+
+    @property
+    def curve(self):
+        """Generatrix curve entity."""
+        return self.iges[self.curve_pointer]
+
+    def _pointer_fields(self):
+        return [1, 2]
+
+    def _curves(self):
+        return [self.axis, self.curve]
+
+    def _grid(self, n_u, n_v):
+        origin, end = self.axis._sample(2)
+        direction = (end - origin) / np.linalg.norm(end - origin)
+        radial = self.curve._sample(n_u) - origin
+        along = (radial @ direction)[:, None] * direction
+        angle = np.linspace(self.start_angle, self.terminate_angle, n_v)[:, None, None]
+        # Rodrigues' rotation of every sample by every angle
+        return (
+            origin
+            + along
+            + (radial - along) * np.cos(angle)
+            + np.cross(direction, radial) * np.sin(angle)
+        )
+
+    def __repr__(self):
+        """Return a short description of the surface of revolution."""
+        info = "Surface of Revolution\nIGES Type 120\n"
+        info += f"Angles: {self.start_angle:f} to {self.terminate_angle:f}"
+        return info
+
+
+class TabulatedCylinder(AnalyticSurface):
+    """IGES Type 122 tabulated cylinder.
+
+    A directrix curve swept along the straight generatrix from the
+    start of the directrix to a terminate point.
+    """
+
+    def _add_parameters(self, parameters):
+        """Parse the directrix pointer and the generatrix terminate point.
+
+        Index	Type	Name	Description
+        1	Pointer	DE	directrix curve
+        2	REAL	LX	x coordinate of the generatrix terminate point
+        3	REAL	LY	y coordinate of the generatrix terminate point
+        4	REAL	LZ	z coordinate of the generatrix terminate point
+        """
+        super()._add_parameters(parameters)
+        self.curve_pointer = int(parameters[1])
+        self.terminate = np.array([parse_float(param) for param in parameters[2:5]])
+
+    @property
+    def curve(self):
+        """Directrix curve entity."""
+        return self.iges[self.curve_pointer]
+
+    def _pointer_fields(self):
+        return [1]
+
+    def _curves(self):
+        return [self.curve]
+
+    def _grid(self, n_u, n_v):
+        directrix = self.curve._sample(n_u)
+        v = np.linspace(0, 1, n_v)[:, None, None]
+        return directrix + v * (self.terminate - directrix[0])
+
+    def __repr__(self):
+        """Return a short description of the tabulated cylinder."""
+        return f"Tabulated Cylinder\nIGES Type 122\nTerminate point: {self.terminate}"
+
+
+def _segment_index(breakpoints, t):
+    """Return the polynomial segment of every parameter and the local parameter.
+
+    Parameters beyond the breakpoints are extrapolated by the first or
+    last segment.
+    """
+    index = np.clip(np.searchsorted(breakpoints, t, side="right") - 1, 0, len(breakpoints) - 2)
+    return index, t - breakpoints[index]
+
+
+class ParametricSplineCurve(Entity):
+    """IGES Type 112 parametric spline curve.
+
+    Piecewise cubic polynomial, ``X(s) = AX + BX*s + CX*s**2 + DX*s**3``
+    and likewise for ``Y`` and ``Z``, with ``s`` measured from the
+    start of each segment.  The coefficients are stored as a contiguous
+    ``(segments, 4, 3)`` array and evaluated with Horner's scheme for
+    all parameter values at once.
+    """
+
+    def _add_parameters(self, parameters):
+        """Parse the breakpoints and polynomial coefficients.
+
+        Index	Type	Name	Description
+        1	INT	CTYPE	spline type
+        2	INT	H	degree of continuity
+        3	INT	NDIM	2 for planar, 3 for nonplanar curves
+        4	INT	N	number of segments
+        5	REAL	T(1)	first breakpoint
+        ..
+        5+N	REAL	T(N+1)	last breakpoint
+        6+N	REAL	AX(1)	coefficients of the first segment ordered
+        ..			AX, BX, CX, DX, AY, .., DZ
+        17+N	REAL	DZ(1)
+        ..
+        6+13N	REAL	TPX0	terminate point and derivatives (unused)
+        """
+        super()._add_parameters(parameters)
+        self.spline_type = int(parameters[1])
+        self.continuity = int(parameters[2])
+        self.n_dimensions = int(parameters[3])
+        n_segments = int(parameters[4])
+        values = np.array([parse_float(param) for param in parameters[5:]])
+        self.breakpoints = values[: n_segments + 1]
+        coefficients = values[n_segments + 1 : n_segments + 1 + 12 * n_segments]
+        # (segment, axis, power) in the file, stored as (segment, power, axis)
+        self.coefficients = coefficients.reshape(n_segments, 3, 4).transpose(0, 2, 1).copy()
+
+    @property
+    def domain(self):
+        """Parameter range ``(start, end)`` covered by the breakpoints."""
+        return self.breakpoints[0], self.breakpoints[-1]
+
+    def evaluate(self, t):
+        """Evaluate the curve.
+
+        Parameters
+        ----------
+        t : array_like
+            Parameter values within :attr:`domain`.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(n, 3)`` array of points.
+        """
+        segment, s = _segment_index(self.breakpoints, np.atleast_1d(np.asarray(t, dtype=float)))
+        s = s[:, None]
+        coefficients = self.coefficients
+        points = coefficients[segment, 3]
+        for power in (2, 1, 0):
+            points = points * s + coefficients[segment, power]
+        return points
+
+    def _sample(self, n_samples):
+        """Return ``n_samples`` points evenly spaced in the parameter."""
+        return self.evaluate(np.linspace(*self.domain, n_samples))
+
+    def tessellate(self, delta=0.01):
+        """Sample the curve uniformly in its parameter.
+
+        Parameters
+        ----------
+        delta : float, optional
+            Resolution of the curve, ``round(1 / delta)`` samples are
+            taken across the domain.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(n, 3)`` array of polyline points.
+        """
+        return self._sample(_sample_count(delta))
+
+    @property
+    def bounds(self):
+        """Exact bounds of the curve as ``(xmin, xmax, ..., zmax)``.
+
+        Besides the segment ends, the extremes of every cubic lie at
+        the roots of its derivative, which are found in closed form.
+        """
+        length = np.diff(self.breakpoints)[:, None]
+        b, c, d = (self.coefficients[:, power] for power in (1, 2, 3))
+        # roots of b + 2 c s + 3 d s**2, falling back to the linear case
+        with np.errstate(divide="ignore", invalid="ignore"):
+            root = np.sqrt(np.maximum(c**2 - 3 * b * d, 0))
+            quadratic = np.where(np.abs(d) > 1e-300, 3 * d, np.nan)
+            candidates = [
+                np.zeros_like(b),
+                np.broadcast_to(length, b.shape),
+                (-c + root) / quadratic,
+                (-c - root) / quadratic,
+                np.where(d == 0, -b / (2 * c), np.nan),
+            ]
+        s = np.stack(candidates, axis=-1)
+        s = np.where((s >= 0) & (s <= length[..., None]), s, 0)
+        values = self.coefficients[:, 3, :, None]
+        for power in (2, 1, 0):
+            values = values * s + self.coefficients[:, power, :, None]
+        bounds = np.empty(6)
+        bounds[::2] = values.min(axis=(0, 2))
+        bounds[1::2] = values.max(axis=(0, 2))
+        return tuple(bounds)
+
+    def __repr__(self):
+        """Return a short description of the spline."""
+        info = "Parametric Spline Curve\nIGES Type 112\n"
+        info += f"Segments: {len(self.coefficients)}\n"
+        info += f"Domain: {self.domain[0]:f} to {self.domain[1]:f}"
+        return info
+
+    @assert_full_module_variant
+    def to_vtk(self, delta=0.01):
+        """Tessellate the curve as a ``pyvista.PolyData`` polyline.
+
+        Parameters
+        ----------
+        delta : float, optional
+            Resolution of the curve, see :func:`tessellate`.
+
+        Returns
+        -------
+        mesh : ``pyvista.PolyData``
+            ``pyvista`` mesh
+        """
+        return _polyline(self.tessellate(delta))
+
+
+class ParametricSplineSurface(AnalyticSurface):
+    """IGES Type 114 parametric spline surface.
+
+    Piecewise bicubic polynomial patches,
+    ``X(s, t) = sum(C[k, l] * t**k * s**l)`` and likewise for ``Y``
+    and ``Z``, with ``s`` and ``t`` measured from the patch corner.
+    The coefficients are stored as a contiguous ``(segments_u,
+    segments_v, 4, 4, 3)`` array indexed by the power of ``t``, the
+    power of ``s`` and the axis, and evaluated with Horner's scheme.
+    """
+
+    def _add_parameters(self, parameters):
+        """Parse the breakpoints and patch coefficients.
+
+        Index	Type	Name	Description
+        1	INT	CTYPE	spline boundary type
+        2	INT	PTYPE	patch type
+        3	INT	M	number of u segments
+        4	INT	N	number of v segments
+        5	REAL	TU(1)	first u breakpoint
+        ..
+        5+M	REAL	TU(M+1)	last u breakpoint
+        6+M	REAL	TV(1)	first v breakpoint
+        ..
+        6+M+N	REAL	TV(N+1)	last v breakpoint
+        7+M+N	REAL	AX(1,1)	48 coefficients of patch (1, 1) ordered
+        ..			AX, BX, .., SX, AY, .., SZ
+        ..			then patch (1, 2), .., (1, N+1), (2, 1), ..
+
+        The specification stores ``(M + 1) * (N + 1)`` patches whose
+        last row and column are unused.  Files with only ``M * N``
+        patches are read as well.
+        """
+        super()._add_parameters(parameters)
+        self.spline_type = int(parameters[1])
+        self.patch_type = int(parameters[2])
+        n_u, n_v = int(parameters[3]), int(parameters[4])
+        values = np.array([parse_float(param) for param in parameters[5:]])
+        self.breakpoints_u = values[: n_u + 1]
+        self.breakpoints_v = values[n_u + 1 : n_u + n_v + 2]
+        coefficients = values[n_u + n_v + 2 :]
+        if len(coefficients) >= 48 * (n_u + 1) * (n_v + 1):
+            coefficients = coefficients[: 48 * (n_u + 1) * (n_v + 1)]
+            coefficients = coefficients.reshape(n_u + 1, n_v + 1, 48)[:n_u, :n_v]
+        else:
+            coefficients = coefficients[: 48 * n_u * n_v].reshape(n_u, n_v, 48)
+        # (axis, power of t, power of s) in the file
+        coefficients = coefficients.reshape(n_u, n_v, 3, 4, 4)
+        self.coefficients = np.ascontiguousarray(coefficients.transpose(0, 1, 3, 4, 2))
+
+    @property
+    def domain(self):
+        """Parameter ranges ``(u_start, u_end, v_start, v_end)``."""
+        return (
+            self.breakpoints_u[0],
+            self.breakpoints_u[-1],
+            self.breakpoints_v[0],
+            self.breakpoints_v[-1],
+        )
+
+    def evaluate(self, u, v):
+        """Evaluate the surface at pairs of parameters.
+
+        Parameters
+        ----------
+        u, v : array_like
+            Parameter values within :attr:`domain`.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(n, 3)`` array of points.
+        """
+        u, v = np.broadcast_arrays(np.atleast_1d(u), np.atleast_1d(v))
+        i, s = _segment_index(self.breakpoints_u, u.astype(float).ravel())
+        j, t = _segment_index(self.breakpoints_v, v.astype(float).ravel())
+        patches = self.coefficients[i, j]
+        s, t = s[:, None], t[:, None]
+        points = 0
+        for power_t in (3, 2, 1, 0):
+            row = patches[:, power_t, 3]
+            for power_s in (2, 1, 0):
+                row = row * s + patches[:, power_t, power_s]
+            points = points * t + row
+        return points
+
+    def _grid(self, n_u, n_v):
+        u_start, u_end, v_start, v_end = self.domain
+        i, s = _segment_index(self.breakpoints_u, np.linspace(u_start, u_end, n_u))
+        j, t = _segment_index(self.breakpoints_v, np.linspace(v_start, v_end, n_v))
+        # Horner in s for every u sample and v segment: (n_v segments, n_u, 4, 3)
+        columns = self.coefficients[i].transpose(1, 0, 2, 3, 4)
+        s = s[:, None, None]
+        rows = columns[..., 3, :]
+        for power_s in (2, 1, 0):
+            rows = rows * s + columns[..., power_s, :]
+        # Horner in t for every v sample
+        t = t[:, None, None]
+        rows = rows[j]
+        grid = rows[:, :, 3]
+        for power_t in (2, 1, 0):
+            grid = grid * t + rows[:, :, power_t]
+        return grid
+
+    def __repr__(self):
+        """Return a short description of the spline surface."""
+        info = "Parametric Spline Surface\nIGES Type 114\n"
+        info += f"Patches: {self.coefficients.shape[0]} x {self.coefficients.shape[1]}"
+        return info
+
+
+class CompositeCurve(Entity):
+    """IGES Type 102 composite curve.
+
+    An ordered list of curves joined end to start.  The members are
+    sampled with their own kernels and joined into a single polyline
+    in which the junction points are shared.
+    """
+
+    def _add_parameters(self, parameters):
+        """Parse the member pointers.
+
+        Index	Type	Name	Description
+        1	INT	N	number of members
+        2	Pointer	DE(1)	first member
+        ..
+        1+N	Pointer	DE(N)	last member
+        """
+        super()._add_parameters(parameters)
+        n_members = int(parameters[1])
+        self.member_pointers = [int(param) for param in parameters[2 : 2 + n_members]]
+
+    @property
+    def members(self):
+        """Member curve entities in order."""
+        return [self.iges[pointer] for pointer in self.member_pointers]
+
+    def _pointer_fields(self):
+        return list(range(2, 2 + len(self.member_pointers)))
+
+    @functools.cached_property
+    def _supported_members(self):
+        """Members that can be sampled, warning about missing and unsupported ones."""
+        members = []
+        for pointer in self.member_pointers:
+            member = self.iges[pointer] if pointer in self.iges._pointers else None
+            if isinstance(member, Point) or _can_sample(member):
+                members.append(member)
+            else:
+                _warn_unsupported(self, member, "member")
+        return members
+
+    @property
+    def _sampleable(self):
+        """Whether any member can be sampled."""
+        return bool(self._supported_members)
+
+    def tessellate(self, delta=0.01):
+        """Sample the members and join them into one polyline.
+
+        Lines contribute their end points, points their coordinate and
+        all other members ``round(1 / delta)`` samples.  The start of a
+        member is dropped when it coincides with the end of the
+        previous one.  Missing members and members without a sampling
+        kernel, such as copious data (106), are left out with a warning.
+
+        Parameters
+        ----------
+        delta : float, optional
+            Resolution of the members.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(n, 3)`` array of polyline points.
+        """
+        pieces = []
+        for member in self._supported_members:
+            if isinstance(member, Line):
+                points = member.coordinates
+            elif isinstance(member, Point):
+                points = member.coordinate[None]
+            elif isinstance(member, CompositeCurve):
+                points = member.tessellate(delta)
+            else:
+                points = member._sample(_sample_count(delta))
+            # relative tolerance, the junctions are written with limited precision
+            if pieces and np.allclose(points[0], pieces[-1][-1], rtol=1e-9, atol=1e-12):
+                points = points[1:]
+            pieces.append(points)
+        return np.vstack(pieces) if pieces else np.empty((0, 3))
+
+    def _sample(self, n_samples):
+        """Return ``n_samples`` points evenly spaced by arc length."""
+        return _resample_by_length(self.tessellate(1 / (4 * n_samples)), n_samples)
+
+    @property
+    def bounds(self):
+        """Bounds of the members as ``(xmin, xmax, ..., zmax)``."""
+        bounds = [member.bounds for member in self._supported_members]
+        bounds = [member_bounds for member_bounds in bounds if member_bounds is not None]
+        if bounds:
+            bounds = np.array(bounds)
+            return tuple(
+                np.column_stack((bounds[:, ::2].min(axis=0), bounds[:, 1::2].max(axis=0))).ravel()
+            )
+
+    def __repr__(self):
+        """Return a short description of the composite curve."""
+        return f"Composite Curve\nIGES Type 102\nMembers: {self.member_pointers}"
+
+    @assert_full_module_variant
+    def to_vtk(self, delta=0.01):
+        """Return the composite curve as a ``pyvista.PolyData`` with one polyline.
+
+        Parameters
+        ----------
+        delta : float, optional
+            Resolution of the members, see :func:`tessellate`.
+
+        Returns
+        -------
+        mesh : ``pyvista.PolyData``
+            ``pyvista`` mesh
+        """
+        return _polyline(self.tessellate(delta))
+
+
+class CircularArc(Entity):
+    """IGES Type 100 circular arc.
+
+    Simple circular arc of constant radius. Usually defined with a
+    Transformation Matrix Entity (Type 124).
+    """
+
+    def _add_parameters(self, parameters):
+        # Index in list    Type of data    Name    Description
+        # 1                REAL            Z       z displacement on XT,YT plane
+        # 2                REAL            X       x coordinate of center
+        # 3                REAL            Y       y coordinate of center
         # 4                REAL            X1      x coordinate of start
         # 5                REAL            Y1      y coordinate of start
         # 6                REAL            X2      x coordinate of end
@@ -692,9 +2144,50 @@ class CircularArc(Entity):
     @property
     def transform(self):
         """Return the referenced :class:`Transformation` entity, if any."""
-        if self._transform is not None:
+        if self._transform:
             return self.iges[self._transform]
 
+    def _sample(self, n_samples):
+        """Return ``n_samples`` points counterclockwise from start to end.
+
+        Coincident start and end points give the full circle.
+        """
+        radius = np.hypot(self.x1 - self.x, self.y1 - self.y)
+        start = np.arctan2(self.y1 - self.y, self.x1 - self.x)
+        sweep = np.mod(np.arctan2(self.y2 - self.y, self.x2 - self.x) - start, 2 * np.pi)
+        angle = start + (sweep if sweep > 1e-12 else 2 * np.pi) * np.linspace(0, 1, n_samples)
+        points = np.column_stack(
+            (
+                self.x + radius * np.cos(angle),
+                self.y + radius * np.sin(angle),
+                np.full(n_samples, self.z),
+            )
+        )
+        if self.transform is not None:
+            affine = self.transform.to_affine()
+            points = points @ affine[:3, :3].T + affine[:3, 3]
+        return points
+
+    @property
+    def bounds(self):
+        """Bounds of the arc's full circle as ``(xmin, xmax, ..., zmax)``.
+
+        Computed from the box enclosing the complete circle, mapped
+        through the arc's transformation, so they are conservative.
+        """
+        radius = np.hypot(self.x1 - self.x, self.y1 - self.y)
+        corners = np.array(
+            [
+                [self.x + sx * radius, self.y + sy * radius, self.z]
+                for sx in (-1, 1)
+                for sy in (-1, 1)
+            ]
+        )
+        if self.transform is not None:
+            affine = self.transform.to_affine()
+            corners = corners @ affine[:3, :3].T + affine[:3, 3]
+        return _bounds_from_points(corners)
+
     def __repr__(self):
         """Return a multi-line string with the arc's center and endpoints."""
         info = "Circular Arc\nIGES Type 100\n"
@@ -742,6 +2235,9 @@ class Face(Entity):
 
         return loops
 
+    def _pointer_fields(self):
+        return [1, *range(4, 4 + self.n_loops)]
+
     def __repr__(self):
         """Return a short identifier string for the face."""
         info = "IGES Type 510: Face\n"
@@ -779,23 +2275,23 @@ class Loop(Entity):
         7+2K1	INT	Type2               Type of Edge 2
         """
         super()._add_parameters(parameters)
-        self.n_edges = int(self.parameters[1])
+        self.n_edges = int(parameters[1])
         self._edges = []
 
         c = 0
         for i in range(self.n_edges):
             edge = {
-                "type": int(self.parameters[2 + c]),
-                "e1": int(self.parameters[3 + c]),  # first vertex or edge list
-                "index1": int(self.parameters[4 + c]),  # index of edge in e1
-                "flag1": bool(self.parameters[5 + c]),  # orientation flag
-                "k1": int(self.parameters[6 + c]),
+                "type": int(parameters[2 + c]),
+                "e1": int(parameters[3 + c]),  # first vertex or edge list
+                "index1": int(parameters[4 + c]),  # index of edge in e1
+                "flag1": bool(parameters[5 + c]),  # orientation flag
+                "k1": int(parameters[6 + c]),
             }  # n curves
             curves = []
             for j in range(edge["k1"]):
                 curve = {
-                    "iso": bool(self.parameters[7 + c + j * 2]),  # isopara flag
-                    "psc": int(self.parameters[8 + c + j * 2]),
+                    "iso": bool(parameters[7 + c + j * 2]),  # isopara flag
+                    "psc": int(parameters[8 + c + j * 2]),
                 }  # space curve
                 curves.append(curve)
             c += 5 + 2 * edge["k1"]
@@ -803,6 +2299,14 @@ class Loop(Entity):
             edge["curves"] = curves
             self._edges.append(edge)
 
+    def _pointer_fields(self):
+        fields, c = [], 0
+        for edge in self._edges:
+            fields.append(3 + c)
+            fields.extend(8 + c + 2 * j for j in range(edge["k1"]))
+            c += 5 + 2 * edge["k1"]
+        return fields
+
     # @property
     # def edge_lists(self):
     #     for
@@ -871,6 +2375,9 @@ class EdgeList(Entity):
         ptr = self.edges[indices]["curve1"]
         return self.iges.from_pointer(ptr)
 
+    def _pointer_fields(self):
+        return [2 + 5 * i + offset for i in range(self.n_edges) for offset in (0, 1, 3)]
+
     def __len__(self):
         """Return the number of edges in the list."""
         return len(self.edges)
@@ -911,3 +2418,9 @@ class VertexList(Entity):
                 parse_float(self.parameters[4 + i * 3]),
             ]
             self.points.append(point)
+
+    @property
+    def bounds(self):
+        """Bounds of the vertices as ``(xmin, xmax, ymin, ymax, zmin, zmax)``."""
+        if self.points:
+            return _bounds_from_points(self.points)
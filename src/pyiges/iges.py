@@ -1,10 +1,24 @@
 """IGES file reader and the top-level :class:`Iges` container."""
 
+import asyncio
+import heapq
+import inspect
+import os
+import threading
+import time
+
+import numpy as np
 from tqdm import tqdm
 
-from pyiges import geometry
-from pyiges.check_imports import assert_full_module_variant, pyvista, vtkAppendPolyData
+from pyiges import exporters, geometry, nurbs, sources, writer
+from pyiges.check_imports import assert_full_module_variant, pyvista
 from pyiges.entity import Entity
+from pyiges.spatial import BoundingVolumeHierarchy, RayCaster
+
+# surfaces tessellated on a parametric grid
+_SURFACES = (geometry.RationalBSplineSurface, geometry.AnalyticSurface)
+# curves tessellated uniformly in their parameter
+_SPLINE_CURVES = (geometry.RationalBSplineCurve, geometry.ParametricSplineCurve)
 
 
 class Iges:
@@ -12,8 +26,15 @@ class Iges:
 
     Parameters
     ----------
-    filename : str
-        Filename of an IGES file.
+    filename : str | os.PathLike | bytes | memoryview | file object
+        Filename of an IGES file in the fixed or the compressed ASCII
+        form, its content, or a binary or text stream of it.  gzip,
+        bz2 and zstd compressed files are decompressed while they are
+        read, see :func:`pyiges.sources.open_text`.
+
+    progress : function, optional
+        Report reading progress by wrapping the iterator over the lines
+        of the file, like ``tqdm``.  By default no progress is shown.
 
     Examples
     --------
@@ -25,10 +46,13 @@ class Iges:
         Number of Entities: 4615
     """
 
-    def __init__(self, filename):
+    def __init__(self, filename, progress=None):
         """Read ``filename`` and populate the entity list."""
-        self._read(filename)
+        self._read(filename, progress)
         self._desc = ""
+        self._spatial_index = None
+        self._ray_casters = {}
+        self._reference_graph = None
 
     def entities(self):
         """Return a list of all entities.
@@ -53,6 +77,15 @@ class Iges:
         delta=0.025,
         merge=True,
         progress=tqdm,
+        clip_bounds=None,
+        kind="triangle",
+        dtype=None,
+        offset=None,
+        time_budget=None,
+        triangle_budget=None,
+        allocate=False,
+        conics=True,
+        composites=None,
     ):
         """Convert entities to a vtk object.
 
@@ -61,8 +94,13 @@ class Iges:
         lines : bool, optional
             Convert lines.
 
+        bsplines : bool, optional
+            Convert B-Spline and parametric spline curves.
+
         surfaces : bool, optional
-            Convert B-Spline surfaces.
+            Convert B-Spline surfaces, parametric spline surfaces and
+            the analytic surfaces (planes, ruled surfaces, surfaces of
+            revolution and tabulated cylinders).
 
         points : bool, optional
             Convert points.
@@ -84,6 +122,62 @@ class Iges:
             Passing progress=silent_progress will show no progress, the
             default is to use tqdm for progress reporting.
 
+        clip_bounds : sequence[float] | numpy.ndarray, optional
+            Region of interest given either as a box ``(xmin, xmax,
+            ymin, ymax, zmin, zmax)`` or as an ``(n, 4)`` array of
+            planes ``(a, b, c, d)`` keeping ``a*x + b*y + c*z + d >=
+            0`` (for example the six planes of a view frustum).
+            Entities whose bounds lie entirely outside of the region
+            are skipped before they are tessellated.
+
+        kind : str, optional
+            Cell layout of the surfaces, see
+            :func:`pyiges.geometry.RationalBSplineSurface.to_vtk`.
+            ``"quad"`` halves the number of surface cells.
+            ``"structured"`` surfaces cannot be merged and require
+            ``merge=False``.
+
+        dtype : numpy.dtype, optional
+            Data type of the output points, for example ``np.float32``
+            to halve the memory of large meshes.  Defaults to
+            ``float64``.
+
+        offset : bool | sequence[float], optional
+            Subtract this point from all output points before casting
+            them to ``dtype``.  ``True`` uses the center of the model
+            bounds, keeping single precision points accurate for models
+            far from the origin.  The offset is stored in the
+            ``"Offset"`` field data of the output.
+
+        time_budget : float, optional
+            Seconds available for the conversion.  Surfaces are first
+            tessellated coarsely, then the surfaces with the largest
+            estimated error are repeatedly refined towards ``delta``
+            until the budget is spent.  The other entities and the
+            coarse surfaces are always converted, so the budget is
+            exceeded when even the coarse model does not fit in it.
+
+        triangle_budget : int, optional
+            Stop refining surfaces once the next refinement would
+            exceed this many surface triangles.
+
+        allocate : bool, optional
+            Instead of refining surfaces by their error, distribute
+            ``triangle_budget`` across the surfaces up front with
+            :meth:`allocate_triangles`.  Each surface is evaluated once
+            and ``delta`` is ignored.  Cannot be combined with
+            ``time_budget``.
+
+        conics : bool, optional
+            Convert conic arcs.  All conic arcs are sampled at once by
+            :func:`pyiges.geometry.conic_arc_points` with the number of
+            samples given by ``delta``.
+
+        composites : bool, optional
+            Convert every composite curve into a single polyline with
+            shared junction points.  Their members are then not
+            converted on their own.  Defaults to ``bsplines``.
+
         Returns
         -------
         surf : pyvista.PolyData or pyvista.MultiBlock
@@ -103,28 +197,432 @@ class Iges:
           Y Bounds:	-4.255e+01, 6.290e+14
           Z Bounds:	-9.980e+02, 6.702e+14
           N Arrays:	0
+
+        Only convert the entities around the origin
+
+        >>> mesh = iges.to_vtk(clip_bounds=[-10, 10, -10, 10, -10, 10])
+
+        Single precision points relative to the model center
+
+        >>> mesh = iges.to_vtk(dtype=np.float32, offset=True)
+        >>> center = mesh.field_data["Offset"]
+
+        Return the best mesh available within two seconds.  The
+        ``"Coarse Entities"`` field data lists the surfaces (indices
+        into :attr:`items`) that did not reach ``delta`` and
+        ``"Estimated Error"`` their estimated deviation.
+
+        >>> mesh = iges.to_vtk(time_budget=2.0)
+        >>> mesh.field_data["Coarse Entities"]
+
+        Spend one million triangles on the surfaces, giving large and
+        curved surfaces more of them
+
+        >>> mesh = iges.to_vtk(triangle_budget=1_000_000, allocate=True)
         """
-        items = pyvista.MultiBlock()
-        for entity in progress(self, desc="Converting entities to vtk"):
-            if isinstance(entity, geometry.RationalBSplineCurve) and bsplines:
-                items.append(entity.to_vtk(delta))
-            elif isinstance(entity, geometry.RationalBSplineSurface) and surfaces:
-                items.append(entity.to_vtk(delta))
+        if merge and surfaces and kind == "structured":
+            raise ValueError("Structured surfaces cannot be merged, use merge=False")
+        if allocate and (triangle_budget is None or time_budget is not None):
+            raise ValueError("allocate requires a triangle_budget and no time_budget")
+
+        deadline = time.perf_counter() + (np.inf if time_budget is None else time_budget)
+        budgeted = time_budget is not None or triangle_budget is not None
+        offset = self._model_offset(offset)
+        meshes = {}
+        pending = []
+        arcs = []
+        if composites is None:
+            composites = bsplines
+        members = self._composite_members() if composites else set()
+        for index in progress(self._clip_indices(clip_bounds), desc="Converting entities to vtk"):
+            entity = self._entities[index]
+            if index in members or not _tessellable(entity):
+                continue
+            if isinstance(entity, _SURFACES) and surfaces and budgeted:
+                # placeholder keeping the entity order, refined below
+                meshes[index] = None
+                pending.append((index, entity))
+                continue
+            if isinstance(entity, geometry.ConicArc) and conics:
+                # placeholder, all conic arcs are sampled in one batch below
+                meshes[index] = None
+                arcs.append((index, entity))
+                continue
+            if isinstance(entity, _SPLINE_CURVES) and bsplines:
+                mesh = entity.to_vtk(delta)
+            elif isinstance(entity, geometry.CompositeCurve) and composites:
+                mesh = entity.to_vtk(delta)
+            elif isinstance(entity, _SURFACES) and surfaces:
+                mesh = entity.to_vtk(delta, kind=kind)
             elif isinstance(entity, geometry.Line) and lines:
-                items.append(entity.to_vtk())
+                mesh = entity.to_vtk()
             elif isinstance(entity, geometry.Point) and points:
-                items.append(entity.to_vtk())
+                mesh = entity.to_vtk()
+            else:
+                continue
+            meshes[index] = _cast_points(mesh, dtype, offset)
+
+        if allocate:
+            n_u, n_v = _allocate_samples(pending, triangle_budget)
+            grids = {
+                index: entity._evaluate_samples(n_u[i], n_v[i])[0, 0]
+                for i, (index, entity) in enumerate(pending)
+            }
+            budgeted = False
+        else:
+            grids, coarse = _refine_surfaces(pending, delta, deadline, triangle_budget)
+        for index, grid in grids.items():
+            n_v, n_u = grid.shape[:2]
+            mesh = geometry._grid_mesh(grid.reshape(-1, 3), n_u, n_v, kind)
+            meshes[index] = _cast_points(mesh, dtype, offset)
+        arc_points = geometry.conic_arc_points(
+            [arc for _, arc in arcs], geometry._sample_count(delta)
+        )
+        for (index, _), points in zip(arcs, arc_points):
+            meshes[index] = _cast_points(geometry._polyline(points), dtype, offset)
+        items = pyvista.MultiBlock(list(meshes.values()))
 
         # merge to a single mesh
         if merge:
-            afilter = vtkAppendPolyData()
-            for item in items:
-                afilter.AddInputData(item)
-            afilter.Update()
+            items = _cast_points(_merge_polydata(items), dtype, offset, shift=False)
+        if budgeted:
+            items.field_data["Coarse Entities"] = np.array(list(coarse), dtype=int)
+            items.field_data["Estimated Error"] = np.array(list(coarse.values()), dtype=float)
+        return items
 
-            return pyvista.wrap(afilter.GetOutput())
+    async def ato_vtk(self, *args, executor=None, progress=None, **kwargs):
+        """Convert entities to a vtk object without blocking the event loop.
 
-        return items
+        Runs :meth:`to_vtk` in an executor.  The conversion checks for
+        cancellation between entities, so cancelling the awaiting task
+        raises :class:`asyncio.CancelledError` and stops the conversion
+        at the next entity.
+
+        Parameters
+        ----------
+        *args, **kwargs
+            Arguments of :meth:`to_vtk`, except ``progress``.
+
+        executor : concurrent.futures.Executor, optional
+            Thread pool executor to convert in.  Defaults to the
+            default executor of the running loop.
+
+        progress : function, optional
+            Coroutine function, or function, called as
+            ``progress(done, total)`` with the number of entities
+            converted while the conversion advances.
+
+        Returns
+        -------
+        surf : pyvista.PolyData or pyvista.MultiBlock
+            Geometry represented as ``pyvista.PolyData`` if merged or a
+            ``MultiBlock`` if unmerged.
+
+        Examples
+        --------
+        >>> async def report(done, total):
+        ...     print(f"{done}/{total}")
+        >>> mesh = await iges.ato_vtk(delta=0.05, progress=report)
+        """
+        return await _run_cooperatively(
+            lambda wrap: self.to_vtk(*args, progress=wrap, **kwargs), executor, progress
+        )
+
+    def iter_tessellation(
+        self,
+        chunk_triangles=2**20,
+        lines=True,
+        bsplines=True,
+        surfaces=True,
+        points=True,
+        delta=0.025,
+        clip_bounds=None,
+        conics=True,
+        composites=None,
+    ):
+        """Tessellate entities and yield the result in bounded blocks.
+
+        Entities are tessellated one at a time with the same kernels
+        as :meth:`to_vtk` and gathered into blocks of a single cell
+        type.  A block is yielded as soon as adding the next entity
+        would exceed ``chunk_triangles`` cells, so memory use is
+        bounded by the chunk size rather than by the model.  Neither
+        ``pyvista`` nor ``geomdl`` is required.
+
+        Parameters
+        ----------
+        chunk_triangles : int, optional
+            Maximum number of cells per block.  An entity with more
+            cells is yielded as a block of its own.
+
+        lines : bool, optional
+            Tessellate lines.
+
+        bsplines : bool, optional
+            Tessellate B-Spline and parametric spline curves.
+
+        surfaces : bool, optional
+            Tessellate B-Spline, parametric spline and analytic surfaces.
+
+        points : bool, optional
+            Tessellate points.
+
+        delta : float, optional
+            Resolution when tessellating spline entities.
+
+        clip_bounds : sequence[float] | numpy.ndarray, optional
+            Region of interest, see :meth:`to_vtk`.
+
+        conics : bool, optional
+            Tessellate conic arcs.
+
+        composites : bool, optional
+            Tessellate composite curves as connected polylines instead
+            of their members, see :meth:`to_vtk`.  Defaults to
+            ``bsplines``.
+
+        Yields
+        ------
+        points : numpy.ndarray
+            ``(n, 3)`` points of the block.
+
+        cells : numpy.ndarray
+            ``(m, k)`` indices into ``points`` with ``k`` equal to 3
+            for triangles, 2 for line segments and 1 for vertices.
+
+        entity_ids : numpy.ndarray
+            ``(m,)`` index into :attr:`items` of the entity each cell
+            belongs to.
+
+        Examples
+        --------
+        Write the surface triangles block by block
+
+        >>> for points, cells, entity_ids in iges.iter_tessellation(bsplines=False):
+        ...     if cells.shape[1] == 3:
+        ...         consume(points, cells)
+        """
+        if composites is None:
+            composites = bsplines
+        kinds = {
+            geometry.RationalBSplineSurface: surfaces,
+            geometry.Plane: surfaces,
+            geometry.RuledSurface: surfaces,
+            geometry.SurfaceOfRevolution: surfaces,
+            geometry.TabulatedCylinder: surfaces,
+            geometry.ParametricSplineSurface: surfaces,
+            geometry.RationalBSplineCurve: bsplines,
+            geometry.ParametricSplineCurve: bsplines,
+            geometry.ConicArc: conics,
+            geometry.CompositeCurve: composites,
+            geometry.Line: lines,
+            geometry.Point: points,
+        }
+        members = self._composite_members() if composites else set()
+        blocks, n_cells = {}, {}
+        for index in self._clip_indices(clip_bounds):
+            entity = self._entities[index]
+            if not kinds.get(type(entity), False) or index in members or not _tessellable(entity):
+                continue
+            entity_points, cells = _tessellate_entity(entity, delta)
+            size = cells.shape[1]
+            if blocks.get(size) and n_cells[size] + len(cells) > chunk_triangles:
+                yield _concatenate_blocks(blocks.pop(size))
+            if size not in blocks:
+                blocks[size], n_cells[size] = [], 0
+            blocks[size].append((entity_points, cells, index))
+            n_cells[size] += len(cells)
+
+        for size in sorted(blocks, reverse=True):
+            yield _concatenate_blocks(blocks[size])
+
+    def export(self, filename, format=None, delta=0.025, chunk_triangles=2**20, clip_bounds=None):
+        """Write the tessellated B-spline surfaces to a mesh file.
+
+        The surfaces are streamed from :meth:`iter_tessellation` into
+        the writer one block at a time, so neither ``pyvista`` nor a
+        complete mesh in memory is needed.
+
+        Parameters
+        ----------
+        filename : str | os.PathLike
+            Output filename.
+
+        format : str, optional
+            One of ``"stl"`` (binary), ``"ply"`` (binary), ``"obj"``
+            or ``"glb"`` (binary glTF).  Taken from the extension of
+            ``filename`` by default.
+
+        delta : float, optional
+            Resolution of the surfaces.
+
+        chunk_triangles : int, optional
+            Maximum number of triangles tessellated before they are
+            written, see :meth:`iter_tessellation`.
+
+        clip_bounds : sequence[float] | numpy.ndarray, optional
+            Region of interest, see :meth:`to_vtk`.
+
+        Returns
+        -------
+        int
+            Number of triangles written.
+
+        Examples
+        --------
+        >>> iges.export("impeller.stl")
+        >>> iges.export("impeller.bin", format="glb", delta=0.05)
+        """
+        blocks = self.iter_tessellation(
+            chunk_triangles,
+            lines=False,
+            bsplines=False,
+            points=False,
+            delta=delta,
+            clip_bounds=clip_bounds,
+        )
+        return _export_blocks(filename, format, blocks)
+
+    def to_lods(self, tolerances, delta=0.01, filenames=None, clip_bounds=None):
+        """Tessellate the B-spline surfaces at several levels of detail.
+
+        Every surface is evaluated once on the finest grid given by
+        ``delta``.  Each level then keeps, per surface, the coarsest
+        subsampling of that grid (every 2nd, 4th, ... sample, chosen
+        independently in each direction) whose bilinear interpolation
+        provably stays within the level tolerance of the fine samples:
+        the errors of subsampling the rows and the columns are measured
+        separately and their sum bounds the combined error.  No surface
+        is evaluated more than once.
+
+        Parameters
+        ----------
+        tolerances : sequence[float]
+            Maximum deviation from the finest grid per level, in model
+            units.  A tolerance of ``0`` keeps the finest grid.
+
+        delta : float, optional
+            Resolution of the finest grid, see
+            :func:`pyiges.geometry.RationalBSplineSurface.to_vtk`.
+
+        filenames : sequence[str | os.PathLike], optional
+            Also write each level to this file with :meth:`export`'s
+            writers, chosen by the file extension.
+
+        clip_bounds : sequence[float] | numpy.ndarray, optional
+            Region of interest, see :meth:`to_vtk`.
+
+        Returns
+        -------
+        list[dict]
+            One dictionary per level with the ``tolerance``, the
+            ``points``, ``triangles`` and ``entity_ids`` (index into
+            :attr:`items` per triangle) of the mesh, the number of
+            triangles ``n_triangles`` and ``max_error``, the largest
+            error bound of any surface with respect to its finest grid.
+
+        Examples
+        --------
+        >>> lods = iges.to_lods([0, 0.05, 0.5], filenames=["lod0.glb", "lod1.glb", "lod2.glb"])
+        >>> [lod["n_triangles"] for lod in lods]
+        """
+        tolerances = np.asarray(tolerances, dtype=float)
+        if filenames is not None and len(filenames) != len(tolerances):
+            raise ValueError("Expected one filename per tolerance")
+        levels = [[] for _ in tolerances]
+        errors = np.zeros(len(tolerances))
+
+        for index in self._clip_indices(clip_bounds):
+            entity = self._entities[index]
+            if not isinstance(entity, _SURFACES) or not _tessellable(entity):
+                continue
+            grid = entity._evaluate_grid(delta)[0, 0]
+            # error bound of every subsampling of the rows and columns
+            rows, row_errors = _grid_subsamplings(grid, 0)
+            cols, col_errors = _grid_subsamplings(grid, 1)
+            error = row_errors[:, None] + col_errors
+            n_triangles = 2 * np.outer([len(r) - 1 for r in rows], [len(c) - 1 for c in cols])
+
+            for level, tolerance in enumerate(tolerances):
+                # the full grid has no error, so there is always a candidate
+                cost = np.where(error <= tolerance, n_triangles, np.iinfo(n_triangles.dtype).max)
+                i, j = np.unravel_index(np.argmin(cost), cost.shape)
+                points = grid[np.ix_(rows[i], cols[j])].reshape(-1, 3)
+                triangles = geometry._grid_triangles(len(cols[j]), len(rows[i]))
+                levels[level].append((points, triangles, index))
+                errors[level] = max(errors[level], error[i, j])
+
+        lods = []
+        for level, tolerance in enumerate(tolerances):
+            if levels[level]:
+                points, triangles, entity_ids = _concatenate_blocks(levels[level])
+            else:
+                points, triangles = np.empty((0, 3)), np.empty((0, 3), dtype=int)
+                entity_ids = np.empty(0, dtype=int)
+            if filenames is not None:
+                _export_blocks(filenames[level], None, [(points, triangles, entity_ids)])
+            lods.append(
+                {
+                    "tolerance": tolerance,
+                    "points": points,
+                    "triangles": triangles,
+                    "entity_ids": entity_ids,
+                    "n_triangles": len(triangles),
+                    "max_error": errors[level],
+                }
+            )
+        return lods
+
+    def allocate_triangles(self, triangle_budget, curvature_weight=1.0, clip_bounds=None):
+        """Distribute a triangle budget across the B-spline surfaces.
+
+        The share of every surface is proportional to the area of its
+        control net times ``1 + curvature_weight * turning``, where
+        ``turning`` is the total turning angle of the control polygons
+        in radians.  Within a surface the grid cells are split between
+        ``u`` and ``v`` by the length and turning of the control net in
+        each direction.  Only the control nets are used, so no surface
+        is evaluated.
+
+        Every surface gets at least one grid cell (two triangles), and
+        the allocation never exceeds the budget otherwise.
+
+        Parameters
+        ----------
+        triangle_budget : int
+            Total number of surface triangles.
+
+        curvature_weight : float, optional
+            Weight of the turning angle relative to the area.  ``0``
+            allocates by area only.
+
+        clip_bounds : sequence[float] | numpy.ndarray, optional
+            Region of interest, see :meth:`to_vtk`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Structured array with the ``index`` of every surface in
+            :attr:`items` and the number of samples ``n_u`` and ``n_v``
+            in each direction.  A surface has ``2 * (n_u - 1) * (n_v -
+            1)`` triangles.
+
+        Examples
+        --------
+        >>> allocation = iges.allocate_triangles(100_000)
+        >>> 2 * ((allocation["n_u"] - 1) * (allocation["n_v"] - 1)).sum()
+        """
+        surfaces = [
+            (index, self._entities[index])
+            for index in self._clip_indices(clip_bounds)
+            if isinstance(self._entities[index], _SURFACES) and _tessellable(self._entities[index])
+        ]
+        allocation = np.zeros(len(surfaces), dtype=[("index", int), ("n_u", int), ("n_v", int)])
+        allocation["index"] = [index for index, _ in surfaces]
+        allocation["n_u"], allocation["n_v"] = _allocate_samples(
+            surfaces, triangle_budget, curvature_weight
+        )
+        return allocation
 
     def points(self, as_vtk=False, merge=False, **kwargs):
         """Return all points."""
@@ -151,13 +649,23 @@ class Iges:
 
         Examples
         --------
-        Convert and plot all bspline surfaces.  This takes a while
-        since the geometry tessellation is done in pure python by
-        ``geomdl``.  Reduce the conversion time by setting delta to a
-        larger than default value (0.025)
+        Convert and plot all bspline surfaces.  Reduce the conversion
+        time by setting delta to a larger than default value (0.025)
 
         >>> mesh = iges.bspline_surfaces(as_vtk=True, merge=True)
-        >>> mesh.plot()
+
+        Keyword arguments are passed on to
+        :func:`pyiges.geometry.RationalBSplineSurface.to_vtk`, for
+        example to add exact normals for smooth shading
+
+        >>> mesh = iges.bspline_surfaces(as_vtk=True, merge=True, normals=True)
+        >>> mesh.plot(smooth_shading=True)
+
+        Only convert the surfaces that may intersect a region of
+        interest, see ``clip_bounds`` in :meth:`Iges.to_vtk`
+
+        >>> roi = [-30, -20, -20, -10, -50, 0]
+        >>> mesh = iges.bspline_surfaces(as_vtk=True, merge=True, clip_bounds=roi)
 
         Alternatively, just extract the B-REP surfaces and extract
         their parameters
@@ -192,6 +700,34 @@ class Iges:
         """Return all conic arcs."""
         return self._return_type(geometry.ConicArc, as_vtk, merge, **kwargs)
 
+    def composite_curves(self, as_vtk=False, merge=False, **kwargs):
+        """Return all composite curves."""
+        return self._return_type(geometry.CompositeCurve, as_vtk, merge, **kwargs)
+
+    def parametric_spline_curves(self, as_vtk=False, merge=False, **kwargs):
+        """Return all parametric spline curves."""
+        return self._return_type(geometry.ParametricSplineCurve, as_vtk, merge, **kwargs)
+
+    def parametric_spline_surfaces(self, as_vtk=False, merge=False, **kwargs):
+        """Return all parametric spline surfaces."""
+        return self._return_type(geometry.ParametricSplineSurface, as_vtk, merge, **kwargs)
+
+    def planes(self, as_vtk=False, merge=False, **kwargs):
+        """Return all planes."""
+        return self._return_type(geometry.Plane, as_vtk, merge, **kwargs)
+
+    def ruled_surfaces(self, as_vtk=False, merge=False, **kwargs):
+        """Return all ruled surfaces."""
+        return self._return_type(geometry.RuledSurface, as_vtk, merge, **kwargs)
+
+    def surfaces_of_revolution(self, as_vtk=False, merge=False, **kwargs):
+        """Return all surfaces of revolution."""
+        return self._return_type(geometry.SurfaceOfRevolution, as_vtk, merge, **kwargs)
+
+    def tabulated_cylinders(self, as_vtk=False, merge=False, **kwargs):
+        """Return all tabulated cylinders."""
+        return self._return_type(geometry.TabulatedCylinder, as_vtk, merge, **kwargs)
+
     def faces(self, as_vtk=False, merge=False, **kwargs):
         """Return all B-Rep faces."""
         return self._return_type(geometry.Face, as_vtk, merge, **kwargs)
@@ -200,27 +736,93 @@ class Iges:
         """Return all B-Rep loops."""
         return self._return_type(geometry.Loop, as_vtk, merge, **kwargs)
 
-    def _return_type(self, iges_type, to_vtk=False, merge=False, **kwargs):
-        """Return entities matching ``iges_type``, optionally tessellated and merged."""
+    def _return_type(
+        self,
+        iges_type,
+        to_vtk=False,
+        merge=False,
+        clip_bounds=None,
+        dtype=None,
+        offset=None,
+        **kwargs,
+    ):
+        """Return entities matching ``iges_type``, optionally tessellated and merged.
+
+        ``dtype`` and ``offset`` of the meshes are handled as in :meth:`to_vtk`.
+        """
+        if to_vtk:
+            offset = self._model_offset(offset)
         items = []
-        for entity in self:
+        for entity in self._clip(clip_bounds):
             if isinstance(entity, iges_type):
                 if to_vtk:
-                    items.append(entity.to_vtk(**kwargs))
+                    if not _tessellable(entity):
+                        continue
+                    items.append(_cast_points(entity.to_vtk(**kwargs), dtype, offset))
                 else:
                     items.append(entity)
 
         # merge to a single mesh
         if merge and to_vtk:
-            afilter = vtkAppendPolyData()
-            for item in items:
-                afilter.AddInputData(item)
-            afilter.Update()
-
-            return pyvista.wrap(afilter.GetOutput())
+            return _cast_points(_merge_polydata(items), dtype, offset, shift=False)
 
         return items
 
+    def _composite_members(self):
+        """Return the indices of the members drawn as part of composite curves."""
+        return {
+            self._pointers[member.sequence_number]
+            for entity in self._entities
+            if isinstance(entity, geometry.CompositeCurve) and entity._sampleable
+            for member in entity._supported_members
+        }
+
+    def _model_offset(self, offset):
+        """Resolve the ``offset`` argument of :meth:`to_vtk` to a point or ``None``."""
+        if offset is None or offset is False:
+            return None
+        if offset is True:
+            bounds = np.array(self.spatial_index.bounds)
+            if not np.all(np.isfinite(bounds)):
+                return np.zeros(3)
+            return (bounds[::2] + bounds[1::2]) / 2
+        offset = np.asarray(offset, dtype=float)
+        if offset.shape != (3,):
+            raise ValueError("offset must be True or a point (x, y, z)")
+        return offset
+
+    def _clip(self, clip_bounds):
+        """Return the entities that may intersect a region of interest.
+
+        ``clip_bounds`` is either a box or an ``(n, 4)`` array of
+        planes, see :meth:`to_vtk`.  Entities without bounds are always
+        kept.
+        """
+        if clip_bounds is None:
+            return self._entities
+        return [self._entities[i] for i in self._clip_indices(clip_bounds)]
+
+    def _clip_indices(self, clip_bounds):
+        """Return the sorted indices of the entities kept by :meth:`_clip`."""
+        if clip_bounds is None:
+            return np.arange(len(self))
+
+        clip_bounds = np.asarray(clip_bounds, dtype=float)
+        if clip_bounds.shape == (6,):
+            visible = self.spatial_index.query_box(clip_bounds)
+        elif clip_bounds.ndim == 2 and clip_bounds.shape[1] == 4:
+            visible = self.spatial_index.query_planes(clip_bounds)
+        else:
+            raise ValueError(
+                "clip_bounds must be a box (xmin, xmax, ymin, ymax, zmin, zmax) "
+                "or an (n, 4) array of planes"
+            )
+
+        keep = np.ones(len(self), dtype=bool)
+        keep[self.spatial_index.ids] = False
+        keep[visible] = True
+        return np.nonzero(keep)[0]
+
     def __iter__(self):
         """Iterate over the contained entities."""
         yield from self._entities
@@ -236,9 +838,578 @@ class Iges:
         info += "Number of Entities: %d" % len(self)
         return info
 
+    @property
+    def spatial_index(self):
+        """Bounding volume hierarchy over the bounds of all entities.
+
+        Built on first access from the control-hull bounds of every
+        entity with geometry (see ``Entity.bounds``) and reused by
+        :meth:`query_box`, :meth:`query_sphere` and :meth:`nearest`.
+        The ids stored in the hierarchy are indices into
+        :attr:`items`.
+
+        The index may be persisted with
+        :meth:`pyiges.spatial.BoundingVolumeHierarchy.save` and
+        assigned back after reading the same file to skip the build.
+
+        Examples
+        --------
+        >>> from pyiges.spatial import BoundingVolumeHierarchy
+        >>> iges.spatial_index.save("impeller_index.npz")
+        >>> iges = pyiges.read(examples.impeller)
+        >>> iges.spatial_index = BoundingVolumeHierarchy.load("impeller_index.npz")
+        """
+        if self._spatial_index is None:
+            ids, bounds = [], []
+            for i, entity in enumerate(self._entities):
+                entity_bounds = entity.bounds
+                if entity_bounds is not None:
+                    ids.append(i)
+                    bounds.append(entity_bounds)
+            self._spatial_index = BoundingVolumeHierarchy(np.reshape(bounds, (-1, 6)), ids=ids)
+        return self._spatial_index
+
+    @spatial_index.setter
+    def spatial_index(self, index):
+        if index is not None and len(index) and index.ids.max() >= len(self):
+            raise ValueError("Spatial index references more entities than this file contains")
+        self._spatial_index = index
+
+    @property
+    def reference_graph(self):
+        """Directed graph of the references between entities in CSR form.
+
+        Built on first access from the pointers in the directory entry
+        (transform, structure, level, view, ...) and in the parameter
+        data (members, curves, loops, ...) of every entity.  Pointers
+        to entities that are not in the file are dropped.
+
+        Returns
+        -------
+        indptr : numpy.ndarray
+            Offsets into ``indices`` of the entities referenced by each
+            entity, so entity ``i`` references
+            ``indices[indptr[i]:indptr[i + 1]]``.
+
+        indices : numpy.ndarray
+            Sorted and unique indices into :attr:`items` per entity.
+
+        Examples
+        --------
+        >>> indptr, indices = iges.reference_graph
+        >>> n_references = np.diff(indptr)
+        """
+        return self._reference_graphs()[:2]
+
+    def _reference_graphs(self):
+        """Return the forward and reverse reference graphs, building them once."""
+        if self._reference_graph is None:
+            references = []
+            for entity in self._entities:
+                pointers = entity._directory_pointers() + entity._parameter_pointers()
+                targets = [self._pointers[ptr] for ptr in pointers if ptr in self._pointers]
+                references.append(np.unique(np.array(targets, dtype=np.int64)))
+            indptr = np.zeros(len(references) + 1, dtype=np.int64)
+            np.cumsum([len(targets) for targets in references], out=indptr[1:])
+            indices = np.concatenate(references) if references else np.empty(0, np.int64)
+
+            # the transpose gives the referrers of each entity
+            rows = np.repeat(np.arange(len(references)), np.diff(indptr))
+            order = np.argsort(indices, kind="stable")
+            reverse_indptr = np.zeros_like(indptr)
+            np.cumsum(np.bincount(indices, minlength=len(references)), out=reverse_indptr[1:])
+            self._reference_graph = (indptr, indices, reverse_indptr, rows[order])
+        return self._reference_graph
+
+    def references(self, index):
+        """Return the entities directly referenced by an entity.
+
+        Parameters
+        ----------
+        index : int
+            Index into :attr:`items`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted indices into :attr:`items`.
+
+        Examples
+        --------
+        >>> face = iges.items.index(iges.faces()[0])
+        >>> loops = [iges.items[i] for i in iges.references(face)]
+        """
+        indptr, indices = self.reference_graph
+        return indices[indptr[index] : indptr[index + 1]]
+
+    def referrers(self, index):
+        """Return the entities that directly reference an entity.
+
+        Parameters
+        ----------
+        index : int
+            Index into :attr:`items`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted indices into :attr:`items`.
+
+        Examples
+        --------
+        Find the entities without referrers, which are the roots of
+        the model.
+
+        >>> roots = [i for i in range(len(iges)) if not len(iges.referrers(i))]
+        """
+        _, _, indptr, indices = self._reference_graphs()
+        return indices[indptr[index] : indptr[index + 1]]
+
+    def closure(self, indices):
+        """Return entities together with everything they depend on.
+
+        Follows the references of :attr:`reference_graph` transitively,
+        so the result is a self-contained subset of the file.
+
+        Parameters
+        ----------
+        indices : sequence[int]
+            Indices into :attr:`items`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted indices into :attr:`items`, including ``indices``.
+
+        Examples
+        --------
+        >>> surfaces = [iges.items.index(s) for s in iges.bspline_surfaces()]
+        >>> subset = iges.closure(surfaces)
+        """
+        indptr, references = self.reference_graph
+        closed = np.zeros(len(self), dtype=bool)
+        frontier = np.unique(np.asarray(indices, dtype=np.int64))
+        while len(frontier):
+            closed[frontier] = True
+            frontier = _csr_rows(indptr, references, frontier)
+            frontier = np.unique(frontier[~closed[frontier]])
+        return np.flatnonzero(closed)
+
+    def write(self, filename, entities=None):
+        """Write entities to a new IGES file.
+
+        The directory and parameter sections are regenerated from the
+        entities: sequence numbers are renumbered consecutively, the
+        pointers between entities are rewritten accordingly, the
+        parameter records are wrapped to 64 columns and the counts of
+        the terminate record are recomputed.  The start and global
+        sections are copied from the source file.
+
+        Pointers to entities that are not written are set to zero, so
+        pass a :meth:`closure` to write a self-contained subset.
+
+        Parameters
+        ----------
+        filename : str
+            Filename of the IGES file.
+
+        entities : sequence[int] | sequence[pyiges.entity.Entity], optional
+            Entities, or indices into :attr:`items`, to write.  They
+            are written in file order.  Defaults to all entities.
+
+        Returns
+        -------
+        int
+            Number of entities written.
+
+        Examples
+        --------
+        Write all B-spline surfaces together with everything they depend
+        on.
+
+        >>> surfaces = [iges.items.index(s) for s in iges.bspline_surfaces()]
+        >>> iges.write("surfaces.igs", iges.closure(surfaces))
+        247
+        """
+        indices = None
+        if entities is not None:
+            positions = {id(entity): i for i, entity in enumerate(self._entities)}
+            indices = [
+                positions[id(entity)] if isinstance(entity, Entity) else int(entity)
+                for entity in entities
+            ]
+        with open(filename, "w") as f:
+            return writer.write_iges(f, self, indices)
+
+    def shard(self, n, filenames=None):
+        """Partition the model into dependency-closed groups of entities.
+
+        The top-level entities, which no other entity references, are
+        distributed over ``n`` groups balanced by their estimated
+        evaluation cost, then each group is completed with its
+        :meth:`closure`.  Entities shared by several top-level entities
+        are repeated in every group that needs them, so each group can
+        be processed on its own.
+
+        The cost of an entity is estimated by the number of its
+        parameters, which grows with the number of control points,
+        accumulated over everything it references.
+
+        Parameters
+        ----------
+        n : int
+            Number of groups.
+
+        filenames : sequence[str], optional
+            One filename per group.  When given, each group is written
+            as a self-contained IGES file with renumbered pointers, see
+            :meth:`write`.
+
+        Returns
+        -------
+        list[numpy.ndarray]
+            Sorted indices into :attr:`items` of every group.  Groups
+            are empty when there are fewer top-level entities than
+            groups.
+
+        Examples
+        --------
+        >>> shards = iges.shard(4, [f"impeller_{i}.igs" for i in range(4)])
+        >>> [len(shard) for shard in shards]
+        """
+        if n < 1:
+            raise ValueError("The number of shards must be at least 1")
+        if filenames is not None and len(filenames) != n:
+            raise ValueError("Provide one filename per shard")
+
+        indptr, indices, reverse_indptr, _ = self._reference_graphs()
+        own = np.array([len(e.parameters[0]) if e.parameters else 1 for e in self._entities])
+        costs = _accumulate_costs(indptr, indices, own)
+
+        # longest processing time first onto the least loaded group
+        roots = np.flatnonzero(np.diff(reverse_indptr) == 0)
+        loads = [(0.0, group) for group in range(n)]
+        members = [[] for _ in range(n)]
+        for root in roots[np.argsort(-costs[roots], kind="stable")]:
+            load, group = heapq.heappop(loads)
+            members[group].append(root)
+            heapq.heappush(loads, (load + costs[root], group))
+
+        shards = [self.closure(group) for group in members]
+        if filenames is not None:
+            for shard, filename in zip(shards, filenames):
+                self.write(filename, shard)
+        return shards
+
+    def query_box(self, bounds):
+        """Return the indices of entities whose bounds intersect a box.
+
+        Parameters
+        ----------
+        bounds : sequence[float]
+            Query box as ``(xmin, xmax, ymin, ymax, zmin, zmax)``.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted indices into :attr:`items`.
+
+        Examples
+        --------
+        >>> idx = iges.query_box([-10, 10, -10, 10, -10, 10])
+        >>> entities = [iges.items[i] for i in idx]
+        """
+        return self.spatial_index.query_box(bounds)
+
+    def query_sphere(self, center, radius):
+        """Return the indices of entities whose bounds intersect a sphere.
+
+        Parameters
+        ----------
+        center : sequence[float]
+            Center of the sphere.
+
+        radius : float
+            Radius of the sphere.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted indices into :attr:`items`.
+        """
+        return self.spatial_index.query_sphere(center, radius)
+
+    def nearest(self, point, k=1):
+        """Return the ``k`` entities whose bounds are closest to a point.
+
+        Parameters
+        ----------
+        point : sequence[float]
+            Query point.
+
+        k : int, optional
+            Number of entities to return.
+
+        Returns
+        -------
+        indices : numpy.ndarray
+            Indices into :attr:`items`, closest first.
+
+        distances : numpy.ndarray
+            Distance from ``point`` to the bounds of each entity.
+        """
+        return self.spatial_index.nearest(point, k)
+
+    def closest_point(self, points, samples_per_span=4, chunk_size=2**14):
+        """Project points onto the closest B-spline surface.
+
+        Surfaces whose bounds are farther from a point than the
+        farthest corner of the nearest bounds cannot contain its
+        closest point and are skipped for that point.  Remaining
+        candidates are visited nearest first and each one is only
+        evaluated for the points it may still improve.
+
+        Parameters
+        ----------
+        points : array_like
+            ``(n, 3)`` array of query points.
+
+        samples_per_span : int, optional
+            Seed samples per knot span and direction.  See
+            :func:`pyiges.geometry.RationalBSplineSurface.closest_point`.
+
+        chunk_size : int, optional
+            Number of points for which the candidate surfaces are
+            computed at once.
+
+        Returns
+        -------
+        closest : numpy.ndarray
+            ``(n, 3)`` array of closest points.
+
+        distance : numpy.ndarray
+            Distance from each query point to its closest point.
+
+        indices : numpy.ndarray
+            Index into :attr:`items` of the surface holding each
+            closest point, ``-1`` when the file has no surfaces.
+
+        Examples
+        --------
+        >>> closest, distance, indices = iges.closest_point(scan_points)
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        closest = np.full_like(points, np.nan)
+        distance = np.full(points.shape[0], np.inf)
+        indices = np.full(points.shape[0], -1, dtype=np.int64)
+
+        surfaces = [
+            i
+            for i, item in enumerate(self.items)
+            if isinstance(item, geometry.RationalBSplineSurface)
+        ]
+        if not surfaces:
+            return closest, distance, indices
+        bounds = np.array([self.items[i].bounds for i in surfaces])
+        lower, upper = bounds[:, ::2], bounds[:, 1::2]
+
+        for start in range(0, points.shape[0], chunk_size):
+            chunk = slice(start, start + chunk_size)
+            chunk_points = points[chunk, None, :]
+            # distance to each box and to its farthest corner
+            near = np.maximum(lower - chunk_points, 0) + np.maximum(chunk_points - upper, 0)
+            far = np.maximum(np.abs(lower - chunk_points), np.abs(upper - chunk_points))
+            near = np.sqrt((near**2).sum(axis=2))
+            best = np.sqrt((far**2).sum(axis=2)).min(axis=1)
+
+            chunk_closest = closest[chunk]
+            chunk_distance = distance[chunk]
+            chunk_indices = indices[chunk]
+            for j in np.argsort(near.mean(axis=0)):
+                candidates = np.nonzero(near[:, j] <= np.minimum(best, chunk_distance))[0]
+                if not candidates.size:
+                    continue
+                surface = self.items[surfaces[j]]
+                found, _, found_distance = surface.closest_point(
+                    points[chunk][candidates], samples_per_span=samples_per_span
+                )
+                better = found_distance < chunk_distance[candidates]
+                candidates = candidates[better]
+                chunk_closest[candidates] = found[better]
+                chunk_distance[candidates] = found_distance[better]
+                chunk_indices[candidates] = surfaces[j]
+
+        return closest, distance, indices
+
+    def raycast(self, origins, directions, delta=0.025):
+        """Intersect rays with the B-spline surfaces of the model.
+
+        The surfaces are tessellated with
+        :func:`pyiges.geometry.RationalBSplineSurface.tessellate` the
+        first time a ``delta`` is used and the resulting
+        :class:`pyiges.spatial.RayCaster` is cached for later calls.
+        Neither ``pyvista`` nor a render window is required.
+
+        Parameters
+        ----------
+        origins : array_like
+            ``(n, 3)`` ray origins, or a single origin shared by all
+            rays.
+
+        directions : array_like
+            ``(n, 3)`` ray directions, or a single direction shared by
+            all rays.
+
+        delta : float, optional
+            Tessellation resolution of the surfaces.
+
+        Returns
+        -------
+        distance : numpy.ndarray
+            Distance along each ray to its first hit, ``inf`` for
+            rays that miss the model.
+
+        indices : numpy.ndarray
+            Index into :attr:`items` of the surface hit by each ray,
+            ``-1`` for misses.
+
+        Examples
+        --------
+        >>> distance, indices = iges.raycast([0, 0, 100], [[0, 0, -1], [0, 0.1, -1]])
+        """
+        if delta not in self._ray_casters:
+            points, triangles, ids = [], [], []
+            n_points = 0
+            for i, item in enumerate(self._entities):
+                if isinstance(item, _SURFACES) and _tessellable(item):
+                    item_points, item_triangles = item.tessellate(delta)
+                    points.append(item_points)
+                    triangles.append(item_triangles + n_points)
+                    ids.append(np.full(item_triangles.shape[0], i))
+                    n_points += item_points.shape[0]
+            if points:
+                caster = RayCaster(np.vstack(points), np.vstack(triangles), np.concatenate(ids))
+            else:
+                caster = RayCaster(np.empty((0, 3)), np.empty((0, 3)))
+            self._ray_casters[delta] = caster
+        return self._ray_casters[delta].intersect(origins, directions)
+
+    def geometric_properties(self, points_per_span=6):
+        """Return lengths, areas and centroids of all curves and surfaces.
+
+        Lines and B-spline curves contribute a length, B-spline surfaces
+        an (untrimmed) area.  Curve and surface measures are integrated
+        with Gauss–Legendre quadrature per knot span without
+        tessellating.
+
+        Parameters
+        ----------
+        points_per_span : int, optional
+            Number of quadrature points per knot span and direction.
+
+        Returns
+        -------
+        numpy.ndarray
+            Structured array with one row per entity and the fields
+            ``index`` (into :attr:`items`), ``type`` (IGES entity
+            type), ``length``, ``area`` and ``centroid``.  The measure
+            that does not apply to an entity is ``nan``.
+
+        Examples
+        --------
+        >>> props = iges.geometric_properties()
+        >>> props["area"][props["type"] == 128].sum()
+        """
+        rows = []
+        for i, item in enumerate(self._entities):
+            length = area = np.nan
+            if isinstance(item, geometry.Line):
+                length = item.length()
+                centroid = item.coordinates.mean(axis=0)
+            elif isinstance(item, geometry.RationalBSplineCurve):
+                length, centroid = item._length_and_centroid(points_per_span)
+            elif isinstance(item, geometry.RationalBSplineSurface):
+                area, centroid = item._area_and_centroid(points_per_span)
+            else:
+                continue
+            rows.append((i, item.d["entity_type_number"], length, area, centroid))
+
+        dtype = [
+            ("index", np.int64),
+            ("type", np.int64),
+            ("length", float),
+            ("area", float),
+            ("centroid", float, (3,)),
+        ]
+        return np.array(rows, dtype=dtype)
+
+    def sample_points(self, n, seed=None, with_normals=True):
+        """Draw points uniformly distributed over the B-spline surfaces.
+
+        Samples are allocated to the surfaces in proportion to their
+        area (see :func:`pyiges.geometry.RationalBSplineSurface.area`)
+        and drawn per surface with
+        :func:`pyiges.geometry.RationalBSplineSurface.sample_points`,
+        so memory use only grows with ``n``.
+
+        Parameters
+        ----------
+        n : int
+            Total number of points.
+
+        seed : int | numpy.random.Generator, optional
+            Seed or generator used to draw the samples.
+
+        with_normals : bool, optional
+            Also return the unit normal at each point.
+
+        Returns
+        -------
+        points : numpy.ndarray
+            ``(n, 3)`` sampled points, grouped by surface.
+
+        normals : numpy.ndarray
+            ``(n, 3)`` unit normals, only returned when
+            ``with_normals`` is set.
+
+        Examples
+        --------
+        >>> points, normals = iges.sample_points(100000, seed=0)
+        """
+        rng = np.random.default_rng(seed)
+        surfaces = [
+            item for item in self._entities if isinstance(item, geometry.RationalBSplineSurface)
+        ]
+        if n and not surfaces:
+            raise ValueError("This file contains no B-spline surfaces to sample")
+
+        points = np.empty((n, 3))
+        normals = np.empty((n, 3))
+        if surfaces:
+            areas = np.nan_to_num([surface.area() for surface in surfaces])
+            if areas.sum() > 0:
+                counts = rng.multinomial(n, areas / areas.sum())
+            else:
+                counts = rng.multinomial(n, np.full(len(surfaces), 1 / len(surfaces)))
+            start = 0
+            for surface, count in zip(surfaces, counts):
+                if not count:
+                    continue
+                chunk = slice(start, start + count)
+                sample = surface.sample_points(count, rng, with_normals)
+                if with_normals:
+                    points[chunk], normals[chunk] = sample
+                else:
+                    points[chunk] = sample
+                start += count
+
+        if with_normals:
+            return points, normals
+        return points
+
     def from_pointer(self, ptr):
         """Return the entity addressed by an IGES pointer."""
-        return self[self._pointers[ptr]]
+        return self[ptr]
 
     @staticmethod
     def _parse_separators_from_first_global_line(line):
@@ -262,8 +1433,8 @@ class Iges:
             raise RuntimeError("Invalid Global section format")
         return a, b
 
-    def _read(self, filename):
-        with open(filename) as f:
+    def _read(self, filename, progress=None):
+        with sources.open_text(filename) as f:
             param_string = ""
             entity_list = []
             entity_index = 0
@@ -271,19 +1442,24 @@ class Iges:
             first_global_line = True
             first_param_line = True
             global_string = ""
+            start_lines, global_lines = [], []
             pointer_dict = {}
             entities_to_discard = []
 
-            # for line in tqdm(f.readlines(), desc='Reading file'):
-            for line_no, line in enumerate(f.readlines(), start=1):
+            lines = sources.fixed_format_lines(f, self._parse_separators_from_first_global_line)
+            if progress is not None:
+                lines = progress(lines, desc="Reading file")
+            for line_no, line in enumerate(lines, start=1):
                 data = line[:80]
                 id_code = line[72]
 
                 if id_code == "S":  # Start
                     desc = line[:72].strip()
+                    start_lines.append(line[:72])
 
                 elif id_code == "G":  # Global
                     global_string += data  # Consolidate all global lines
+                    global_lines.append(line[:72])
                     if first_global_line:
                         (
                             param_sep,
@@ -298,25 +1474,25 @@ class Iges:
                         if entity_type_number == 100:  # Circular arc
                             e = geometry.CircularArc(self)
                         elif entity_type_number == 102:  # Composite curve
-                            e = Entity(self)
+                            e = geometry.CompositeCurve(self)
                         elif entity_type_number == 104:  # Conic arc
                             e = geometry.ConicArc(self)
                         elif entity_type_number == 108:  # Plane
-                            e = Entity(self)
+                            e = geometry.Plane(self)
                         elif entity_type_number == 110:  # Line
                             e = geometry.Line(self)
                         elif entity_type_number == 112:  # Parametric spline curve
-                            e = Entity(self)
+                            e = geometry.ParametricSplineCurve(self)
                         elif entity_type_number == 114:  # Parametric spline surface
-                            e = Entity(self)
+                            e = geometry.ParametricSplineSurface(self)
                         elif entity_type_number == 116:  # Point
                             e = geometry.Point(self)
                         elif entity_type_number == 118:  # Ruled surface
-                            e = Entity(self)
+                            e = geometry.RuledSurface(self)
                         elif entity_type_number == 120:  # Surface of revolution
-                            e = Entity(self)
+                            e = geometry.SurfaceOfRevolution(self)
                         elif entity_type_number == 122:  # Tabulated cylinder
-                            e = Entity(self)
+                            e = geometry.TabulatedCylinder(self)
                         elif entity_type_number == 124:  # Transformation matrix
                             e = geometry.Transformation(self)
                         elif entity_type_number == 126:  # Rational B-spline curve
@@ -357,8 +1533,8 @@ class Iges:
                         e.add_section(data[32:40], "level")
                         e.add_section(data[40:48], "view")
                         e.add_section(data[48:56], "transform")
-                        e.add_section(data[56:65], "label_assoc")
-                        e.add_section(data[65:72], "status_number")
+                        e.add_section(data[56:64], "label_assoc")
+                        e.add_section(data[64:72], "status_number")
                         e.sequence_number = int(data[73:].strip())
 
                         first_dict_line = False
@@ -412,6 +1588,9 @@ class Iges:
         self._entities = entity_list
         self.desc = desc
         self._pointers = pointer_dict
+        self._start_lines = start_lines
+        self._global_lines = global_lines
+        self._separators = (param_sep, record_sep)
 
     def __getitem__(self, index):
         """Get an item by its pointer."""
@@ -434,13 +1613,336 @@ class Iges:
         return self._entities
 
 
+def _grid_subsamplings(grid, axis):
+    """Return every power of two subsampling of a grid axis and its error."""
+    n_samples = grid.shape[axis]
+    strides = 2 ** np.arange(int(np.log2(n_samples - 1)) + 1)
+    kept = [geometry._subsample_indices(n_samples, stride) for stride in strides]
+    return kept, np.array([geometry._subsample_error(grid, k, axis) for k in kept])
+
+
+def _refine_surfaces(surfaces, delta, deadline, triangle_budget, n_coarse=5):
+    """Tessellate surfaces coarsely, then refine the worst ones in turn.
+
+    Every surface starts on an ``n_coarse`` square grid.  Refining
+    doubles the grid cells per direction, up to the grid of ``delta``,
+    so the previous grid is nested in the new one and its error can be
+    measured.  Halving the sample spacing of a smooth surface divides
+    the interpolation error by about four, which gives the estimated
+    error of the new grid.
+
+    Parameters
+    ----------
+    surfaces : list[tuple[int, RationalBSplineSurface]]
+        Indices and surfaces to tessellate.
+
+    delta : float
+        Resolution of the finest grid.
+
+    deadline : float
+        :func:`time.perf_counter` value after which no further
+        refinement is started.
+
+    triangle_budget : int | None
+        Maximum number of triangles of all surfaces after refinement.
+
+    Returns
+    -------
+    grids : dict[int, numpy.ndarray]
+        ``(n_v, n_u, 3)`` grid of points per surface index.
+
+    coarse : dict[int, float]
+        Estimated error of the surfaces that did not reach ``delta``.
+    """
+    n_final = geometry._sample_count(delta)
+    n_start = min(n_coarse, n_final)
+    grids = {}
+    errors = {}
+    for index, entity in surfaces:
+        grid = grids[index] = entity._evaluate_samples(n_start)[0, 0]
+        if n_start < n_final:
+            # the grid of every other sample is nested in the coarse grid
+            errors[index] = _nested_error(grid) / 4
+
+    n_triangles = sum(2 * (len(grid) - 1) ** 2 for grid in grids.values())
+    heap = [(-error, index) for index, error in errors.items()]
+    heapq.heapify(heap)
+    entities = dict(surfaces)
+    while heap and time.perf_counter() < deadline:
+        _, index = heapq.heappop(heap)
+        n_samples = len(grids[index])
+        n_next = min(2 * n_samples - 1, n_final)
+        added = 2 * ((n_next - 1) ** 2 - (n_samples - 1) ** 2)
+        if triangle_budget is not None and n_triangles + added > triangle_budget:
+            # leave this surface coarse, a smaller one may still fit
+            continue
+
+        grid = grids[index] = entities[index]._evaluate_samples(n_next)[0, 0]
+        n_triangles += added
+        if n_next == n_final:
+            del errors[index]
+        else:
+            errors[index] = _nested_error(grid) / 4
+            heapq.heappush(heap, (-errors[index], index))
+
+    return grids, errors
+
+
+def _allocate_samples(surfaces, triangle_budget, curvature_weight=1.0):
+    """Return the samples per direction allocated to each surface.
+
+    See :meth:`Iges.allocate_triangles`.  The cells of every surface are
+    its ideal fractional cells scaled by a common factor and rounded
+    down, and the largest factor that fits the budget is found by
+    bisection.
+    """
+    if not surfaces:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+
+    weights = np.empty(len(surfaces))
+    aspect = np.empty(len(surfaces))
+    for i, (_, entity) in enumerate(surfaces):
+        area, lengths, turning = nurbs.control_net_measures(entity._control_net())
+        size = lengths * (1 + curvature_weight * turning)
+        weights[i] = area * (1 + curvature_weight * turning.sum())
+        aspect[i] = size[0] / size[1] if size.all() else 1
+
+    total = weights.sum()
+    share = weights / total if total > 0 else np.full(len(surfaces), 1 / len(surfaces))
+    # cells_u * cells_v is proportional to the share and cells_u / cells_v to the aspect
+    cells_u = np.sqrt(share * aspect / 2)
+    cells_v = np.sqrt(share / aspect / 2)
+
+    def count(scale):
+        n_u = np.maximum(np.floor(scale * cells_u), 1).astype(int)
+        n_v = np.maximum(np.floor(scale * cells_v), 1).astype(int)
+        return n_u, n_v, 2 * (n_u * n_v).sum()
+
+    # without the minimum of one cell, the square root of the budget always fits
+    low = np.sqrt(triangle_budget)
+    if count(low)[2] > triangle_budget:
+        low = 0
+    high = 2 * low + 1
+    while count(high)[2] <= triangle_budget:
+        low, high = high, 2 * high
+    for _ in range(50):
+        middle = (low + high) / 2
+        if count(middle)[2] <= triangle_budget:
+            low = middle
+        else:
+            high = middle
+    n_u, n_v, _ = count(low)
+    return n_u + 1, n_v + 1
+
+
+def _nested_error(grid):
+    """Return the error bound of the grid of every other sample of ``grid``."""
+    error = 0
+    for axis in range(2):
+        kept = geometry._subsample_indices(grid.shape[axis], 2)
+        error += geometry._subsample_error(grid, kept, axis)
+    return error
+
+
+def _export_blocks(filename, format, blocks):
+    """Write tessellation blocks with the writer for ``format`` or the file extension."""
+    if format is None:
+        format = os.path.splitext(os.fspath(filename))[1].lstrip(".")
+    format = format.lower()
+    if format not in exporters.WRITERS:
+        raise ValueError(
+            f"Unsupported export format '{format}', expected one of " + ", ".join(exporters.WRITERS)
+        )
+    with open(filename, "wb") as file:
+        return exporters.WRITERS[format](file, blocks)
+
+
+def _tessellable(entity):
+    """Return whether an entity can be tessellated.
+
+    Analytic surfaces and composite curves whose curves cannot be
+    sampled are left out, see their ``_sampleable`` property.
+    """
+    return getattr(entity, "_sampleable", True)
+
+
+def _tessellate_entity(entity, delta):
+    """Return the ``(points, cells)`` of one entity for :meth:`Iges.iter_tessellation`."""
+    if isinstance(entity, _SURFACES):
+        return entity.tessellate(delta)
+    if isinstance(entity, (*_SPLINE_CURVES, geometry.CompositeCurve, geometry.ConicArc)):
+        if isinstance(entity, geometry.ConicArc):
+            points = entity.tessellate(geometry._sample_count(delta))
+        else:
+            points = entity.tessellate(delta)
+        start = np.arange(len(points) - 1)
+        return points, np.column_stack((start, start + 1))
+    if isinstance(entity, geometry.Line):
+        return entity.coordinates, np.array([[0, 1]])
+    return entity.coordinate[None], np.array([[0]])
+
+
+async def _run_cooperatively(function, executor, progress, n_reports=100):
+    """Run ``function(wrap)`` in an executor, with progress and cancellation.
+
+    ``wrap`` wraps the main loop of the function like ``tqdm``.  Between
+    items it checks whether the awaiting task was cancelled and posts
+    the progress to a queue, which is drained on the event loop so the
+    progress callback runs there, in order, before the result is
+    returned.
+    """
+    loop = asyncio.get_running_loop()
+    cancelled = threading.Event()
+    reports = asyncio.Queue()
+
+    def wrap(iterable, *args, **kwargs):
+        total = len(iterable) if hasattr(iterable, "__len__") else None
+        step = max(total // n_reports, 1) if total else 1000
+        done = 0
+        for done, item in enumerate(iterable, start=1):
+            if cancelled.is_set():
+                raise asyncio.CancelledError
+            yield item
+            if done % step == 0:
+                loop.call_soon_threadsafe(reports.put_nowait, (done, total))
+        loop.call_soon_threadsafe(reports.put_nowait, (done, total))
+
+    future = loop.run_in_executor(executor, function, wrap)
+    future.add_done_callback(lambda _: reports.put_nowait(None))
+    try:
+        while (report := await reports.get()) is not None:
+            if progress is not None:
+                result = progress(*report)
+                if inspect.isawaitable(result):
+                    await result
+        return await future
+    except asyncio.CancelledError:
+        cancelled.set()
+        # the worker stops at the next item and its error is not awaited
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        raise
+
+
+def _accumulate_costs(indptr, indices, own):
+    """Return the cost of every entity of a reference graph plus its references.
+
+    The graph is visited in post order, so references are accumulated
+    before their referrers.  Shared references count once per
+    referrer, and references closing a cycle are ignored.
+    """
+    costs = np.asarray(own, dtype=float).copy()
+    state = np.zeros(len(costs), dtype=np.int8)  # 0 new, 1 open, 2 done
+    for start in range(len(costs)):
+        if state[start]:
+            continue
+        stack = [start]
+        while stack:
+            node = stack[-1]
+            if state[node] == 0:
+                state[node] = 1
+                stack.extend(
+                    child for child in indices[indptr[node] : indptr[node + 1]] if not state[child]
+                )
+            else:
+                stack.pop()
+                if state[node] == 1:
+                    state[node] = 2
+                    children = indices[indptr[node] : indptr[node + 1]]
+                    costs[node] += costs[children[state[children] == 2]].sum()
+    return costs
+
+
+def _csr_rows(indptr, indices, rows):
+    """Return the concatenated column indices of ``rows`` of a CSR graph."""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return indices[offsets + np.arange(lengths.sum())]
+
+
+def _concatenate_blocks(blocks):
+    """Join ``(points, cells, index)`` tuples into one block with entity ids."""
+    n_points = np.cumsum([0] + [len(points) for points, _, _ in blocks[:-1]])
+    points = np.vstack([points for points, _, _ in blocks])
+    cells = np.vstack([cells + offset for (_, cells, _), offset in zip(blocks, n_points)])
+    entity_ids = np.concatenate([np.full(len(cells), index) for _, cells, index in blocks])
+    return points, cells, entity_ids
+
+
+def _cast_points(mesh, dtype, offset, shift=True):
+    """Shift the points of ``mesh`` by ``-offset`` and cast them to ``dtype``."""
+    if offset is not None:
+        if shift and mesh.n_points:
+            mesh.points = mesh.points - offset
+        mesh.field_data["Offset"] = offset
+    if dtype is not None and mesh.n_points:
+        mesh.points = mesh.points.astype(dtype, copy=False)
+    return mesh
+
+
+def _merge_polydata(items):
+    """Append a sequence of ``pyvista.PolyData`` into a single mesh."""
+    from vtkmodules.vtkFiltersCore import vtkAppendPolyData
+
+    if not len(items):
+        return pyvista.PolyData()
+
+    if not all(isinstance(item, pyvista.PolyData) for item in items):
+        raise ValueError("Only PolyData can be merged, use merge=False")
+
+    afilter = vtkAppendPolyData()
+    for item in items:
+        afilter.AddInputData(item)
+    afilter.Update()
+
+    return pyvista.wrap(afilter.GetOutput())
+
+
+async def aread(filename, executor=None, progress=None):
+    """Read an iges file without blocking the event loop.
+
+    Parses the file in an executor.  The parser checks for
+    cancellation between lines, so cancelling the awaiting task raises
+    :class:`asyncio.CancelledError` and stops reading at the next line.
+
+    Parameters
+    ----------
+    filename : str | os.PathLike | bytes | memoryview | file object
+        IGES file, see :func:`read`.
+
+    executor : concurrent.futures.Executor, optional
+        Thread pool executor to read in.  Defaults to the default
+        executor of the running loop.
+
+    progress : function, optional
+        Coroutine function, or function, called as
+        ``progress(done, None)`` with the number of lines read while
+        reading advances.  The total is not known in advance.
+
+    Returns
+    -------
+    pyiges.Iges
+        Parsed file.
+
+    Examples
+    --------
+    >>> import pyiges
+    >>> from pyiges import examples
+    >>> iges = await pyiges.aread(examples.impeller)
+    """
+    return await _run_cooperatively(lambda wrap: Iges(filename, progress=wrap), executor, progress)
+
+
 def read(filename):
     """Read an iges file.
 
     Parameters
     ----------
-    filename : str
-        Filename of an IGES file.
+    filename : str | os.PathLike | bytes | memoryview | file object
+        Filename of an IGES file in the fixed or the compressed ASCII
+        form, its content, or a binary or text stream of it.  gzip,
+        bz2 and zstd compressed files are decompressed while they are
+        read, see :func:`pyiges.sources.open_text`.
 
     Examples
     --------
@@ -450,5 +1952,9 @@ def read(filename):
         pyiges.Iges object
         Description:
         Number of Entities: 4615
+
+    Read a file that is already in memory, for example an upload.
+
+    >>> iges = pyiges.read(request_body)
     """
     return Iges(filename)
@@ -0,0 +1,712 @@
+"""Vectorized evaluation of rational B-spline curves and surfaces.
+
+The functions in this module are plain ``numpy`` implementations of
+the algorithms in Piegl & Tiller, *The NURBS Book*, evaluated for many
+parameter values at once.  They do not depend on ``geomdl`` and are
+available in the minimal install.
+"""
+
+from math import comb
+
+import numpy as np
+
+
+def domain(knots, degree):
+    """Return the ``(start, end)`` parameter range of a knot vector."""
+    return knots[degree], knots[len(knots) - degree - 1]
+
+
+def find_span(knots, degree, t):
+    """Return the knot span index of every parameter value.
+
+    Parameter values on or beyond the end of the domain are placed in
+    the last non-empty span so the curve end point is included.
+    """
+    last = len(knots) - degree - 2
+    span = np.searchsorted(knots, t, side="right") - 1
+    return np.clip(span, degree, last)
+
+
+def basis_function_derivatives(knots, degree, t, n_derivatives=0):
+    """Evaluate the non-zero basis functions and their derivatives.
+
+    This is algorithm A2.3 of The NURBS Book with the parameter axis
+    kept last, so every step operates on contiguous arrays.
+
+    Parameters
+    ----------
+    knots : numpy.ndarray
+        Knot vector.
+
+    degree : int
+        Degree of the basis functions.
+
+    t : numpy.ndarray
+        ``(m,)`` parameter values.
+
+    n_derivatives : int, optional
+        Highest derivative to compute.
+
+    Returns
+    -------
+    span : numpy.ndarray
+        ``(m,)`` knot span of each parameter.
+
+    ders : numpy.ndarray
+        ``(n_derivatives + 1, degree + 1, m)`` array where
+        ``ders[k, r]`` is the ``k``-th derivative of basis function
+        ``span - degree + r``.
+    """
+    t = np.asarray(t, dtype=float).ravel()
+    span = find_span(knots, degree, t)
+    m, p = t.size, degree
+
+    # triangular table of basis functions (upper) and knot differences (lower)
+    ndu = np.empty((p + 1, p + 1, m))
+    ndu[0, 0] = 1.0
+    left = np.empty((p + 1, m))
+    right = np.empty((p + 1, m))
+    for j in range(1, p + 1):
+        left[j] = t - knots[span + 1 - j]
+        right[j] = knots[span + j] - t
+        saved = np.zeros(m)
+        for r in range(j):
+            ndu[j, r] = right[r + 1] + left[j - r]
+            temp = _safe_divide(ndu[r, j - 1], ndu[j, r])
+            ndu[r, j] = saved + right[r + 1] * temp
+            saved = left[j - r] * temp
+        ndu[j, j] = saved
+
+    ders = np.zeros((n_derivatives + 1, p + 1, m))
+    ders[0] = ndu[:, p]
+    a = np.empty((2, p + 1, m))
+    for r in range(p + 1):
+        s1, s2 = 0, 1
+        a[0] = 0.0
+        a[0, 0] = 1.0
+        for k in range(1, min(n_derivatives, p) + 1):
+            d = np.zeros(m)
+            rk, pk = r - k, p - k
+            a[s2] = 0.0
+            if r >= k:
+                a[s2, 0] = _safe_divide(a[s1, 0], ndu[pk + 1, rk])
+                d = a[s2, 0] * ndu[rk, pk]
+            j1 = 1 if rk >= -1 else -rk
+            j2 = k - 1 if r - 1 <= pk else p - r
+            for j in range(j1, j2 + 1):
+                a[s2, j] = _safe_divide(a[s1, j] - a[s1, j - 1], ndu[pk + 1, rk + j])
+                d += a[s2, j] * ndu[rk + j, pk]
+            if r <= pk:
+                a[s2, k] = _safe_divide(-a[s1, k - 1], ndu[pk + 1, r])
+                d += a[s2, k] * ndu[r, pk]
+            ders[k, r] = d
+            s1, s2 = s2, s1
+
+    factor = p
+    for k in range(1, n_derivatives + 1):
+        ders[k] *= factor
+        factor *= p - k
+    return span, ders
+
+
+def _safe_divide(numerator, denominator):
+    """Divide, treating ``0/0`` terms from repeated knots as zero."""
+    out = np.zeros_like(numerator)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+
+def _homogeneous(control_points, weights):
+    """Stack weighted control points and weights into ``(..., 4)``."""
+    control_points = np.asarray(control_points, dtype=float)
+    weights = np.asarray(weights, dtype=float)[..., None]
+    return np.concatenate((control_points * weights, weights), axis=-1)
+
+
+def curve_derivatives(knots, degree, control_points, weights, t, n_derivatives=0):
+    """Evaluate a rational B-spline curve and its derivatives.
+
+    Parameters
+    ----------
+    knots : numpy.ndarray
+        Knot vector.
+
+    degree : int
+        Degree of the curve.
+
+    control_points : numpy.ndarray
+        ``(n, 3)`` control points.
+
+    weights : numpy.ndarray
+        ``(n,)`` control point weights.
+
+    t : numpy.ndarray
+        ``(m,)`` parameter values.
+
+    n_derivatives : int, optional
+        Highest derivative to compute.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(n_derivatives + 1, m, 3)`` array with the curve points
+        followed by their derivatives with respect to ``t``.
+    """
+    knots = np.asarray(knots, dtype=float)
+    cpw = _homogeneous(control_points, weights).T
+    span, ders = basis_function_derivatives(knots, degree, t, n_derivatives)
+
+    homogeneous = np.zeros((n_derivatives + 1, 4, span.size))
+    for r in range(degree + 1):
+        cw = cpw[:, span - degree + r]
+        for k in range(n_derivatives + 1):
+            homogeneous[k] += ders[k, r] * cw
+
+    return np.moveaxis(_rational_derivatives(homogeneous[:, None]), -1, -2)[:, 0]
+
+
+def surface_derivatives(
+    knots_u, degree_u, knots_v, degree_v, control_points, weights, u, v, n_derivatives=0
+):
+    """Evaluate a rational B-spline surface and its partial derivatives.
+
+    Parameters
+    ----------
+    knots_u, knots_v : numpy.ndarray
+        Knot vectors of the first and second parametric direction.
+
+    degree_u, degree_v : int
+        Degrees of the first and second parametric direction.
+
+    control_points : numpy.ndarray
+        ``(n_v, n_u, 3)`` control net, the first parametric direction
+        varies fastest.
+
+    weights : numpy.ndarray
+        ``(n_v, n_u)`` control point weights.
+
+    u, v : numpy.ndarray
+        ``(m,)`` parameter values evaluated pairwise.
+
+    n_derivatives : int, optional
+        Highest total derivative order to compute.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(n_derivatives + 1, n_derivatives + 1, m, 3)`` array where
+        ``[k, l]`` holds the derivative taken ``k`` times with respect
+        to ``u`` and ``l`` times with respect to ``v``.  Entries with
+        ``k + l > n_derivatives`` are left as zero.
+    """
+    cpw = _homogeneous(control_points, weights)
+    n_u = cpw.shape[1]
+    cpw = cpw.reshape(-1, 4).T
+    span_u, ders_u = basis_function_derivatives(
+        np.asarray(knots_u, dtype=float), degree_u, u, n_derivatives
+    )
+    span_v, ders_v = basis_function_derivatives(
+        np.asarray(knots_v, dtype=float), degree_v, v, n_derivatives
+    )
+
+    # contract the first direction for every row of the control net
+    # touched by a point, then the second direction
+    d = n_derivatives
+    homogeneous = np.zeros((d + 1, d + 1, 4, span_u.size))
+    for b in range(degree_v + 1):
+        row = (span_v - degree_v + b) * n_u + span_u - degree_u
+        partial = np.zeros((d + 1, 4, span_u.size))
+        for a in range(degree_u + 1):
+            cw = cpw[:, row + a]
+            for k in range(d + 1):
+                partial[k] += ders_u[k, a] * cw
+        for k in range(d + 1):
+            for m in range(d - k + 1):
+                homogeneous[k, m] += ders_v[m, b] * partial[k]
+
+    return np.moveaxis(_rational_derivatives(homogeneous), -1, -2)
+
+
+def surface_grid_derivatives(
+    knots_u, degree_u, knots_v, degree_v, control_points, weights, u, v, n_derivatives=0
+):
+    """Evaluate a rational B-spline surface on the tensor grid ``v x u``.
+
+    Same as :func:`surface_derivatives`, but the surface is evaluated
+    for every combination of ``u`` and ``v`` using dense basis
+    matrices, which is much faster for structured grids.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(n_derivatives + 1, n_derivatives + 1, len(v), len(u), 3)``
+        array, ``u`` varies fastest.
+    """
+    cpw = _homogeneous(control_points, weights)
+    n_v, n_u = cpw.shape[:2]
+    basis_u = basis_matrix(knots_u, degree_u, n_u, u, n_derivatives)
+    basis_v = basis_matrix(knots_v, degree_v, n_v, v, n_derivatives)
+
+    d = n_derivatives
+    homogeneous = np.zeros((d + 1, d + 1, 4, basis_v.shape[1], basis_u.shape[1]))
+    for k in range(d + 1):
+        partial = np.einsum("jic,ui->cju", cpw, basis_u[k])
+        for m in range(d - k + 1):
+            homogeneous[k, m] = np.einsum("vj,cju->cvu", basis_v[m], partial)
+
+    return np.moveaxis(_rational_derivatives(homogeneous), 2, -1)
+
+
+def basis_matrix(knots, degree, n_control_points, t, n_derivatives=0):
+    """Return dense basis function matrices.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(n_derivatives + 1, len(t), n_control_points)`` array holding
+        the derivatives of every basis function at every parameter.
+    """
+    span, ders = basis_function_derivatives(
+        np.asarray(knots, dtype=float), degree, t, n_derivatives
+    )
+    matrix = np.zeros((n_derivatives + 1, span.size, n_control_points))
+    rows = np.arange(span.size)
+    for r in range(degree + 1):
+        matrix[:, rows, span - degree + r] = ders[:, r]
+    return matrix
+
+
+def _rational_derivatives(homogeneous):
+    """Apply the rational quotient rule, see The NURBS Book A4.4.
+
+    ``homogeneous`` holds the derivatives of the weighted points in
+    ``[k, l, :3]`` and of the weight in ``[k, l, 3]``.  A curve is
+    handled as a surface with a single ``l`` entry.
+    """
+    n_k, n_l = homogeneous.shape[:2]
+    aders, wders = homogeneous[:, :, :3], homogeneous[:, :, 3:]
+    out = np.zeros_like(aders)
+    for k in range(n_k):
+        for m in range(n_l - k if n_l > 1 else 1):
+            v = aders[k, m].copy()
+            for j in range(1, m + 1):
+                v -= comb(m, j) * wders[0, j] * out[k, m - j]
+            for i in range(1, k + 1):
+                v -= comb(k, i) * wders[i, 0] * out[k - i, m]
+                for j in range(1, m + 1):
+                    v -= comb(k, i) * comb(m, j) * wders[i, j] * out[k - i, m - j]
+            out[k, m] = v / wders[0, 0]
+    return out
+
+
+def surface_curvature(ders):
+    """Return the Gaussian and mean curvature from surface derivatives.
+
+    Parameters
+    ----------
+    ders : numpy.ndarray
+        Derivatives up to second order as returned by
+        :func:`surface_derivatives`, shape ``(3, 3, ..., 3)``.
+
+    Returns
+    -------
+    gaussian, mean : numpy.ndarray
+        Curvatures at every point, ``nan`` where the surface is
+        degenerate.  As in VTK, the mean curvature is positive where
+        the surface bends away from ``S_u x S_v``, such as a sphere with
+        outward normals.
+    """
+    s_u, s_v = ders[1, 0], ders[0, 1]
+    normal = np.cross(s_u, s_v)
+    norm = np.linalg.norm(normal, axis=-1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        normal = normal / norm
+        # coefficients of the first and second fundamental forms
+        e, f, g = (np.sum(a * b, axis=-1) for a, b in ((s_u, s_u), (s_u, s_v), (s_v, s_v)))
+        b_uu, b_uv, b_vv = (
+            np.sum(d * normal, axis=-1) for d in (ders[2, 0], ders[1, 1], ders[0, 2])
+        )
+        det = e * g - f * f
+        gaussian = (b_uu * b_vv - b_uv * b_uv) / det
+        mean = -(e * b_vv - 2 * f * b_uv + g * b_uu) / (2 * det)
+    return gaussian, mean
+
+
+def _span_breaks(knots, degree):
+    """Return the distinct knots bounding the spans of the domain."""
+    knots = np.asarray(knots, dtype=float)
+    start, end = domain(knots, degree)
+    return np.unique(knots[(knots >= start) & (knots <= end)])
+
+
+def span_samples(knots, degree, samples_per_span):
+    """Return parameters sampling every non-empty knot span uniformly.
+
+    The span end points are included once, so the samples cover the
+    full domain of the knot vector.
+    """
+    breaks = _span_breaks(knots, degree)
+    if breaks.size < 2:
+        return breaks
+    steps = np.linspace(0, 1, samples_per_span + 1)[:-1]
+    t = (breaks[:-1, None] + np.diff(breaks)[:, None] * steps).ravel()
+    return np.append(t, breaks[-1])
+
+
+def gauss_legendre(knots, degree, points_per_span):
+    """Return Gauss–Legendre nodes and weights for every knot span.
+
+    Integrating span by span keeps the integrand smooth between the
+    nodes, so few points per span give accurate lengths and areas.
+
+    Returns
+    -------
+    t : numpy.ndarray
+        Quadrature nodes.
+
+    weights : numpy.ndarray
+        Quadrature weights, scaled to the span lengths.
+    """
+    breaks = _span_breaks(knots, degree)
+    nodes, weights = np.polynomial.legendre.leggauss(points_per_span)
+    half = np.diff(breaks)[:, None] / 2
+    t = (breaks[:-1, None] + half) + half * nodes
+    return t.ravel(), (half * weights).ravel()
+
+
+def curve_length(knots, degree, control_points, weights, points_per_span=6):
+    """Return the length and centroid of a rational B-spline curve."""
+    t, w = gauss_legendre(knots, degree, points_per_span)
+    ders = curve_derivatives(knots, degree, control_points, weights, t, 1)
+    element = w * np.linalg.norm(ders[1], axis=1)
+    return _measure_and_centroid(element, ders[0])
+
+
+def surface_area(knots_u, degree_u, knots_v, degree_v, control_points, weights, points_per_span=6):
+    """Return the area and centroid of a rational B-spline surface."""
+    u, w_u = gauss_legendre(knots_u, degree_u, points_per_span)
+    v, w_v = gauss_legendre(knots_v, degree_v, points_per_span)
+    ders = surface_grid_derivatives(
+        knots_u, degree_u, knots_v, degree_v, control_points, weights, u, v, 1
+    )
+    normal = np.cross(ders[1, 0], ders[0, 1])
+    element = np.outer(w_v, w_u) * np.linalg.norm(normal, axis=2)
+    return _measure_and_centroid(element.ravel(), ders[0, 0].reshape(-1, 3))
+
+
+def _measure_and_centroid(element, points):
+    """Sum quadrature elements and average ``points`` weighted by them."""
+    measure = element.sum()
+    if measure > 0:
+        return measure, element @ points / measure
+    return measure, np.full(3, np.nan)
+
+
+def control_net_measures(control_points):
+    """Estimate the size and bending of a surface from its control net.
+
+    The surface lies in the convex hull of its control net, which is
+    therefore a cheap proxy for it that needs no evaluation.
+
+    Parameters
+    ----------
+    control_points : numpy.ndarray
+        ``(n_v, n_u, 3)`` control net.
+
+    Returns
+    -------
+    area : float
+        Area of the control net, splitting every cell into two
+        triangles.
+
+    lengths : numpy.ndarray
+        Mean length of the control polygons in the ``u`` and ``v``
+        directions.
+
+    turning : numpy.ndarray
+        Mean total turning angle, in radians, of the control polygons
+        in the ``u`` and ``v`` directions.
+    """
+    diagonal_1 = control_points[1:, 1:] - control_points[:-1, :-1]
+    diagonal_2 = control_points[1:, :-1] - control_points[:-1, 1:]
+    area = np.linalg.norm(np.cross(diagonal_1, diagonal_2), axis=-1).sum() / 2
+
+    lengths = np.zeros(2)
+    turning = np.zeros(2)
+    for i, axis in enumerate((1, 0)):
+        edges = np.diff(control_points, axis=axis)
+        lengths[i] = np.linalg.norm(edges, axis=-1).sum(axis=axis).mean()
+        first = edges[:, :-1] if axis == 1 else edges[:-1]
+        second = edges[:, 1:] if axis == 1 else edges[1:]
+        sine = np.linalg.norm(np.cross(first, second), axis=-1)
+        cosine = np.einsum("...i,...i", first, second)
+        turning[i] = np.arctan2(sine, cosine).sum(axis=axis).mean() if first.size else 0
+    return area, lengths, turning
+
+
+def _area_density(knots_u, degree_u, knots_v, degree_v, control_points, weights, u, v):
+    """Return the area element ``|Su x Sv|`` at the parameters ``u, v``."""
+    ders = surface_derivatives(
+        knots_u, degree_u, knots_v, degree_v, control_points, weights, u, v, 1
+    )
+    return np.linalg.norm(np.cross(ders[1, 0], ders[0, 1]), axis=-1)
+
+
+def surface_sample_parameters(
+    knots_u,
+    degree_u,
+    knots_v,
+    degree_v,
+    control_points,
+    weights,
+    n,
+    rng,
+    cells_per_span=4,
+    margin=1.25,
+):
+    """Draw surface parameters distributed uniformly by area.
+
+    The domain is split into ``cells_per_span`` cells per knot span and
+    direction.  The area element ``|Su x Sv|`` is bounded in each cell
+    by ``margin`` times its largest value at the corners, edge
+    midpoints and center of the cell.  Candidates are drawn uniformly
+    under these bounds and accepted with probability of the area
+    element over the bound of their cell, so the accepted parameters
+    are uniform by area.  When a candidate exceeds the bound of its
+    cell, the bound is raised and the sampling restarts.
+
+    Returns
+    -------
+    u, v : numpy.ndarray
+        ``(n,)`` arrays of parameter values.
+    """
+    args = (knots_u, degree_u, knots_v, degree_v, control_points, weights)
+    u_edges = span_samples(knots_u, degree_u, cells_per_span)
+    v_edges = span_samples(knots_v, degree_v, cells_per_span)
+    du, dv = np.diff(u_edges), np.diff(v_edges)
+
+    # area element at the corners, edge midpoints and centers of the cells
+    u_fine = np.append(np.column_stack((u_edges[:-1], u_edges[:-1] + du / 2)), u_edges[-1])
+    v_fine = np.append(np.column_stack((v_edges[:-1], v_edges[:-1] + dv / 2)), v_edges[-1])
+    ders = surface_grid_derivatives(*args, u_fine, v_fine, 1)
+    density = np.linalg.norm(np.cross(ders[1, 0], ders[0, 1]), axis=2)
+    n_v, n_u = dv.size, du.size
+    bound = np.zeros((n_v, n_u))
+    for a in range(3):
+        for b in range(3):
+            bound = np.maximum(bound, density[a : a + 2 * n_v : 2, b : b + 2 * n_u : 2])
+    bound = (margin * bound).ravel()
+    cell_size = np.outer(dv, du).ravel()
+
+    if not np.isfinite(bound).all() or not (bound * cell_size).sum() > 0:
+        # degenerate surface, fall back to uniform parameters
+        cell = rng.integers(bound.size, size=n)
+        iv, iu = np.divmod(cell, n_u)
+        return u_edges[iu] + rng.random(n) * du[iu], v_edges[iv] + rng.random(n) * dv[iv]
+
+    u, v = np.empty(0), np.empty(0)
+    while u.size < n:
+        mass = bound * cell_size
+        # about one in ``margin`` candidates is accepted
+        n_draw = int((n - u.size) * margin * 1.1) + 16
+        cell = rng.choice(bound.size, n_draw, p=mass / mass.sum())
+        iv, iu = np.divmod(cell, n_u)
+        u_draw = u_edges[iu] + rng.random(n_draw) * du[iu]
+        v_draw = v_edges[iv] + rng.random(n_draw) * dv[iv]
+        value = _area_density(*args, u_draw, v_draw)
+        exceeded = value > bound[cell]
+        if exceeded.any():
+            np.maximum.at(bound, cell[exceeded], margin * value[exceeded])
+            u, v = np.empty(0), np.empty(0)
+            continue
+        accept = rng.random(n_draw) * bound[cell] < value
+        u = np.concatenate((u, u_draw[accept]))
+        v = np.concatenate((v, v_draw[accept]))
+    return u[:n], v[:n]
+
+
+def nearest_samples(points, samples, chunk_size=None):
+    """Return the index of the nearest sample for every point.
+
+    The distance matrix is evaluated in chunks so the memory use stays
+    bounded for millions of query points.
+    """
+    points = np.asarray(points, dtype=float)
+    samples_sq = np.einsum("ij,ij->i", samples, samples)
+    if chunk_size is None:
+        chunk_size = max(1, 2**22 // max(samples.shape[0], 1))
+    nearest = np.empty(points.shape[0], dtype=np.int64)
+    for start in range(0, points.shape[0], chunk_size):
+        chunk = points[start : start + chunk_size]
+        dist = samples_sq - 2 * chunk @ samples.T
+        nearest[start : start + chunk_size] = np.argmin(dist, axis=1)
+    return nearest
+
+
+def curve_closest_point(
+    knots,
+    degree,
+    control_points,
+    weights,
+    points,
+    samples_per_span=8,
+    tolerance=1e-9,
+    max_iterations=20,
+):
+    """Project points onto a rational B-spline curve.
+
+    Every point is seeded with the nearest of a set of curve samples
+    and refined with a batched Newton iteration on
+    ``C'(t) . (C(t) - P) = 0``, see The NURBS Book section 6.1.
+
+    Returns
+    -------
+    closest : numpy.ndarray
+        ``(n, 3)`` closest points on the curve.
+
+    t : numpy.ndarray
+        ``(n,)`` curve parameters of the closest points.
+
+    distance : numpy.ndarray
+        ``(n,)`` distance between each point and the curve.
+    """
+    knots = np.asarray(knots, dtype=float)
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    start, end = domain(knots, degree)
+
+    def evaluate(t, n_derivatives):
+        return curve_derivatives(knots, degree, control_points, weights, t, n_derivatives)
+
+    def refine(points, t):
+        seed_t = t.copy()
+        active = np.arange(points.shape[0])
+        for _ in range(max_iterations):
+            if not active.size:
+                break
+            ders = evaluate(t[active], 2)
+            diff = ders[0] - points[active]
+            numerator = np.einsum("ij,ij->i", ders[1], diff)
+            denominator = np.einsum("ij,ij->i", ders[2], diff) + np.einsum(
+                "ij,ij->i", ders[1], ders[1]
+            )
+            step = _safe_divide(-numerator, denominator)
+            t_new = np.clip(t[active] + step, start, end)
+            moved = np.abs(t_new - t[active]) * np.linalg.norm(ders[1], axis=1)
+            t[active] = t_new
+            active = active[moved > tolerance]
+
+        return _keep_better(points, t, seed_t, lambda t: evaluate(t, 0)[0])
+
+    samples = span_samples(knots, degree, samples_per_span)
+    t = samples[nearest_samples(points, evaluate(samples, 0)[0])]
+    return _refine_in_chunks(points, t, refine)
+
+
+def surface_closest_point(
+    knots_u,
+    degree_u,
+    knots_v,
+    degree_v,
+    control_points,
+    weights,
+    points,
+    samples_per_span=4,
+    tolerance=1e-9,
+    max_iterations=20,
+):
+    """Project points onto a rational B-spline surface.
+
+    Every point is seeded with the nearest sample of a coarse grid of
+    surface points and refined with a batched two dimensional Newton
+    iteration, see The NURBS Book section 6.1.
+
+    Returns
+    -------
+    closest : numpy.ndarray
+        ``(n, 3)`` closest points on the surface.
+
+    uv : numpy.ndarray
+        ``(n, 2)`` surface parameters of the closest points.
+
+    distance : numpy.ndarray
+        ``(n,)`` distance between each point and the surface.
+    """
+    knots_u = np.asarray(knots_u, dtype=float)
+    knots_v = np.asarray(knots_v, dtype=float)
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    lower = np.array([domain(knots_u, degree_u)[0], domain(knots_v, degree_v)[0]])
+    upper = np.array([domain(knots_u, degree_u)[1], domain(knots_v, degree_v)[1]])
+
+    def evaluate(uv, n_derivatives):
+        return surface_derivatives(
+            knots_u,
+            degree_u,
+            knots_v,
+            degree_v,
+            control_points,
+            weights,
+            uv[:, 0],
+            uv[:, 1],
+            n_derivatives,
+        )
+
+    samples_u = span_samples(knots_u, degree_u, samples_per_span)
+    samples_v = span_samples(knots_v, degree_v, samples_per_span)
+    grid = surface_grid_derivatives(
+        knots_u, degree_u, knots_v, degree_v, control_points, weights, samples_u, samples_v
+    )[0, 0].reshape(-1, 3)
+    nearest = nearest_samples(points, grid)
+    uv = np.column_stack(
+        (samples_u[nearest % samples_u.size], samples_v[nearest // samples_u.size])
+    )
+
+    def refine(points, uv):
+        seed_uv = uv.copy()
+        active = np.arange(points.shape[0])
+        for _ in range(max_iterations):
+            if not active.size:
+                break
+            ders = evaluate(uv[active], 2)
+            diff = ders[0, 0] - points[active]
+            s_u, s_v = ders[1, 0], ders[0, 1]
+            f = np.einsum("ij,ij->i", s_u, diff)
+            g = np.einsum("ij,ij->i", s_v, diff)
+            j11 = np.einsum("ij,ij->i", s_u, s_u) + np.einsum("ij,ij->i", ders[2, 0], diff)
+            j12 = np.einsum("ij,ij->i", s_u, s_v) + np.einsum("ij,ij->i", ders[1, 1], diff)
+            j22 = np.einsum("ij,ij->i", s_v, s_v) + np.einsum("ij,ij->i", ders[0, 2], diff)
+            det = j11 * j22 - j12 * j12
+            step = np.column_stack(
+                (_safe_divide(j12 * g - j22 * f, det), _safe_divide(j12 * f - j11 * g, det))
+            )
+            uv_new = np.clip(uv[active] + step, lower, upper)
+            delta = uv_new - uv[active]
+            moved = np.linalg.norm(delta[:, :1] * s_u + delta[:, 1:] * s_v, axis=1)
+            uv[active] = uv_new
+            active = active[moved > tolerance]
+
+        return _keep_better(points, uv, seed_uv, lambda uv: evaluate(uv, 0)[0, 0])
+
+    return _refine_in_chunks(points, uv, refine)
+
+
+def _refine_in_chunks(points, params, refine, chunk_size=2**14):
+    """Run ``refine`` on cache sized chunks of points and their seeds."""
+    closest = np.empty_like(points)
+    distance = np.empty(points.shape[0])
+    for start in range(0, points.shape[0], chunk_size):
+        chunk = slice(start, start + chunk_size)
+        closest[chunk], params[chunk], distance[chunk] = refine(points[chunk], params[chunk])
+    return closest, params, distance
+
+
+def _keep_better(points, params, seed_params, evaluate):
+    """Fall back to the seed wherever Newton did not improve on it."""
+    closest = evaluate(params)
+    distance = np.linalg.norm(closest - points, axis=1)
+    seed_closest = evaluate(seed_params)
+    seed_distance = np.linalg.norm(seed_closest - points, axis=1)
+    worse = seed_distance < distance
+    params[worse] = seed_params[worse]
+    closest[worse] = seed_closest[worse]
+    distance[worse] = seed_distance[worse]
+    return closest, params, distance
@@ -2,20 +2,10 @@
 
 import os
 
-try:
-    # On pyvista >= 0.48, raising ``LocalFileRequiredError`` from a
-    # reader entry point makes ``pv.read("http://.../foo.igs")``
-    # download the file first and retry against the local copy.
-    from pyvista import LocalFileRequiredError as _LocalFileRequiredError
-    from pyvista import has_scheme as _has_scheme
-except ImportError:  # pragma: no cover - older pyvista or no pyvista installed
-    _LocalFileRequiredError = None
-    _has_scheme = None
-
 from pyiges.iges import Iges
 
 
-def read_as_mesh(filename, merge=True):
+def read_as_mesh(filename, merge=True, dtype=None, offset=None):
     """Read an IGES file and return it as a PyVista mesh.
 
     Wraps :class:`pyiges.Iges` and converts all supported entities to
@@ -24,12 +14,18 @@ def read_as_mesh(filename, merge=True):
 
     Parameters
     ----------
-    filename : str | os.PathLike
-        Path to the IGES file.
+    filename : str | os.PathLike | bytes | memoryview | file object
+        Path to the IGES file, its content, or a stream of it, see
+        :func:`pyiges.read`.
     merge : bool, default: True
         If ``True``, return a single :class:`pyvista.PolyData`
         containing all converted entities. If ``False``, return a
         :class:`pyvista.MultiBlock`.
+    dtype : numpy.dtype, optional
+        Data type of the output points, for example ``np.float32``.
+    offset : bool | sequence[float], optional
+        Point subtracted from the output points before casting them,
+        ``True`` for the model center. See :meth:`pyiges.Iges.to_vtk`.
 
     Returns
     -------
@@ -43,7 +39,16 @@ def read_as_mesh(filename, merge=True):
         The PyVista reader registry uses this to download the file and
         retry against the local copy.
     """
-    fname = os.fspath(filename)
-    if _has_scheme is not None and _has_scheme(fname):
-        raise _LocalFileRequiredError
-    return Iges(fname).to_vtk(merge=merge)
+    if isinstance(filename, (str, os.PathLike)):
+        filename = os.fspath(filename)
+        try:
+            # On pyvista >= 0.48, raising ``LocalFileRequiredError`` from a
+            # reader entry point makes ``pv.read("http://.../foo.igs")``
+            # download the file first and retry against the local copy.
+            from pyvista import LocalFileRequiredError, has_scheme
+        except ImportError:  # pragma: no cover - older pyvista or no pyvista installed
+            pass
+        else:
+            if has_scheme(filename):
+                raise LocalFileRequiredError
+    return Iges(filename).to_vtk(merge=merge, dtype=dtype, offset=offset)
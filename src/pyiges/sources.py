@@ -0,0 +1,224 @@
+"""Opening of IGES sources for the reader.
+
+Files are read from paths, from their content in memory or from
+streams.  Compressed files are recognized by their magic bytes and decompressed
+while they are read, without a temporary copy.  gzip and bz2 use the
+standard library, zstd needs ``compression.zstd`` (Python 3.14) or the
+``zstandard`` package.
+
+Files in the compressed ASCII form of the IGES specification, marked by
+a flag record with ``C`` in column 73 in front of the start section,
+are expanded record by record into the fixed 80 column layout, so both
+forms are parsed by the same reader.
+"""
+
+import bz2
+import contextlib
+import gzip
+import io
+import itertools
+import os
+import re
+
+
+def _zstd():
+    try:
+        from compression import zstd
+    except ImportError:
+        try:
+            import zstandard as zstd
+        except ImportError as exc:
+            raise ModuleNotFoundError(
+                "Reading zstd compressed files requires the zstandard package"
+            ) from exc
+    return zstd
+
+
+# magic bytes of the supported compressions and their modules
+_COMPRESSIONS = (
+    (b"\x1f\x8b", lambda: gzip),
+    (b"BZh", lambda: bz2),
+    (b"\x28\xb5\x2f\xfd", _zstd),
+)
+
+
+@contextlib.contextmanager
+def open_text(source):
+    """Open an IGES source as text, decompressing it if needed.
+
+    Parameters
+    ----------
+    source : str | os.PathLike | bytes | bytearray | memoryview | file object
+        Path to a file, the content of a file, or a binary or text
+        stream.  ``bytes`` are wrapped without a copy.  Binary streams
+        are read from their current position and are left open.
+        Content and binary streams may be gzip, bz2 or zstd
+        compressed.
+
+    Yields
+    ------
+    io.TextIOBase
+        Text stream over the decompressed content.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            magic = f.read(4)
+        module = _compression(magic)
+        with module.open(source, "rt") if module else open(source) as f:
+            yield f
+        return
+
+    if isinstance(source, io.TextIOBase):
+        yield source
+        return
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    elif not hasattr(source, "read"):
+        raise TypeError(f"Cannot read IGES data from {type(source).__name__}")
+
+    # look at the magic bytes without consuming them
+    if hasattr(source, "peek"):
+        magic = source.peek(4)[:4]
+    elif source.seekable():
+        position = source.tell()
+        magic = source.read(4)
+        source.seek(position)
+    else:
+        source = io.BytesIO(source.read())
+        magic = source.getvalue()[:4]
+
+    module = _compression(magic)
+    binary = module.open(source, "rb") if module else source
+    text = io.TextIOWrapper(binary)
+    try:
+        yield text
+    finally:
+        # leave the caller's stream open
+        text.detach()
+
+
+def _compression(magic):
+    """Return the decompression module for the magic bytes of a file, if any."""
+    for prefix, module in _COMPRESSIONS:
+        if magic.startswith(prefix):
+            return module()
+
+
+def fixed_format_lines(lines, parse_separators):
+    """Yield the lines of an IGES file in the fixed 80 column layout.
+
+    Files in the fixed layout are passed through.  In the compressed
+    ASCII form, the flag record is dropped, the start and global
+    sections are passed through and the data section after them is
+    expanded: for every entity, a record with the
+    directory entry fields is followed by its parameter data record.
+    The directory entry record holds the eighteen fields of the fixed
+    layout except the sequence numbers, in order and separated by the
+    parameter delimiter.  The parameter pointer and line count fields
+    may be left blank since they are recomputed.  Data lines hold up to
+    72 characters, records may span lines and Hollerith strings may
+    contain delimiters.
+
+    Parameters
+    ----------
+    lines : iterable[str]
+        Lines of the file.
+
+    parse_separators : callable
+        Return the parameter and record delimiters from the first
+        global line.
+
+    Yields
+    ------
+    str
+        Lines in the fixed layout.
+    """
+    lines = iter(lines)
+    for line in lines:
+        if len(line) > 72 and line[72] == "C":
+            break
+        yield line
+    else:
+        return
+
+    # the start and global sections follow the flag record
+    global_lines = []
+    for line in lines:
+        section = line[72] if len(line) > 72 else None
+        if section == "G":
+            global_lines.append(line)
+        elif section != "S" or global_lines:
+            break
+        yield line
+    else:
+        line = None
+    if not global_lines:
+        raise RuntimeError("Compressed ASCII file without a Global section")
+    if line is None:
+        return
+    param_sep, record_sep = parse_separators(global_lines[0][:72])
+
+    terminate = []
+
+    def data_lines():
+        for data in itertools.chain([line], lines):
+            data = data.rstrip("\r\n")
+            if len(data) > 72 and data[72] == "T":
+                terminate.append(data + "\n")
+                return
+            yield data[:72]
+
+    records = _records(data_lines(), param_sep, record_sep)
+    n_parameter_lines = 0
+    # directory entry and parameter data records alternate
+    for sequence, (directory, parameters) in enumerate(zip(records, records)):
+        pointer = 2 * sequence + 1
+        fields = [field.strip() for field in directory[:-1].split(param_sep)]
+        fields += [""] * (18 - len(fields))
+        # full 64 column chunks keep the reader from padding inside fields
+        parameters = parameters.strip()
+        chunks = [parameters[i : i + 64] for i in range(0, len(parameters), 64)]
+        fields[1] = str(n_parameter_lines + 1)
+        fields[12] = str(len(chunks))
+        yield "".join(f"{field:>8}" for field in fields[:9]) + f"D{pointer:7d}\n"
+        yield "".join(f"{field:>8}" for field in fields[9:]) + f"D{pointer + 1:7d}\n"
+        for chunk in chunks:
+            n_parameter_lines += 1
+            yield f"{chunk:<64}{pointer:8d}P{n_parameter_lines:7d}\n"
+    yield from terminate
+
+
+def _records(lines, param_sep, record_sep):
+    """Yield the records of free format data, ending with the record delimiter."""
+    delimiter = re.compile("[" + re.escape(param_sep + record_sep) + "]")
+    hollerith = re.compile(r" *(\d+)H")
+    record, skip, field_start = [], 0, True
+    for data in lines:
+        pos = 0
+        while pos < len(data):
+            if skip:
+                chunk = data[pos : pos + skip]
+                record.append(chunk)
+                skip -= len(chunk)
+                pos += len(chunk)
+                continue
+            if field_start:
+                match = hollerith.match(data, pos)
+                if match:
+                    record.append(match.group())
+                    skip = int(match.group(1))
+                    pos = match.end()
+                    field_start = False
+                    continue
+            match = delimiter.search(data, pos)
+            if match is None:
+                record.append(data[pos:])
+                field_start = field_start and not data[pos:].strip()
+                break
+            record.append(data[pos : match.end()])
+            pos = match.end()
+            field_start = True
+            if match.group() == record_sep:
+                yield "".join(record)
+                record = []
@@ -0,0 +1,551 @@
+"""Bounding volume hierarchy used for spatial queries over entities."""
+
+import heapq
+
+import numpy as np
+
+
+def _as_bounds_array(bounds):
+    """Return ``bounds`` as a ``(n, 6)`` float array in ``pyvista`` order."""
+    bounds = np.asarray(bounds, dtype=float)
+    if bounds.ndim == 1:
+        bounds = bounds.reshape(1, -1)
+    if bounds.ndim != 2 or bounds.shape[1] != 6:
+        raise ValueError("Bounds must be given as (xmin, xmax, ymin, ymax, zmin, zmax)")
+    return bounds
+
+
+def _expand_ranges(starts, counts):
+    """Concatenate ``arange(start, start + count)`` for every range."""
+    total = counts.sum()
+    if not total:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return offsets + np.arange(total)
+
+
+class BoundingVolumeHierarchy:
+    """Axis-aligned bounding volume hierarchy stored in flat arrays.
+
+    The tree is built top-down by splitting each node at the median of
+    the box centers along its longest axis, which makes the build
+    ``O(n log n)``.  Nodes are stored in contiguous ``numpy`` arrays so
+    the hierarchy can be saved to and loaded from a ``.npz`` file.
+
+    Parameters
+    ----------
+    bounds : array_like
+        ``(n, 6)`` array of item bounds ordered as
+        ``(xmin, xmax, ymin, ymax, zmin, zmax)``.
+
+    ids : array_like, optional
+        Identifier returned for each item by the queries.  Defaults to
+        ``numpy.arange(n)``.
+
+    leaf_size : int, optional
+        Maximum number of items stored in a leaf node.
+
+    Examples
+    --------
+    >>> from pyiges.spatial import BoundingVolumeHierarchy
+    >>> bvh = BoundingVolumeHierarchy([[0, 1, 0, 1, 0, 1], [2, 3, 2, 3, 2, 3]])
+    >>> bvh.query_box([0.5, 2.5, 0.5, 2.5, 0.5, 2.5])
+    array([0, 1])
+    """
+
+    def __init__(self, bounds, ids=None, leaf_size=4):
+        """Build the hierarchy from per-item bounds."""
+        bounds = _as_bounds_array(bounds)
+        n_items = bounds.shape[0]
+        self.lower = np.ascontiguousarray(bounds[:, ::2])
+        self.upper = np.ascontiguousarray(bounds[:, 1::2])
+        if ids is None:
+            ids = np.arange(n_items)
+        self.ids = np.asarray(ids, dtype=np.int64)
+        if self.ids.shape != (n_items,):
+            raise ValueError("Expected one id per item")
+        self._build(max(int(leaf_size), 1))
+
+    def _build(self, leaf_size):
+        """Build the tree breadth first, splitting all nodes of a level at once.
+
+        The items are sorted by their centers once along each axis.
+        Every level splits its nodes at the median of the order along
+        their longest axis and stably partitions all three orders, so a
+        level takes linear time.  Node bounds are reduced bottom up once
+        the tree is complete.
+        """
+        n_items = self.lower.shape[0]
+        centers = (self.lower + self.upper) / 2
+        # item orders along each axis, with a padding item so that segment
+        # ends may point past the last item
+        sorted_items = np.full((3, n_items + 1), n_items, dtype=np.int64)
+        sorted_items[:, :-1] = np.argsort(centers, axis=0, kind="stable").T
+
+        max_nodes = max(2 * n_items - 1, 1)
+        node_child = np.full(max_nodes, -1, dtype=np.int64)
+        node_start = np.zeros(max_nodes, dtype=np.int64)
+        node_count = np.zeros(max_nodes, dtype=np.int64)
+
+        n_nodes = 1
+        levels = []
+        nodes = np.zeros(1 if n_items else 0, dtype=np.int64)
+        starts = np.zeros_like(nodes)
+        ends = np.full_like(nodes, n_items)
+        while nodes.size:
+            counts = ends - starts
+            is_leaf = counts <= leaf_size
+            node_start[nodes[is_leaf]] = starts[is_leaf]
+            node_count[nodes[is_leaf]] = counts[is_leaf]
+            split = ~is_leaf
+            nodes, starts, ends, counts = nodes[split], starts[split], ends[split], counts[split]
+            if not nodes.size:
+                break
+
+            # the first half of every node along the longest axis of its
+            # centers, read from the ends of the sorted orders
+            extent = [
+                centers[sorted_items[i, ends - 1], i] - centers[sorted_items[i, starts], i]
+                for i in range(3)
+            ]
+            axis = np.argmax(extent, axis=0)
+            mids = starts + counts // 2
+            goes_left = np.zeros(n_items + 1, dtype=bool)
+            for i in range(3):
+                chosen = axis == i
+                halves = _expand_ranges(starts[chosen], mids[chosen] - starts[chosen])
+                goes_left[sorted_items[i, halves]] = True
+
+            # stable partition of every node in all three orders
+            rows = np.arange(nodes.size)
+            positions = _expand_ranges(starts, counts)
+            segment = np.repeat(rows, counts)
+            first = np.cumsum(counts) - counts
+            rank = positions - starts[segment]
+            for i in range(3):
+                items = sorted_items[i, positions]
+                left = goes_left[items]
+                n_left = np.cumsum(left) - left
+                n_left -= np.repeat(n_left[first], counts)
+                target = np.where(left, starts[segment] + n_left, mids[segment] + rank - n_left)
+                sorted_items[i, target] = items
+
+            children = n_nodes + 2 * rows
+            node_child[nodes] = children
+            levels.append(nodes)
+            n_nodes += 2 * nodes.size
+            # interleave the children so that the ranges stay sorted
+            nodes = np.column_stack((children, children + 1)).ravel()
+            starts = np.column_stack((starts, mids)).ravel()
+            ends = np.column_stack((mids, ends)).ravel()
+
+        # bounds of the leaves from their items, then of the parents level by level
+        order = sorted_items[0, :-1]
+        node_lower = np.full((n_nodes, 3), np.inf)
+        node_upper = np.full((n_nodes, 3), -np.inf)
+        leaves = np.flatnonzero(node_child[:n_nodes] < 0)
+        if n_items:
+            leaves = leaves[np.argsort(node_start[leaves])]
+            node_lower[leaves] = np.minimum.reduceat(self.lower[order], node_start[leaves])
+            node_upper[leaves] = np.maximum.reduceat(self.upper[order], node_start[leaves])
+        for nodes in reversed(levels):
+            children = node_child[nodes]
+            node_lower[nodes] = np.minimum(node_lower[children], node_lower[children + 1])
+            node_upper[nodes] = np.maximum(node_upper[children], node_upper[children + 1])
+
+        self.order = order
+        self.node_lower = node_lower
+        self.node_upper = node_upper
+        self.node_child = node_child[:n_nodes]
+        self.node_start = node_start[:n_nodes]
+        self.node_count = node_count[:n_nodes]
+
+    def __len__(self):
+        """Return the number of indexed items."""
+        return self.ids.size
+
+    def __repr__(self):
+        """Return a short summary with the item and node counts."""
+        info = "pyiges.spatial.BoundingVolumeHierarchy\n"
+        info += "Number of Items: %d\n" % len(self)
+        info += "Number of Nodes: %d" % self.node_child.size
+        return info
+
+    @property
+    def bounds(self):
+        """Bounds of all indexed items as ``(xmin, xmax, ..., zmax)``."""
+        bounds = np.empty(6)
+        bounds[::2] = self.node_lower[0]
+        bounds[1::2] = self.node_upper[0]
+        return tuple(bounds)
+
+    def _traverse(self, node_test, item_test):
+        """Return the ids of items accepted by both test functions.
+
+        ``node_test`` and ``item_test`` receive ``(lower, upper)``
+        arrays and return a boolean mask of boxes to keep.
+        """
+        if not len(self):
+            return np.empty(0, dtype=np.int64)
+
+        found = []
+        frontier = np.zeros(1, dtype=np.int64)
+        while frontier.size:
+            frontier = frontier[node_test(self.node_lower[frontier], self.node_upper[frontier])]
+            is_leaf = self.node_child[frontier] < 0
+            leaves = frontier[is_leaf]
+            if leaves.size:
+                found.append(
+                    self.order[_expand_ranges(self.node_start[leaves], self.node_count[leaves])]
+                )
+            children = self.node_child[frontier[~is_leaf]]
+            frontier = np.concatenate((children, children + 1))
+
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        items = np.concatenate(found)
+        items = np.sort(items[item_test(self.lower[items], self.upper[items])])
+        return self.ids[items]
+
+    def query_box(self, bounds):
+        """Return the ids of all items whose bounds intersect a box.
+
+        Parameters
+        ----------
+        bounds : sequence[float]
+            Query box as ``(xmin, xmax, ymin, ymax, zmin, zmax)``.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted ids of the intersecting items.
+        """
+        bounds = _as_bounds_array(bounds)[0]
+        lower, upper = bounds[::2], bounds[1::2]
+
+        def test(box_lower, box_upper):
+            return np.all((box_lower <= upper) & (box_upper >= lower), axis=1)
+
+        return self._traverse(test, test)
+
+    def query_sphere(self, center, radius):
+        """Return the ids of all items whose bounds intersect a sphere.
+
+        Parameters
+        ----------
+        center : sequence[float]
+            Center of the sphere.
+
+        radius : float
+            Radius of the sphere.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted ids of the intersecting items.
+        """
+        center = np.asarray(center, dtype=float)
+        radius_sq = float(radius) ** 2
+
+        def test(box_lower, box_upper):
+            return _box_distance_sq(center, box_lower, box_upper) <= radius_sq
+
+        return self._traverse(test, test)
+
+    def query_planes(self, planes):
+        """Return the ids of all items not entirely outside a set of planes.
+
+        Each plane ``(a, b, c, d)`` keeps the half space where
+        ``a*x + b*y + c*z + d >= 0``, so six inward facing planes
+        describe a view frustum.  The test is conservative: items near
+        the corners of the region may be reported even though they lie
+        outside of it.
+
+        Parameters
+        ----------
+        planes : array_like
+            ``(n, 4)`` array of plane coefficients.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted ids of the items that may lie inside all planes.
+        """
+        planes = np.asarray(planes, dtype=float).reshape(-1, 4)
+        normals, offsets = planes[:, :3], planes[:, 3]
+
+        def test(box_lower, box_upper):
+            # farthest box corner along each plane normal
+            reach = np.maximum(
+                box_lower[:, None, :] * normals, box_upper[:, None, :] * normals
+            ).sum(axis=2)
+            return np.all(reach + offsets >= 0, axis=1)
+
+        return self._traverse(test, test)
+
+    def nearest(self, point, k=1):
+        """Return the ``k`` items whose bounds are closest to a point.
+
+        Distances are measured to the item bounding boxes and are zero
+        for items whose bounds contain ``point``.
+
+        Parameters
+        ----------
+        point : sequence[float]
+            Query point.
+
+        k : int, optional
+            Number of items to return.
+
+        Returns
+        -------
+        ids : numpy.ndarray
+            Ids of the ``k`` nearest items, closest first.
+
+        distances : numpy.ndarray
+            Distance from ``point`` to the bounds of each item.
+        """
+        point = np.asarray(point, dtype=float)
+        k = min(int(k), len(self))
+        ids, distances = [], []
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        # best-first search, nodes and items share one priority queue
+        # and are distinguished by the sign of the key (items are < 0)
+        heap = [(0.0, 0)]
+        while heap and len(ids) < k:
+            dist_sq, key = heapq.heappop(heap)
+            if key < 0:
+                ids.append(-key - 1)
+                distances.append(dist_sq)
+                continue
+
+            child = self.node_child[key]
+            if child < 0:
+                start = self.node_start[key]
+                items = self.order[start : start + self.node_count[key]]
+                item_dist = _box_distance_sq(point, self.lower[items], self.upper[items])
+                for item, item_dist_sq in zip(items, item_dist):
+                    heapq.heappush(heap, (item_dist_sq, -int(item) - 1))
+            else:
+                nodes = np.array([child, child + 1])
+                node_dist = _box_distance_sq(point, self.node_lower[nodes], self.node_upper[nodes])
+                for node, node_dist_sq in zip(nodes, node_dist):
+                    heapq.heappush(heap, (node_dist_sq, int(node)))
+
+        return self.ids[np.array(ids, dtype=np.int64)], np.sqrt(distances)
+
+    def save(self, filename):
+        """Save the hierarchy to a ``numpy`` ``.npz`` file.
+
+        Parameters
+        ----------
+        filename : str | os.PathLike
+            Output filename.
+        """
+        np.savez(
+            filename,
+            lower=self.lower,
+            upper=self.upper,
+            ids=self.ids,
+            order=self.order,
+            node_lower=self.node_lower,
+            node_upper=self.node_upper,
+            node_child=self.node_child,
+            node_start=self.node_start,
+            node_count=self.node_count,
+        )
+
+    @classmethod
+    def load(cls, filename):
+        """Load a hierarchy previously written by :meth:`save`.
+
+        Parameters
+        ----------
+        filename : str | os.PathLike
+            Filename of a ``.npz`` file.
+
+        Returns
+        -------
+        BoundingVolumeHierarchy
+            The loaded hierarchy.
+        """
+        bvh = cls.__new__(cls)
+        with np.load(filename) as data:
+            for key in data.files:
+                setattr(bvh, key, data[key])
+        return bvh
+
+
+def _box_distance_sq(point, lower, upper):
+    """Squared distance from ``point`` to each box, zero when inside."""
+    delta = np.maximum(lower - point, 0) + np.maximum(point - upper, 0)
+    return np.einsum("ij,ij->i", delta, delta)
+
+
+class RayCaster:
+    """Intersect batches of rays with a triangle mesh.
+
+    Triangles are indexed by a :class:`BoundingVolumeHierarchy` and
+    every batch of rays descends the hierarchy one level at a time as
+    flat arrays of ``(ray, node)`` pairs.  Pairs reaching a leaf are
+    intersected with its triangles using the Möller–Trumbore test.
+    Nothing but ``numpy`` is required.
+
+    Parameters
+    ----------
+    points : array_like
+        ``(n, 3)`` array of mesh vertices.
+
+    triangles : array_like
+        ``(m, 3)`` array of vertex indices of each triangle.
+
+    ids : array_like, optional
+        Identifier returned for each triangle.  Defaults to
+        ``numpy.arange(m)``.
+
+    leaf_size : int, optional
+        Maximum number of triangles stored in a leaf node.
+
+    Examples
+    --------
+    >>> from pyiges.spatial import RayCaster
+    >>> caster = RayCaster([[0, 0, 0], [1, 0, 0], [0, 1, 0]], [[0, 1, 2]])
+    >>> caster.intersect([[0.2, 0.2, 1]], [[0, 0, -1]])
+    (array([1.]), array([0]))
+    """
+
+    def __init__(self, points, triangles, ids=None, leaf_size=4):
+        """Build the triangle hierarchy."""
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+        corners = points[triangles]
+        bounds = np.empty((triangles.shape[0], 6))
+        bounds[:, ::2] = corners.min(axis=1)
+        bounds[:, 1::2] = corners.max(axis=1)
+
+        self.bvh = BoundingVolumeHierarchy(bounds, ids, leaf_size)
+        self.origin = corners[:, 0]
+        self.edge1 = corners[:, 1] - corners[:, 0]
+        self.edge2 = corners[:, 2] - corners[:, 0]
+
+    def __len__(self):
+        """Return the number of triangles."""
+        return len(self.bvh)
+
+    def __repr__(self):
+        """Return a short summary with the triangle count."""
+        return "pyiges.spatial.RayCaster\nNumber of Triangles: %d" % len(self)
+
+    def intersect(self, origins, directions, chunk_size=2**15):
+        """Return the first triangle hit by each ray.
+
+        Parameters
+        ----------
+        origins : array_like
+            ``(n, 3)`` ray origins, or a single origin shared by all
+            rays.
+
+        directions : array_like
+            ``(n, 3)`` ray directions, or a single direction shared by
+            all rays.  They do not need to be normalized.
+
+        chunk_size : int, optional
+            Number of rays traced together.
+
+        Returns
+        -------
+        distance : numpy.ndarray
+            Distance from each origin to its first hit along the
+            normalized direction, ``inf`` for rays that miss.
+
+        ids : numpy.ndarray
+            Id of the triangle hit by each ray, ``-1`` for misses.
+        """
+        origins, directions = np.broadcast_arrays(
+            np.asarray(origins, dtype=float).reshape(-1, 3),
+            np.asarray(directions, dtype=float).reshape(-1, 3),
+        )
+        norm = np.linalg.norm(directions, axis=1, keepdims=True)
+        directions = directions / np.where(norm > 0, norm, 1)
+
+        distance = np.full(directions.shape[0], np.inf)
+        hit = np.full(directions.shape[0], -1, dtype=np.int64)
+        if not len(self):
+            return distance, hit
+
+        for start in range(0, directions.shape[0], chunk_size):
+            chunk = slice(start, start + chunk_size)
+            distance[chunk], items = self._intersect(origins[chunk], directions[chunk])
+            found = items >= 0
+            hit[chunk][found] = self.bvh.ids[items[found]]
+        return distance, hit
+
+    def _intersect(self, origins, directions):
+        """Trace one batch of rays, returning distances and item indices."""
+        bvh = self.bvh
+        n_rays = origins.shape[0]
+        best = np.full(n_rays, np.inf)
+        best_item = np.full(n_rays, -1, dtype=np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inverse = 1 / directions
+
+        rays = np.arange(n_rays)
+        nodes = np.zeros(n_rays, dtype=np.int64)
+        while rays.size:
+            keep = self._slab_test(
+                origins[rays],
+                inverse[rays],
+                bvh.node_lower[nodes],
+                bvh.node_upper[nodes],
+                best[rays],
+            )
+            rays, nodes = rays[keep], nodes[keep]
+
+            is_leaf = bvh.node_child[nodes] < 0
+            if is_leaf.any():
+                leaf_rays, leaves = rays[is_leaf], nodes[is_leaf]
+                counts = bvh.node_count[leaves]
+                items = bvh.order[_expand_ranges(bvh.node_start[leaves], counts)]
+                self._update_hits(
+                    origins, directions, np.repeat(leaf_rays, counts), items, best, best_item
+                )
+
+            children = bvh.node_child[nodes[~is_leaf]]
+            parents = rays[~is_leaf]
+            rays = np.concatenate((parents, parents))
+            nodes = np.concatenate((children, children + 1))
+
+        return best, best_item
+
+    @staticmethod
+    def _slab_test(origins, inverse, lower, upper, limit):
+        """Return which rays enter their box before ``limit``."""
+        with np.errstate(invalid="ignore"):
+            near = (lower - origins) * inverse
+            far = (upper - origins) * inverse
+        # fmin / fmax skip the nan of rays parallel to and on a slab
+        t_enter = np.fmax.reduce(np.fmin(near, far), axis=1)
+        t_exit = np.fmin.reduce(np.fmax(near, far), axis=1)
+        return (t_exit >= np.maximum(t_enter, 0)) & (t_enter <= limit)
+
+    def _update_hits(self, origins, directions, rays, items, best, best_item):
+        """Möller–Trumbore test of ``(ray, item)`` pairs, keeping the nearest."""
+        direction = directions[rays]
+        edge1, edge2 = self.edge1[items], self.edge2[items]
+        p = np.cross(direction, edge2)
+        det = np.einsum("ij,ij->i", edge1, p)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv_det = 1 / det
+            s = origins[rays] - self.origin[items]
+            u = np.einsum("ij,ij->i", s, p) * inv_det
+            q = np.cross(s, edge1)
+            v = np.einsum("ij,ij->i", direction, q) * inv_det
+            t = np.einsum("ij,ij->i", edge2, q) * inv_det
+            found = (det != 0) & (u >= 0) & (v >= 0) & (u + v <= 1) & (t > 0)
+        found &= t < best[rays]
+        rays, items, t = rays[found], items[found], t[found]
+        np.minimum.at(best, rays, t)
+        nearest = t == best[rays]
+        best_item[rays[nearest]] = items[nearest]
@@ -0,0 +1,181 @@
+"""Writer for parsed IGES files and subsets of them.
+
+Entities are written from the raw parameter fields kept by the reader,
+so values round-trip exactly without reformatting numbers.  The
+entities are renumbered to consecutive directory sequence numbers and
+every pointer that is known to the reader (see
+:attr:`pyiges.Iges.reference_graph`) is rewritten to the new numbers.
+Pointers to entities left out of the subset are set to zero.
+
+Records are assembled in bulk: every parameter record is joined once
+and cut at the last delimiter before column 64, and each directory
+entry line is formatted with a single template.
+"""
+
+import bisect
+import itertools
+import operator
+
+import numpy as np
+
+# directory fields holding a pointer when negative, or when positive
+_NEGATIVE_POINTER_FIELDS = ("structure", "line_font_pattern", "level", "color_number")
+_POSITIVE_POINTER_FIELDS = ("view", "transform", "label_assoc")
+
+# integer fields of the two directory entry lines, without the label
+_DIRECTORY_FIELDS = (
+    "entity_type_number",
+    "parameter_pointer",
+    "structure",
+    "line_font_pattern",
+    "level",
+    "view",
+    "transform",
+    "label_assoc",
+    "status_number",
+    "entity_type_number",
+    "line_weight_number",
+    "color_number",
+    "param_line_count",
+    "form_number",
+    "entity_subs_num",
+)
+
+# both directory entry lines of an entity including their sequence numbers
+_DIRECTORY = "%8s" * 9 + "D%7d\n" + "%8s" * 5 + " " * 16 + "%8s%8sD%7d\n"
+
+
+def _wrap_parameters(fields, param_sep, record_sep, width=64):
+    """Cut a parameter record into lines of at most ``width`` columns.
+
+    Lines end after a delimiter between fields, so fields are not split
+    across lines unless they are longer than a line on their own.  Such
+    fields fill their lines completely, so Hollerith strings are read
+    back without padding.
+    """
+    text = param_sep.join(fields) + record_sep
+    cuts = None
+    if text.count(param_sep) >= len(fields):
+        # delimiters inside Hollerith strings are no places to cut
+        cuts = list(itertools.accumulate(len(field) + 1 for field in fields))
+    lines = []
+    start = 0
+    while len(text) - start > width:
+        if cuts is None:
+            end = text.rfind(param_sep, start, start + width) + 1
+        else:
+            i = bisect.bisect_right(cuts, start + width) - 1
+            end = cuts[i] if i >= 0 else start
+        if end <= start:
+            end = start + width
+        lines.append(text[start:end])
+        start = end
+    lines.append(text[start:])
+    return lines
+
+
+def _section(lines, section):
+    """Return the records of a section from the data of its lines."""
+    return "".join(f"{line:<72}{section}{number:7d}\n" for number, line in enumerate(lines, 1))
+
+
+def write_iges(file, iges, indices=None):
+    """Write entities of a parsed IGES file as a new IGES file.
+
+    Parameters
+    ----------
+    file : file object
+        Text file.
+
+    iges : pyiges.Iges
+        Parsed IGES file.
+
+    indices : sequence[int], optional
+        Indices into :attr:`pyiges.Iges.items` of the entities to
+        write.  Written in file order.  Defaults to all entities.
+
+    Returns
+    -------
+    int
+        Number of entities written.
+    """
+    entities = iges.items
+    if indices is None:
+        indices = np.arange(len(entities))
+    selected = [entities[index] for index in np.unique(np.asarray(indices, dtype=np.int64))]
+    old = np.array([entity.sequence_number for entity in selected], dtype=np.int64)
+    renumbered = np.zeros(old.max(initial=0) + 1, dtype=np.int64)
+    renumbered[old] = 2 * np.arange(len(selected)) + 1
+    lookup = renumbered.tolist()
+    param_sep, record_sep = iges._separators
+
+    def renumber(pointers):
+        """Renumber pointers, keeping their sign.  Unknown pointers become 0."""
+        magnitude = np.abs(pointers)
+        known = magnitude < len(renumbered)
+        new = renumbered[np.where(known, magnitude, 0)] * known
+        return np.where(pointers < 0, -new, new)
+
+    # parameter records, with the pointers in their fields renumbered
+    parameters, line_counts = [], []
+    for pointer, entity in zip(range(1, 2 * len(selected), 2), selected):
+        # the reader keeps the padding of wrapped records in front of fields,
+        # Hollerith strings are kept whole so that only this padding is removed
+        if entity.parameters:
+            fields = [field.lstrip() for field in entity._fields()]
+        else:
+            fields = [str(entity.d["entity_type_number"])]
+        for i in entity._pointer_fields():
+            if fields[i].strip():
+                value = int(fields[i])
+                new = lookup[abs(value)] if abs(value) < len(lookup) else 0
+                fields[i] = str(new if value > 0 else -new)
+
+        lines = _wrap_parameters(fields, param_sep, record_sep)
+        line_counts.append(len(lines))
+        parameters.extend(f"{line:<64}{pointer:8d}" for line in lines)
+
+    # directory entries as a table, blank fields are read as ``None``
+    getter = operator.itemgetter(*_DIRECTORY_FIELDS)
+    table = np.array([getter(entity.d) for entity in selected], dtype=object)
+    table = table.reshape(len(selected), len(_DIRECTORY_FIELDS))
+    blank = table == None  # noqa: E711
+    values = np.where(blank, 0, table).astype(np.int64)
+    column = {key: i for i, key in enumerate(_DIRECTORY_FIELDS)}
+    for key in _NEGATIVE_POINTER_FIELDS:
+        pointers = values[:, column[key]]
+        values[:, column[key]] = np.where(pointers < 0, renumber(pointers), pointers)
+    for key in _POSITIVE_POINTER_FIELDS:
+        pointers = values[:, column[key]]
+        values[:, column[key]] = np.where(pointers > 0, renumber(pointers), pointers)
+    line_counts = np.array(line_counts, dtype=np.int64)
+    values[:, column["param_line_count"]] = line_counts
+    values[:, column["parameter_pointer"]] = np.cumsum(line_counts) - line_counts + 1
+    blank[:, [column["parameter_pointer"], column["param_line_count"]]] = False
+
+    fields = values.astype(object)
+    fields[blank] = ""
+    status = column["status_number"]
+    fields[~blank[:, status], status] = [
+        f"{value:08d}" for value in values[~blank[:, status], status]
+    ]
+    labels = [entity.d.get("entity_label") or "" for entity in selected]
+    directory = [
+        _DIRECTORY % (*row[:9], sequence, *row[9:], label, subscript, sequence + 1)
+        for sequence, row, label, subscript in zip(
+            range(1, 2 * len(selected), 2),
+            fields[:, :-1].tolist(),
+            labels,
+            fields[:, -1].tolist(),
+        )
+    ]
+
+    start_lines = iges._start_lines or [""]
+    global_lines = iges._global_lines
+    file.write(_section(start_lines, "S"))
+    file.write(_section(global_lines, "G"))
+    file.write("".join(directory))
+    file.write(_section(parameters, "P"))
+    counts = (len(start_lines), len(global_lines), 2 * len(directory), len(parameters))
+    file.write(_section(["S{:7d}G{:7d}D{:7d}P{:7d}".format(*counts)], "T"))
+    return len(selected)
@@ -1,5 +1,10 @@
 import functools
+import json
+import multiprocessing
 import os
+import pathlib
+import subprocess
+import sys
 
 import numpy as np
 import pytest
@@ -31,6 +36,64 @@ def adjust_depending_on_package_variant(test_func):
     return generalized_test_func
 
 
+def write_iges(filename, entities):
+    """Write a minimal IGES file from ``(type, parameters, form)`` tuples.
+
+    The entity at position ``i`` has the directory pointer ``2 * i + 1``.
+    """
+
+    def record(data, section, number):
+        return f"{data:<72}{section}{number:7d}\n"
+
+    directory, parameter_lines = [], []
+    for i, (entity_type, parameters, form) in enumerate(entities):
+        pointer = 2 * i + 1
+        text = ",".join(str(value) for value in (entity_type, *parameters)) + ";"
+        chunks = [text[j : j + 64] for j in range(0, len(text), 64)]
+        first = len(parameter_lines) + 1
+        for chunk in chunks:
+            parameter_lines.append(f"{chunk:<64}{pointer:8d}")
+        fields = [entity_type, first, 0, 0, 0, 0, 0, 0]
+        directory.append("".join(f"{field:8d}" for field in fields) + "00000000")
+        fields = [entity_type, 0, 0, len(chunks), form, 0, 0, 0, 0]
+        directory.append("".join(f"{field:8d}" for field in fields))
+
+    with open(filename, "w") as f:
+        f.write(record("", "S", 1))
+        f.write(record(",,;", "G", 1))
+        for number, data in enumerate(directory, start=1):
+            f.write(record(data, "D", number))
+        for number, data in enumerate(parameter_lines, start=1):
+            f.write(record(data, "P", number))
+        f.write(record("", "T", 1))
+
+
+def triangle_area(points, triangles):
+    """Return the total area of a triangulation."""
+    corners = points[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    return np.linalg.norm(normals, axis=1).sum() / 2
+
+
+@pytest.fixture()
+def analytic(tmp_path):
+    filename = tmp_path / "analytic.igs"
+    entities = [
+        (110, [0, 0, 0, 0, 0, 1], 0),  # 1: axis
+        (110, [1, 0, 0, 1, 0, 2], 0),  # 3: generatrix
+        (120, [1, 3, 0, 2 * np.pi], 0),  # 5: cylinder of radius 1 and height 2
+        (100, [0, 0, 0, 1, 0, 1, 0], 0),  # 7: unit circle
+        (122, [7, 1, 0, 3], 0),  # 9: cylinder of radius 1 and height 3
+        (110, [0, 0, 0, 2, 0, 0], 0),  # 11
+        (110, [0, 1, 1, 2, 1, 1], 0),  # 13
+        (118, [11, 13, 0, 1], 0),  # 15: 2 by sqrt(2) rectangle
+        (108, [0, 0, 1, 5, 0, 0, 0, 5, 2], 0),  # 17: 2 by 2 square at z = 5
+        (108, [0, 0, 1, 0, 7, 0, 0, 0, 1], 1),  # 19: unit disk
+    ]
+    write_iges(filename, entities)
+    return pyiges.read(filename)
+
+
 @pytest.fixture(scope="module")
 def sample():
     return pyiges.read(examples.sample)
@@ -41,6 +104,12 @@ def impeller():
     return pyiges.read(examples.impeller)
 
 
+@pytest.fixture(scope="module")
+def impeller_surfaces(impeller):
+    # every surface tessellated on a grid, the impeller has no other analytic surfaces
+    return impeller.bspline_surfaces() + impeller.surfaces_of_revolution()
+
+
 @pytest.fixture(scope="module")
 def surf(impeller):
     return impeller.bspline_surfaces()[0]  # pyiges.geometry.RationalBSplineSurface
@@ -138,7 +207,7 @@ def test_iges_to_vtk2(sample, merge):
 def test_surfaces_vtk(surf):
     mesh = surf.to_vtk(delta=0.1)
 
-    assert mesh.area == pytest.approx(277.4757547644264)
+    assert mesh.area == pytest.approx(277.4788020142395)
     assert mesh.n_arrays == 0
     assert mesh.n_cells == 162
     assert mesh.n_lines == 0
@@ -150,15 +219,48 @@ def test_surfaces_vtk(surf):
     assert mesh.bounds == pytest.approx(
         (
             -30.547425187,
-            -26.209437969209873,
+            -26.210376805740637,
             -16.775362758,
-            -9.363301218200274,
+            -9.363636616816569,
             -45.772995131000016,
             -8.876323512,
         )
     )
 
 
+@adjust_depending_on_package_variant
+def test_surfaces_vtk_normals_curvature(surf):
+    mesh = surf.to_vtk(delta=0.05, normals=True, curvature=True)
+    assert mesh.point_data.active_normals_name == "Normals"
+    assert np.allclose(np.linalg.norm(mesh.point_data["Normals"], axis=1), 1)
+
+    # exact normals agree with the faceted ones and their orientation
+    faceted = mesh.compute_normals(cell_normals=False, auto_orient_normals=False)
+    assert np.all(np.sum(faceted.point_data["Normals"] * mesh.point_data["Normals"], axis=1) > 0.99)
+
+    interior = np.arange(mesh.n_points).reshape(20, 20)[5:15, 5:15].ravel()
+    for name, kind in (("Gaussian Curvature", "gaussian"), ("Mean Curvature", "mean")):
+        assert np.allclose(mesh[name][interior], mesh.curvature(kind)[interior], rtol=0.01)
+
+
+@adjust_depending_on_package_variant
+def test_surfaces_vtk_kind(surf):
+    triangles = surf.to_vtk(delta=0.1)
+    quads = surf.to_vtk(delta=0.1, kind="quad")
+    grid = surf.to_vtk(delta=0.1, kind="structured")
+
+    assert quads.n_cells == grid.n_cells == triangles.n_cells // 2 == 81
+    assert np.all(quads.faces.reshape(-1, 5)[:, 0] == 4)
+    assert type(grid).__name__ == "StructuredGrid"
+    assert grid.dimensions == (10, 10, 1)
+    assert np.allclose(grid.points, triangles.points)
+    assert quads.area == pytest.approx(triangles.area)
+    assert grid.area == pytest.approx(triangles.area)
+
+    with pytest.raises(ValueError, match="Invalid kind"):
+        surf.to_vtk(kind="hexahedron")
+
+
 @adjust_depending_on_package_variant
 def test_surfaces_to_geomdl(surf):
     gsurf = surf.to_geomdl()
@@ -356,7 +458,7 @@ def test_surfaces_parse(surf):
         "level": 0,
         "view": None,
         "transform": None,
-        "label_assoc": 0,
+        "label_assoc": None,
         "status_number": 1010000,
         "line_weight_number": 0,
         "color_number": 0,
@@ -515,7 +617,7 @@ def test_bsplines_parse(curve):
         "level": 0,
         "view": None,
         "transform": None,
-        "label_assoc": 0,
+        "label_assoc": None,
         "status_number": 1010500,
         "line_weight_number": 0,
         "color_number": 0,
@@ -710,7 +812,7 @@ def test_circular_arcs_parse(carc):
         "level": 0,
         "view": None,
         "transform": None,
-        "label_assoc": 0,
+        "label_assoc": None,
         "status_number": 1010000,
         "line_weight_number": 0,
         "color_number": 0,
@@ -789,7 +891,7 @@ def test_entity_parse(entity):
         "level": 0,
         "view": None,
         "transform": None,
-        "label_assoc": 0,
+        "label_assoc": None,
         "status_number": 200,
         "line_weight_number": 0,
         "color_number": 8,
@@ -818,7 +920,7 @@ def test_line_parse(line):
         "level": 0,
         "view": None,
         "transform": None,
-        "label_assoc": 0,
+        "label_assoc": None,
         "status_number": 1010000,
         "line_weight_number": 0,
         "color_number": 0,
@@ -888,7 +990,7 @@ def test_transformation_parse(trafo):
         "level": 0,
         "view": None,
         "transform": None,
-        "label_assoc": 0,
+        "label_assoc": None,
         "status_number": 0,
         "line_weight_number": 0,
         "color_number": 0,
@@ -908,16 +1010,62 @@ def test_transformation_vtk(trafo):
     assert m.GetElement(2, 3) == pytest.approx(5.67397368511119)
 
 
-def test_example_with_invalid_conic_arc_and_form1_global_line():
-    # For this file, the conic arc cannot be parsed.
-    # This is either because of a wrong format of the file or a bug in the parsing.
-    # Despite the reason is unclear, we use this here to test the robust discarding mechanism
+def test_example_with_conic_arc_and_form1_global_line():
     iges = pyiges.read(os.path.join(DIR_TESTS_REFERENCE_DATA, "example-arcs.iges"))
-    assert not iges.conic_arcs()
+    assert len(iges.conic_arcs()) == 1
     assert len(iges.bsplines()) == 1
     assert len(iges.circular_arcs()) == 1
 
 
+def test_conic_arc():
+    iges = pyiges.read(os.path.join(DIR_TESTS_REFERENCE_DATA, "example-arcs.iges"))
+    conic = iges.conic_arcs()[0]
+    assert conic.conic_type == "ellipse"
+    assert str(conic)
+
+    points = conic.tessellate(50)
+    affine = conic.transform.to_affine()
+    local = (points - affine[:3, 3]) @ affine[:3, :3]
+    assert np.allclose(local[:, 2], conic.z)
+    assert np.allclose(local[[0, -1], :2], [[conic.x1, conic.y1], [conic.x2, conic.y2]])
+    a, b, c, d, e, f = conic.coefficients
+    x, y = local[:, 0], local[:, 1]
+    assert np.allclose(a * x**2 + b * x * y + c * y**2 + d * x + e * y + f, 0, atol=1e-9)
+
+    # the ellipse runs counterclockwise from the start point
+    angle = np.unwrap(np.arctan2(y, x))
+    assert np.all(np.diff(angle) > 0)
+
+    assert np.allclose(pyiges.geometry.conic_arc_points([conic, conic], 50), points)
+    bounds = conic.bounds
+    assert bounds[0] <= points[:, 0].min() + 1e-9 and points[:, 0].max() <= bounds[1] + 1e-9
+
+
+def test_classify_conics():
+    coefficients = np.array(
+        [
+            [1, 0, 1, 0, 0, -1],  # ellipse
+            [1, 0, 1, 0, 0, 1],  # imaginary ellipse
+            [1, 0, -1, 0, 0, -1],  # hyperbola
+            [1, 0, 0, 0, -1, 0],  # parabola
+            [1, 0, -1, 0, 0, 0],  # pair of lines
+        ],
+        dtype=float,
+    )
+    kinds = pyiges.geometry._classify_conics(coefficients)
+    assert kinds == ["ellipse", None, "hyperbola", "parabola", None]
+
+
+@adjust_depending_on_package_variant
+def test_conic_arc_vtk():
+    iges = pyiges.read(os.path.join(DIR_TESTS_REFERENCE_DATA, "example-arcs.iges"))
+    conic = iges.conic_arcs()[0]
+    assert conic.to_vtk(30).n_points == 30
+    mesh = iges.to_vtk(lines=False, bsplines=False, surfaces=False, points=False, delta=0.05)
+    assert mesh.n_points == 20
+    assert np.allclose(mesh.points, conic.tessellate(20))
+
+
 @adjust_depending_on_package_variant
 def test_to_vtk(impeller):
     lines = impeller.to_vtk(lines=True, bsplines=False, surfaces=False)
@@ -949,3 +1097,988 @@ def test_parse_separators_from_first_global_line(line, expected_separators):
     else:
         separators = pyiges.Iges._parse_separators_from_first_global_line(line)
         assert separators == expected_separators
+
+
+def _brute_force_bounds(iges):
+    ids = np.array([i for i, e in enumerate(iges) if e.bounds is not None])
+    bounds = np.array([iges.items[i].bounds for i in ids])
+    return ids, bounds[:, ::2], bounds[:, 1::2]
+
+
+def test_query_box(impeller):
+    box = [-10, 10, -10, 10, -10, 10]
+    ids, lower, upper = _brute_force_bounds(impeller)
+    inside = np.all((lower <= box[1::2]) & (upper >= box[::2]), axis=1)
+    assert np.array_equal(impeller.query_box(box), ids[inside])
+
+
+def test_query_sphere(impeller):
+    ids, lower, upper = _brute_force_bounds(impeller)
+    center = np.array([5.0, -5.0, 0.0])
+    dist = np.linalg.norm(np.maximum(lower - center, 0) + np.maximum(center - upper, 0), axis=1)
+    assert np.array_equal(impeller.query_sphere(center, 15), ids[dist <= 15])
+
+
+def test_nearest(impeller):
+    ids, lower, upper = _brute_force_bounds(impeller)
+    point = np.array([30.0, 30.0, 0.0])
+    dist = np.linalg.norm(np.maximum(lower - point, 0) + np.maximum(point - upper, 0), axis=1)
+    indices, distances = impeller.nearest(point, k=5)
+    assert distances == pytest.approx(np.sort(dist)[:5])
+    assert np.all(np.isin(indices, ids))
+
+
+def test_spatial_index_save_load(impeller, tmp_path):
+    from pyiges.spatial import BoundingVolumeHierarchy
+
+    filename = str(tmp_path / "index.npz")
+    impeller.spatial_index.save(filename)
+    loaded = BoundingVolumeHierarchy.load(filename)
+    box = [-10, 10, -10, 10, -10, 10]
+    assert np.array_equal(loaded.query_box(box), impeller.query_box(box))
+    sample = pyiges.read(examples.sample)
+    with pytest.raises(ValueError, match="more entities"):
+        sample.spatial_index = loaded
+
+
+def test_clip_bounds_typed_accessor(impeller):
+    roi = [-30, -20, -20, -10, -50, 0]
+    planes = [
+        [1, 0, 0, 30],
+        [-1, 0, 0, -20],
+        [0, 1, 0, 20],
+        [0, -1, 0, -10],
+        [0, 0, 1, 50],
+        [0, 0, -1, 0],
+    ]
+    surfaces = impeller.bspline_surfaces(clip_bounds=roi)
+    assert 0 < len(surfaces) < len(impeller.bspline_surfaces())
+    assert impeller.bspline_surfaces(clip_bounds=planes) == surfaces
+    for surface in surfaces:
+        lower, upper = np.array(surface.bounds[::2]), np.array(surface.bounds[1::2])
+        assert np.all(lower <= roi[1::2]) and np.all(upper >= roi[::2])
+
+    with pytest.raises(ValueError, match="clip_bounds"):
+        impeller.bspline_surfaces(clip_bounds=[0, 1, 2])
+
+
+@adjust_depending_on_package_variant
+def test_to_vtk_clip_bounds(impeller):
+    mesh = impeller.to_vtk(delta=0.2, clip_bounds=[-30, -20, -20, -10, -50, 0])
+    assert 0 < mesh.n_cells < impeller.to_vtk(delta=0.2).n_cells
+
+    empty = impeller.to_vtk(clip_bounds=[1e5, 1e5 + 1, 0, 1, 0, 1])
+    assert empty.n_points == 0
+
+
+def test_bspline_closest_point(impeller):
+    curve = impeller.bsplines()[3]
+    t_start, t_end = curve.domain
+    t = np.linspace(t_start, t_end, 50)
+    points = curve.evaluate(t)
+    closest, t_closest, distance = curve.closest_point(points)
+    assert np.allclose(closest, points)
+    assert np.allclose(t_closest, t)
+    assert np.allclose(distance, 0)
+
+
+def test_bspline_surface_closest_point(impeller):
+    surface = impeller.bspline_surfaces()[0]
+    u_start, u_end, v_start, v_end = surface.domain
+    u, v = np.meshgrid(np.linspace(u_start, u_end, 12)[1:-1], np.linspace(v_start, v_end, 12)[1:-1])
+    u, v = u.ravel(), v.ravel()
+    ders = surface.derivatives(u, v)
+    normals = np.cross(ders[1, 0], ders[0, 1])
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    points = ders[0, 0] + 0.1 * normals
+
+    closest, uv, distance = surface.closest_point(points)
+    assert np.allclose(closest, ders[0, 0])
+    assert np.allclose(uv, np.column_stack((u, v)))
+    assert np.allclose(distance, 0.1)
+
+
+def test_iges_closest_point(impeller):
+    surfaces = [
+        i
+        for i, item in enumerate(impeller.items)
+        if isinstance(item, pyiges.geometry.RationalBSplineSurface)
+    ]
+    rng = np.random.default_rng(0)
+    bounds = np.array(impeller.spatial_index.bounds)
+    points = rng.uniform(bounds[::2], bounds[1::2], (50, 3))
+
+    closest, distance, indices = impeller.closest_point(points)
+    expected = np.array([impeller.items[i].closest_point(points)[2] for i in surfaces])
+    assert np.allclose(distance, expected.min(axis=0))
+    assert np.allclose(np.linalg.norm(closest - points, axis=1), distance)
+    assert set(indices) <= set(surfaces)
+
+
+def test_bspline_surface_tessellate(impeller):
+    surface = impeller.bspline_surfaces()[0]
+    points, triangles = surface.tessellate(delta=0.1)
+    assert points.shape == (100, 3)
+    assert triangles.shape == (162, 3)
+    assert triangles.max() == points.shape[0] - 1
+    assert np.allclose(points[0], surface.evaluate(surface.domain[0], surface.domain[2]))
+
+
+def test_ray_caster():
+    points = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 2], [1, 0, 2], [0, 1, 2]]
+    caster = pyiges.spatial.RayCaster(points, [[0, 1, 2], [3, 4, 5]], ids=[7, 8])
+    origins = [[0.2, 0.2, 5], [0.2, 0.2, 1], [0.2, 0.2, -1], [2, 2, 5]]
+    directions = [[0, 0, -3], [0, 0, -1], [0, 0, -1], [0, 0, -1]]
+    distance, ids = caster.intersect(origins, directions)
+    assert np.allclose(distance, [3, 1, np.inf, np.inf])
+    assert ids.tolist() == [8, 7, -1, -1]
+
+
+def test_raycast(impeller):
+    bounds = np.array(impeller.spatial_index.bounds)
+    x, y = np.meshgrid(np.linspace(*bounds[:2], 20), np.linspace(*bounds[2:4], 20))
+    origins = np.column_stack((x.ravel(), y.ravel(), np.full(x.size, bounds[5] + 1)))
+    distance, indices = impeller.raycast(origins, [0, 0, -1], delta=0.1)
+    assert (indices >= 0).any()
+    assert np.all(np.isinf(distance) == (indices < 0))
+
+    # compare against intersecting every ray with every triangle
+    caster = impeller._ray_casters[0.1]
+    n_triangles = len(caster)
+    for i in np.nonzero(indices >= 0)[0][:5]:
+        best = np.full(origins.shape[0], np.inf)
+        items = np.full(origins.shape[0], -1)
+        directions = np.tile([0.0, 0.0, -1.0], (origins.shape[0], 1))
+        rays = np.full(n_triangles, i)
+        caster._update_hits(origins, directions, rays, np.arange(n_triangles), best, items)
+        assert best[i] == distance[i]
+        assert isinstance(impeller.items[indices[i]], pyiges.geometry.RationalBSplineSurface)
+
+
+def test_bspline_length(impeller):
+    curve = impeller.bsplines()[3]
+    points = curve.evaluate(np.linspace(*curve.domain, 20001))
+    polyline_length = np.linalg.norm(np.diff(points, axis=0), axis=1).sum()
+    assert np.isclose(curve.length(), polyline_length, rtol=1e-6)
+
+
+def test_bspline_surface_area(impeller):
+    surface = impeller.bspline_surfaces()[0]
+    points, triangles = surface.tessellate(delta=0.005)
+    corners = points[triangles]
+    edges = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    mesh_area = np.linalg.norm(edges, axis=1).sum() / 2
+    assert np.isclose(surface.area(), mesh_area, rtol=1e-5)
+    assert np.isclose(surface.area(), surface.area(points_per_span=12))
+
+
+def test_geometric_properties(impeller):
+    props = impeller.geometric_properties()
+    assert len(props) == len(impeller.lines()) + len(impeller.bsplines()) + len(
+        impeller.bspline_surfaces()
+    )
+
+    surfaces = props[props["type"] == 128]
+    assert np.all(np.isnan(surfaces["length"]))
+    first = impeller.items[surfaces["index"][0]]
+    assert np.isclose(surfaces["area"][0], first.area())
+
+    lines = props[props["type"] == 110]
+    assert np.all(np.isnan(lines["area"]))
+    first = impeller.items[lines["index"][0]]
+    assert np.isclose(lines["length"][0], first.length())
+    assert np.allclose(lines["centroid"][0], first.coordinates.mean(axis=0))
+
+
+def test_bspline_surface_sample_points(impeller):
+    surface = impeller.bspline_surfaces()[0]
+    points, normals = surface.sample_points(500, seed=0)
+    assert points.shape == normals.shape == (500, 3)
+    assert np.allclose(np.linalg.norm(normals, axis=1), 1)
+    assert np.allclose(surface.closest_point(points)[2], 0, atol=1e-8)
+    assert np.array_equal(surface.sample_points(500, seed=0, with_normals=False), points)
+
+
+def test_bspline_surface_sample_points_uniform_by_area():
+    # a bilinear patch whose area element grows linearly with v
+    knots = np.array([0.0, 0, 1, 1])
+    net = np.array([[[0.0, 0, 0], [1, 0, 0]], [[0, 1, 0], [3, 1, 0]]])
+    u, v = pyiges.nurbs.surface_sample_parameters(
+        knots, 1, knots, 1, net, np.ones((2, 2)), 20000, np.random.default_rng(0)
+    )
+    # the density is (1 + 2 v) / 2, so half of the area lies below v = 0.618
+    assert abs(np.mean(v < (np.sqrt(5) - 1) / 2) - 0.5) < 0.02
+    assert np.all((u >= 0) & (u <= 1) & (v >= 0) & (v <= 1))
+
+
+def test_sample_points(impeller):
+    points, normals = impeller.sample_points(2000, seed=1)
+    assert points.shape == normals.shape == (2000, 3)
+    assert np.array_equal(impeller.sample_points(2000, seed=1, with_normals=False), points)
+
+    bounds = np.array(impeller.spatial_index.bounds)
+    assert np.all(points >= bounds[::2]) and np.all(points <= bounds[1::2])
+
+    # samples are spread over the surfaces in proportion to their area
+    surfaces = impeller.bspline_surfaces()
+    largest = max(surfaces, key=lambda surface: surface.area())
+    share = largest.area() / sum(surface.area() for surface in surfaces)
+    on_largest = np.isclose(largest.closest_point(points)[2], 0, atol=1e-8).mean()
+    assert abs(on_largest - share) < 0.05
+
+
+def test_sample_points_without_surfaces():
+    iges = pyiges.read(os.path.join(DIR_TESTS_REFERENCE_DATA, "example-arcs.iges"))
+    with pytest.raises(ValueError, match="no B-spline surfaces"):
+        iges.sample_points(10)
+
+
+@adjust_depending_on_package_variant
+def test_to_vtk_kind(impeller):
+    roi = [-30, -20, -20, -10, -50, 0]
+    options = dict(lines=False, bsplines=False, points=False, delta=0.2, clip_bounds=roi)
+    triangles = impeller.to_vtk(**options)
+    quads = impeller.to_vtk(kind="quad", **options)
+    assert quads.n_points == triangles.n_points
+    assert 2 * quads.n_cells == triangles.n_cells
+
+    blocks = impeller.to_vtk(delta=0.2, clip_bounds=roi, kind="structured", merge=False)
+    assert any(type(block).__name__ == "StructuredGrid" for block in blocks)
+    with pytest.raises(ValueError, match="cannot be merged"):
+        impeller.to_vtk(kind="structured")
+
+
+@adjust_depending_on_package_variant
+def test_to_vtk_budget(impeller, impeller_surfaces):
+    surfaces = impeller_surfaces
+    full = impeller.to_vtk(lines=False, bsplines=False, points=False, delta=0.05)
+    assert "Coarse Entities" not in full.field_data.keys()
+
+    mesh = impeller.to_vtk(lines=False, bsplines=False, points=False, delta=0.05, time_budget=0)
+    assert mesh.n_cells == 32 * len(surfaces)
+    assert len(mesh.field_data["Coarse Entities"]) == len(surfaces)
+    assert np.all(mesh.field_data["Estimated Error"] > 0)
+
+    mesh = impeller.to_vtk(
+        lines=False, bsplines=False, points=False, delta=0.05, triangle_budget=100 * len(surfaces)
+    )
+    assert 32 * len(surfaces) < mesh.n_cells <= 100 * len(surfaces)
+    coarse = mesh.field_data["Coarse Entities"]
+    assert 0 < len(coarse) < len(surfaces)
+    assert all(impeller.items[index] in surfaces for index in coarse)
+
+    mesh = impeller.to_vtk(lines=False, bsplines=False, points=False, delta=0.05, time_budget=60)
+    assert mesh.n_cells == full.n_cells
+    assert not len(mesh.field_data["Coarse Entities"])
+
+
+def test_allocate_triangles(impeller, impeller_surfaces):
+    n_surfaces = len(impeller_surfaces)
+    for budget in (10_000, 100_000):
+        allocation = impeller.allocate_triangles(budget)
+        assert len(allocation) == n_surfaces
+        n_triangles = 2 * ((allocation["n_u"] - 1) * (allocation["n_v"] - 1)).sum()
+        assert 0.95 * budget <= n_triangles <= budget
+
+    # the budget cannot go below one cell per surface
+    allocation = impeller.allocate_triangles(1)
+    assert np.all(allocation["n_u"] == 2) and np.all(allocation["n_v"] == 2)
+
+
+def test_control_net_measures():
+    u, v = np.meshgrid(np.linspace(0, 2, 5), np.linspace(0, 1, 3))
+    area, lengths, turning = pyiges.nurbs.control_net_measures(np.stack((u, v, 0 * u), axis=-1))
+    assert np.isclose(area, 2)
+    assert np.allclose(lengths, [2, 1])
+    assert np.allclose(turning, 0)
+
+    angle = np.linspace(0, np.pi, 9)
+    circle = np.column_stack((np.cos(angle), np.sin(angle), np.zeros(9)))
+    net = np.stack((circle, circle + [0, 0, 1]))
+    _, _, turning = pyiges.nurbs.control_net_measures(net)
+    assert np.allclose(turning, [7 * np.pi / 8, 0])
+
+
+@adjust_depending_on_package_variant
+def test_to_vtk_allocate(impeller):
+    mesh = impeller.to_vtk(
+        lines=False, bsplines=False, points=False, triangle_budget=20_000, allocate=True
+    )
+    assert 0.95 * 20_000 <= mesh.n_cells <= 20_000
+
+    with pytest.raises(ValueError, match="allocate requires"):
+        impeller.to_vtk(allocate=True)
+
+
+@adjust_depending_on_package_variant
+def test_to_vtk_dtype(impeller):
+    roi = [-30, -20, -20, -10, -50, 0]
+    reference = impeller.to_vtk(delta=0.2, clip_bounds=roi)
+    mesh = impeller.to_vtk(delta=0.2, clip_bounds=roi, dtype=np.float32, offset=True)
+    assert reference.points.dtype == np.float64
+    assert mesh.points.dtype == np.float32
+
+    offset = mesh.field_data["Offset"]
+    bounds = np.array(impeller.spatial_index.bounds)
+    assert np.allclose(offset, (bounds[::2] + bounds[1::2]) / 2)
+    assert np.allclose(mesh.points + offset, reference.points, atol=1e-4)
+
+    blocks = impeller.bspline_surfaces(
+        as_vtk=True, clip_bounds=roi, delta=0.2, dtype=np.float32, offset=[1, 2, 3]
+    )
+    assert all(block.points.dtype == np.float32 for block in blocks)
+    assert np.allclose(blocks[0].field_data["Offset"], [1, 2, 3])
+
+    with pytest.raises(ValueError, match="offset"):
+        impeller.to_vtk(offset=[1, 2])
+
+
+@adjust_depending_on_package_variant
+def test_read_as_mesh_dtype():
+    mesh = pyiges.read_as_mesh(examples.sample, dtype=np.float32)
+    assert mesh.n_points
+    assert mesh.points.dtype == np.float32
+
+
+def test_iter_tessellation(impeller, impeller_surfaces):
+    blocks = list(impeller.iter_tessellation(chunk_triangles=5000, delta=0.1))
+    for points, cells, entity_ids in blocks:
+        assert len(cells) == len(entity_ids)
+        assert cells.min() >= 0 and cells.max() < len(points)
+        assert len(cells) <= 5000
+
+    triangles = [block for block in blocks if block[1].shape[1] == 3]
+    segments = [block for block in blocks if block[1].shape[1] == 2]
+    assert len(triangles) > 1
+    assert sum(len(cells) for _, cells, _ in triangles) == 162 * len(impeller_surfaces)
+
+    # every block holds complete entities tessellated like their own kernel
+    points, cells, entity_ids = triangles[0]
+    first = impeller.items[entity_ids[0]]
+    first_points, first_cells = first.tessellate(0.1)
+    assert np.allclose(points[: len(first_points)], first_points)
+    assert np.array_equal(cells[: len(first_cells)], first_cells)
+
+    curve_ids = np.unique(np.concatenate([ids for _, _, ids in segments]))
+    composites = {impeller.items.index(curve) for curve in impeller.composite_curves()}
+    assert set(curve_ids) >= composites
+    assert not set(curve_ids) & impeller._composite_members()
+
+
+def test_iter_tessellation_filters(impeller, impeller_surfaces):
+    blocks = impeller.iter_tessellation(lines=False, bsplines=False, delta=0.2)
+    assert all(cells.shape[1] == 3 for _, cells, _ in blocks)
+    roi = [-30, -20, -20, -10, -50, 0]
+    clipped = impeller.iter_tessellation(bsplines=False, lines=False, delta=0.2, clip_bounds=roi)
+    n_clipped = sum(len(cells) for _, cells, _ in clipped)
+    assert 0 < n_clipped < 40 * len(impeller_surfaces)
+
+
+@pytest.mark.parametrize("extension", ["stl", "ply", "obj", "glb"])
+def test_export(impeller, impeller_surfaces, tmp_path, extension):
+    filename = tmp_path / f"impeller.{extension}"
+    n_triangles = impeller.export(filename, delta=0.2, chunk_triangles=1000)
+    assert n_triangles == 32 * len(impeller_surfaces)
+
+    content = filename.read_bytes()
+    if extension == "stl":
+        assert np.frombuffer(content, "<u4", 1, 80)[0] == n_triangles
+        assert len(content) == 84 + 50 * n_triangles
+    elif extension == "ply":
+        header = content[: content.index(b"end_header\n")].decode()
+        assert f"element face {n_triangles:010d}" in header
+    elif extension == "obj":
+        assert content.count(b"\nf ") == n_triangles
+    else:
+        json_length = np.frombuffer(content, "<u4", 1, 12)[0]
+        gltf = json.loads(content[20 : 20 + json_length])
+        assert gltf["accessors"][1]["count"] == 3 * n_triangles
+        assert np.frombuffer(content, "<u4", 1, 8)[0] == len(content)
+
+
+def test_export_does_not_import_vtk(tmp_path):
+    code = (
+        "import sys, pyiges\n"
+        "from pyiges import examples\n"
+        f"pyiges.read(examples.impeller).export({str(tmp_path / 'impeller.stl')!r}, delta=0.2)\n"
+        "assert not [m for m in sys.modules if m.split('.')[0] in ('pyvista', 'vtkmodules')]\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_check_imports_lazy_attributes():
+    from pyiges.check_imports import geomdl, vtkAppendPolyData
+
+    if not pyiges.check_imports._IS_FULL_MODULE:
+        assert geomdl is None and vtkAppendPolyData is None
+        return
+    assert geomdl.__name__ == "geomdl"
+    assert vtkAppendPolyData().GetNumberOfInputConnections(0) == 0
+
+
+def test_export_invalid_format(impeller, tmp_path):
+    with pytest.raises(ValueError, match="Unsupported export format"):
+        impeller.export(tmp_path / "impeller.vtk")
+
+
+def test_to_lods(impeller, tmp_path):
+    tolerances = [0, 0.1, 1]
+    filenames = [tmp_path / f"lod{level}.stl" for level in range(len(tolerances))]
+    lods = impeller.to_lods(tolerances, delta=0.05, filenames=filenames)
+
+    points, triangles = impeller.bspline_surfaces()[0].tessellate(delta=0.05)
+    first = lods[0]["entity_ids"] == lods[0]["entity_ids"][0]
+    assert np.allclose(lods[0]["points"][: len(points)], points)
+    assert np.array_equal(lods[0]["triangles"][first], triangles)
+    assert lods[0]["max_error"] == 0
+
+    n_triangles = [lod["n_triangles"] for lod in lods]
+    assert n_triangles == sorted(n_triangles, reverse=True)
+    assert n_triangles[-1] < n_triangles[0]
+    for lod, filename in zip(lods, filenames):
+        assert lod["max_error"] <= lod["tolerance"]
+        assert len(lod["entity_ids"]) == lod["n_triangles"]
+        assert np.frombuffer(filename.read_bytes(), "<u4", 1, 80)[0] == lod["n_triangles"]
+
+    with pytest.raises(ValueError, match="one filename per tolerance"):
+        impeller.to_lods(tolerances, filenames=filenames[:1])
+
+
+def test_analytic_surfaces(analytic):
+    assert len(analytic.surfaces_of_revolution()) == 1
+    assert len(analytic.tabulated_cylinders()) == 1
+    assert len(analytic.ruled_surfaces()) == 1
+    assert len(analytic.planes()) == 2
+
+    expected = {5: 4 * np.pi, 9: 6 * np.pi, 15: 2 * np.sqrt(2), 17: 4, 19: np.pi}
+    for pointer, area in expected.items():
+        surface = analytic[pointer]
+        assert str(surface)
+        points, triangles = surface.tessellate(delta=0.01)
+        assert triangle_area(points, triangles) == pytest.approx(area, rel=1e-3)
+        bounds = np.array(surface.bounds)
+        assert np.all(bounds[::2] <= points.min(axis=0))
+        assert np.all(points.max(axis=0) <= bounds[1::2])
+
+    # the generatrix is rotated about the z axis
+    grid = analytic[5]._evaluate_samples(5, 9)[0, 0]
+    assert np.allclose(np.linalg.norm(grid[..., :2], axis=-1), 1)
+    assert np.allclose(grid[:, :, 2], np.linspace(0, 2, 5))
+
+    # all surfaces take part in the tessellation of the model
+    blocks = list(analytic.iter_tessellation(lines=False, bsplines=False, delta=0.1))
+    assert set(np.concatenate([ids for _, _, ids in blocks])) == {2, 4, 7, 8, 9}
+
+
+def test_analytic_surface_with_unsupported_curve(tmp_path):
+    filename = tmp_path / "copious.igs"
+    entities = [
+        (110, [0, 0, 0, 0, 0, 1], 0),  # 1: axis
+        (106, [1, 3, 0, 1, 0, 1, 1, 1, 2], 1),  # 3: copious data generatrix
+        (120, [1, 3, 0, 6.283185307179586], 0),  # 5: surface of revolution
+    ]
+    write_iges(filename, entities)
+    iges = pyiges.read(filename)
+
+    with pytest.warns(UserWarning, match="unsupported curve"):
+        assert iges[5].bounds is None
+    assert list(iges.query_box([-1, 1, -1, 1, -1, 1])) == [0]
+    blocks = list(iges.iter_tessellation(delta=0.1))
+    assert set(np.concatenate([ids for _, _, ids in blocks])) == {0}
+    assert iges.export(tmp_path / "copious.stl", delta=0.1) == 0
+
+
+@adjust_depending_on_package_variant
+def test_analytic_surfaces_vtk(analytic):
+    mesh = analytic.to_vtk(lines=False, bsplines=False, points=False, delta=0.1)
+    assert mesh.n_cells == 5 * 2 * 9**2
+    assert analytic.planes(as_vtk=True, merge=True, delta=0.1, kind="quad").n_cells == 2 * 9**2
+
+
+@pytest.fixture()
+def parametric_splines(tmp_path):
+    # curve x = t, y = t**2 and z = 0, then (t - 1)**3, on the segments [0, 1] and [1, 2]
+    segments = [[0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0], [1, 1, 0, 0, 1, 2, 1, 0, 0, 0, 0, 1]]
+    curve = [3, 2, 3, 2, 0, 1, 2, *np.ravel(segments), *np.zeros(12)]
+
+    # surface x = u, y = v and z = u * v on two patches in u, stored with the
+    # unused last row and column of patches of the specification
+    def patch(x, y, z):
+        return [value for axis in (x, y, z) for value in axis]
+
+    zero = [0] * 16
+    first = patch([0, 1] + [0] * 14, [0] * 4 + [1] + [0] * 11, [0] * 5 + [1] + [0] * 10)
+    second = patch([1, 1] + [0] * 14, [0] * 4 + [1] + [0] * 11, [0] * 4 + [1, 1] + [0] * 10)
+    unused = patch(zero, zero, zero)
+    patches = first + unused + second + unused + unused + unused
+    surface = [1, 1, 2, 1, 0, 1, 2, 0, 1, *patches]
+
+    filename = tmp_path / "splines.igs"
+    write_iges(filename, [(112, curve, 0), (114, surface, 0)])
+    return pyiges.read(filename)
+
+
+def test_parametric_spline_curve(parametric_splines):
+    curve = parametric_splines.parametric_spline_curves()[0]
+    assert str(curve)
+    assert curve.coefficients.shape == (2, 4, 3)
+    assert curve.domain == (0, 2)
+
+    t = np.linspace(0, 2, 41)
+    expected = np.column_stack((t, t**2, np.where(t > 1, (t - 1) ** 3, 0)))
+    assert np.allclose(curve.evaluate(t), expected)
+    points = curve.tessellate(delta=0.025)
+    assert len(points) == 40
+    assert np.allclose(points[[0, -1]], expected[[0, -1]])
+    assert np.allclose(curve.bounds, [0, 2, 0, 4, 0, 1])
+
+
+def test_parametric_spline_surface(parametric_splines):
+    surface = parametric_splines.parametric_spline_surfaces()[0]
+    assert str(surface)
+    assert surface.coefficients.shape == (2, 1, 4, 4, 3)
+    assert surface.domain == (0, 2, 0, 1)
+
+    u, v = np.meshgrid(np.linspace(0, 2, 9), np.linspace(0, 1, 5))
+    expected = np.stack((u, v, u * v), axis=-1)
+    assert np.allclose(surface.evaluate(u, v), expected.reshape(-1, 3))
+    assert np.allclose(surface._evaluate_samples(9, 5)[0, 0], expected)
+
+    points, triangles = surface.tessellate(delta=0.1)
+    assert len(triangles) == 2 * 9**2
+    assert np.allclose(points[:, 2], points[:, 0] * points[:, 1])
+
+    blocks = list(parametric_splines.iter_tessellation(delta=0.1))
+    assert sorted(cells.shape[1] for _, cells, _ in blocks) == [2, 3]
+
+
+@pytest.fixture()
+def composite(tmp_path):
+    # two lines then a quarter circle about (0, 1), joined end to end
+    entities = [
+        (110, [0, 0, 0, 1, 0, 0], 0),
+        (110, [1, 0, 0, 1, 1, 0], 0),
+        (100, [0, 0, 1, 1, 1, 0, 2], 0),
+        (102, [3, 1, 3, 5], 0),
+    ]
+    filename = tmp_path / "composite.igs"
+    write_iges(filename, entities)
+    return pyiges.read(filename)
+
+
+def test_composite_curve(composite):
+    curve = composite.composite_curves()[0]
+    assert str(curve)
+    assert curve.member_pointers == [1, 3, 5]
+    assert [type(member) for member in curve.members] == [
+        pyiges.geometry.Line,
+        pyiges.geometry.Line,
+        pyiges.geometry.CircularArc,
+    ]
+
+    # the junction points are shared instead of repeated
+    points = curve.tessellate(delta=0.05)
+    assert len(points) == 2 + 1 + 19
+    assert len(np.unique(points.round(9), axis=0)) == len(points)
+    length = np.linalg.norm(np.diff(points, axis=0), axis=1).sum()
+    assert length == pytest.approx(2 + np.pi / 2, rel=1e-2)
+    bounds = np.array(curve.bounds)
+    assert np.all(bounds[::2] <= points.min(axis=0) + 1e-9)
+    assert np.all(points.max(axis=0) <= bounds[1::2] + 1e-9)
+
+    # the members are only tessellated as part of the composite
+    blocks = list(composite.iter_tessellation(delta=0.05))
+    assert [np.unique(ids).tolist() for _, _, ids in blocks] == [[3]]
+    blocks = list(composite.iter_tessellation(delta=0.05, composites=False))
+    assert np.unique(blocks[0][2]).tolist() == [0, 1]
+
+
+def test_composite_curve_with_unsupported_member(tmp_path):
+    entities = [
+        (110, [0, 0, 0, 1, 0, 0], 0),  # 1
+        (106, [1, 2, 0, 1, 0, 2, 0], 1),  # 3: copious data
+        (102, [2, 1, 3], 0),  # 5
+    ]
+    write_iges(tmp_path / "copious.igs", entities)
+    iges = pyiges.read(tmp_path / "copious.igs")
+    with pytest.warns(UserWarning, match=r"unsupported member \(type 106\)"):
+        blocks = list(iges.iter_tessellation(delta=0.05))
+    assert [np.unique(ids).tolist() for _, _, ids in blocks] == [[2]]
+    assert np.allclose(blocks[0][0], [[0, 0, 0], [1, 0, 0]])
+
+
+def test_composite_curve_with_missing_member(tmp_path):
+    entities = [
+        (110, [0, 0, 0, 1, 0, 0], 0),  # 1
+        (102, [2, 1, 99], 0),  # 3
+        (102, [1, 99], 0),  # 5: not converted
+    ]
+    write_iges(tmp_path / "missing.igs", entities)
+    iges = pyiges.read(tmp_path / "missing.igs")
+    with pytest.warns(UserWarning, match=r"unsupported member \(missing\)"):
+        blocks = list(iges.iter_tessellation(delta=0.05))
+    assert [np.unique(ids).tolist() for _, _, ids in blocks] == [[1]]
+    assert iges[5].bounds is None
+
+
+@adjust_depending_on_package_variant
+def test_composite_curve_vtk(composite):
+    mesh = composite.composite_curves()[0].to_vtk(delta=0.05)
+    assert mesh.n_cells == 1
+    assert mesh.n_points == 22
+    assert composite.to_vtk(points=False, delta=0.05).n_cells == 1
+
+
+def test_reference_graph(impeller, composite):
+    indptr, indices = impeller.reference_graph
+    assert len(indptr) == len(impeller) + 1
+    assert indptr[-1] == len(indices)
+
+    # forward and reverse graphs are transposes of each other
+    curve = impeller.composite_curves()[0]
+    index = impeller.items.index(curve)
+    members = impeller.references(index)
+    assert [impeller.items[i] for i in members] == curve.members
+    for member in members:
+        assert index in impeller.referrers(member)
+    assert impeller.from_pointer(curve.member_pointers[0]) is curve.members[0]
+
+    # only the trimmed surfaces are not referenced by other entities
+    roots = [i for i in range(len(impeller)) if not len(impeller.referrers(i))]
+    assert {impeller.items[i].d["entity_type_number"] for i in roots} == {144}
+
+    closed = impeller.closure(roots[:1])
+    assert roots[0] in closed
+    for i in closed:
+        assert np.isin(impeller.references(i), closed).all()
+    assert len(impeller.closure(roots)) == len(impeller)
+
+    composite_index = composite.items.index(composite.composite_curves()[0])
+    assert composite.closure([composite_index]).tolist() == [0, 1, 2, 3]
+    assert composite.closure([0]).tolist() == [0]
+    assert composite.referrers(2).tolist() == [3]
+
+
+def test_reference_graph_hollerith(tmp_path):
+    entities = [
+        (110, [0, 0, 0, 1, 0, 0], 0),  # 1
+        (110, [1, 0, 0, 1, 1, 0], 0),  # 3
+        (308, [0, "7HA, B, C", 2, 1, 3], 0),  # 5: delimiters in the name
+        (308, [0, "1HD", "x", 1], 0),  # 7: malformed count
+    ]
+    write_iges(tmp_path / "subfigure.igs", entities)
+    iges = pyiges.read(tmp_path / "subfigure.igs")
+    assert iges.references(2).tolist() == [0, 1]
+    assert iges.closure([2]).tolist() == [0, 1, 2]
+    assert iges.references(3).tolist() == []
+
+
+def test_shard(impeller, tmp_path):
+    filenames = [tmp_path / f"impeller_{i}.igs" for i in range(3)]
+    shards = impeller.shard(3, filenames)
+
+    # every top level entity lands in exactly one dependency-closed shard
+    roots = [i for i in range(len(impeller)) if not len(impeller.referrers(i))]
+    assigned = np.concatenate([np.intersect1d(shard, roots) for shard in shards])
+    assert sorted(assigned) == roots
+    for shard in shards:
+        assert np.array_equal(impeller.closure(shard), shard)
+    assert len(np.unique(np.concatenate(shards))) == len(impeller)
+    sizes = [len(shard) for shard in shards]
+    assert max(sizes) < 1.1 * min(sizes)
+
+    # the shards are self-contained files with renumbered pointers
+    for shard, filename in zip(shards, filenames):
+        part = pyiges.read(filename)
+        assert len(part) == len(shard)
+        for original, entity in zip([impeller.items[i] for i in shard], part.items):
+            assert entity.d["entity_type_number"] == original.d["entity_type_number"]
+        for curve in part.composite_curves():
+            assert len(curve.members) == len(curve.member_pointers)
+
+    with pytest.raises(ValueError, match="one filename per shard"):
+        impeller.shard(2, filenames)
+
+
+def test_cli_shard(tmp_path, capsys):
+    from pyiges.cli import main
+
+    main(["shard", examples.impeller, "-n", "2", "-o", str(tmp_path)])
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["impeller_0.igs", "impeller_1.igs"]
+    assert "impeller_0.igs" in capsys.readouterr().out
+
+
+def test_write(impeller, composite, tmp_path):
+    filename = tmp_path / "impeller.igs"
+    assert impeller.write(filename) == len(impeller)
+    copy = pyiges.read(filename)
+    assert len(copy) == len(impeller)
+    for original, entity in zip(impeller, copy):
+        if not original._pointer_fields():
+            fields = [field.strip() for field in entity.parameters[0]]
+            assert fields == [field.strip() for field in original.parameters[0]]
+        for key in ("entity_type_number", "form_number", "status_number", "transform"):
+            assert entity.d[key] == original.d[key]
+    for graph, copied in zip(impeller.reference_graph, copy.reference_graph):
+        assert np.array_equal(graph, copied)
+
+    # a rewritten file is written identically again
+    again = tmp_path / "again.igs"
+    copy.write(again)
+    assert again.read_text() == filename.read_text()
+    records = filename.read_text().splitlines()
+    assert all(len(record) == 80 for record in records)
+    assert records[-1][:32] == "S{:7d}G{:7d}D{:7d}P{:7d}".format(
+        *[sum(record[72] == code for record in records) for code in "SGDP"]
+    )
+
+    # subsets are renumbered and pointers out of the subset are zeroed
+    curve = composite.composite_curves()[0]
+    assert composite.write(tmp_path / "subset.igs", [2, curve]) == 2
+    subset = pyiges.read(tmp_path / "subset.igs")
+    assert subset.composite_curves()[0].member_pointers == [0, 0, 1]
+    arc = subset.circular_arcs()[0]
+    assert (arc.x, arc.y, arc.x2, arc.y2) == (0, 1, 0, 2)
+
+
+def test_write_label_display(tmp_path):
+    filename = tmp_path / "label.igs"
+    entities = [(110, [0, 0, 0, 1, 0, 0], 0), (110, [1, 0, 0, 1, 1, 0], 0), (402, [0], 5)]
+    write_iges(filename, entities)
+    records = filename.read_text().splitlines(keepends=True)
+    # label display pointer and status of the first line
+    first = records.index(next(record for record in records if record[72:] == "D      1\n"))
+    records[first] = records[first][:56] + "       501010000" + records[first][72:]
+    filename.write_text("".join(records))
+
+    iges = pyiges.read(filename)
+    line = iges.items[0]
+    assert line.d["label_assoc"] == 5
+    assert line.d["status_number"] == 1010000
+    assert iges.references(0).tolist() == [2]
+
+    iges.write(tmp_path / "subset.igs", [0, 2])
+    subset = pyiges.read(tmp_path / "subset.igs")
+    assert subset.items[0].d["label_assoc"] == 3
+    assert subset.items[0].d["status_number"] == 1010000
+
+
+def test_write_hollerith(tmp_path):
+    text = "A, B,  C " * 9
+    strings = ["12HHello, World", f"{len(text)}H{text}", "3H , "]
+    write_iges(tmp_path / "text.igs", [(212, [1, *strings, 0], 0)])
+    iges = pyiges.read(tmp_path / "text.igs")
+    iges.write(tmp_path / "copy.igs")
+    copy = pyiges.read(tmp_path / "copy.igs")
+    assert [field.lstrip() for field in copy[1]._fields()] == ["212", "1", *strings, "0"]
+
+
+@pytest.mark.parametrize("compression", ["gzip", "bz2", "zstd"])
+def test_read_compressed(tmp_path, compression):
+    if compression == "zstd":
+        zstd = pytest.importorskip("zstandard")
+        compress = zstd.ZstdCompressor().compress
+    else:
+        compress = pytest.importorskip(compression).compress
+
+    # detected from the magic bytes, not the extension
+    filename = tmp_path / "impeller.igs"
+    with open(examples.impeller, "rb") as f:
+        filename.write_bytes(compress(f.read()))
+    iges = pyiges.read(filename)
+    assert len(iges) == 4615
+    assert len(iges.bspline_surfaces()) == 247
+
+
+def test_read_compressed_ascii(tmp_path):
+    # composite curve of two lines and an arc, then a property with a
+    # Hollerith string holding both delimiters
+    entities = [
+        (110, [0, 0, 0, 1, 0, 0], 0),
+        (110, [1, 0, 0, 1, 1, 0], 0),
+        (100, [0, 0, 1, 1, 1, 0, 2], 0),
+        (102, [3, 1, 3, 5], 0),
+        (406, [1, "5Ha;b,c"], 15),
+        (116, [1, 2, 3, 0], 0),
+    ]
+    records = []
+    for entity_type, parameters, form in entities:
+        directory = [entity_type, "", 0, 0, 0, 0, 0, 0, "00010000"]
+        directory += [entity_type, 0, 0, "", form, "", "", "LABEL", 0]
+        records.append(",".join(str(field) for field in directory) + ";")
+        records.append(",".join(str(field) for field in (entity_type, *parameters)) + ";")
+    data = "".join(records)
+
+    # the flag record comes first, then the start and global sections
+    filename = tmp_path / "compressed.igs"
+    with open(filename, "w") as f:
+        f.write(f"{'':<72}C{1:7d}\n")
+        f.write(f"{'compressed ASCII':<72}S{1:7d}\n")
+        f.write(f"{',,;':<72}G{1:7d}\n")
+        # records span lines and are cut inside fields
+        for i in range(0, len(data), 50):
+            f.write(data[i : i + 50] + "\n")
+        f.write(f"{'S      1G      1':<72}T{1:7d}\n")
+
+    iges = pyiges.read(filename)
+    assert iges.desc == "compressed ASCII"
+    assert len(iges) == len(entities)
+    assert [entity.d["entity_type_number"] for entity in iges] == [e[0] for e in entities]
+    assert iges.items[4].d["form_number"] == 15
+    assert iges.items[0].d["entity_label"] == "LABEL"
+    assert iges.items[0].d["status_number"] == 10000
+    assert np.allclose(iges.points()[0].coordinate, [1, 2, 3])
+    curve = iges.composite_curves()[0]
+    assert len(curve.tessellate(delta=0.05)) == 22
+
+    # the flag record and start section without a global section
+    filename.write_text(f"{'':<72}C{1:7d}\n{'compressed ASCII':<72}S{1:7d}\n" + data + "\n")
+    with pytest.raises(RuntimeError, match="without a Global section"):
+        pyiges.read(filename)
+
+
+def test_read_from_memory():
+    import bz2
+    import io
+
+    with open(examples.impeller, "rb") as f:
+        content = f.read()
+    sources = [
+        content,
+        memoryview(content),
+        bytearray(bz2.compress(content)),
+        io.BytesIO(content),
+        io.StringIO(content.decode()),
+    ]
+    for source in sources:
+        iges = pyiges.read(source)
+        assert len(iges) == 4615
+        assert len(iges.bspline_surfaces()) == 247
+
+    # streams are read from their position and left open
+    with open(examples.impeller, "rb") as f:
+        assert len(pyiges.read(f)) == 4615
+        assert not f.closed
+
+    with pytest.raises(TypeError, match="Cannot read IGES data from int"):
+        pyiges.read(1)
+
+
+@adjust_depending_on_package_variant
+def test_read_as_mesh_from_bytes():
+    with open(examples.sample, "rb") as f:
+        content = f.read()
+    assert pyiges.read_as_mesh(content).n_points == pyiges.read_as_mesh(examples.sample).n_points
+
+
+def test_aread():
+    import asyncio
+
+    async def read():
+        reports = []
+
+        async def progress(done, total):
+            reports.append((done, total))
+
+        iges = await pyiges.aread(examples.impeller, progress=progress)
+        return iges, reports
+
+    iges, reports = asyncio.run(read())
+    assert len(iges) == 4615
+    done = [done for done, _ in reports]
+    assert done == sorted(done) and len(done) > 1
+    assert all(total is None for _, total in reports)
+
+
+def test_aread_cancel():
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    executor = ThreadPoolExecutor(1)
+    reports = []
+
+    async def read():
+        def progress(done, total):
+            reports.append(done)
+            task.cancel()
+
+        task = asyncio.ensure_future(
+            pyiges.aread(examples.impeller, executor=executor, progress=progress)
+        )
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(read())
+    executor.shutdown(wait=True)
+    assert reports == [1000]
+
+
+@adjust_depending_on_package_variant
+def test_ato_vtk(impeller):
+    import asyncio
+
+    reports = []
+    mesh = asyncio.run(
+        impeller.ato_vtk(delta=0.1, progress=lambda done, total: reports.append((done, total)))
+    )
+    assert mesh.n_cells == impeller.to_vtk(delta=0.1).n_cells
+    assert reports[-1] == (len(impeller), len(impeller))
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_convert_many(tmp_path, workers):
+    bad = tmp_path / "bad.igs"
+    bad.write_text("not an IGES file\n")
+    paths = [examples.sample, examples.impeller, bad, tmp_path / "missing.igs"]
+    reports = pyiges.convert_many(
+        paths, tmp_path / "out", "ply", workers=workers, delta=0.2, progress=lambda x, **kw: x
+    )
+
+    # reports follow the input order, one failing file does not stop the batch
+    assert [report["path"] for report in reports] == [os.fspath(path) for path in paths]
+    impeller = reports[1]
+    assert impeller["error"] is None
+    assert impeller["n_triangles"] == pyiges.read(examples.impeller).export(
+        tmp_path / "impeller.ply", delta=0.2
+    )
+    assert os.path.isfile(impeller["output"]) and impeller["time"] >= impeller["read_time"] > 0
+    assert reports[0]["error"] is None
+    assert reports[2]["error"]
+    assert "FileNotFoundError" in reports[3]["error"]
+
+    with pytest.raises(ValueError, match="Unsupported format"):
+        pyiges.convert_many(paths, tmp_path, "vtk")
+
+
+_convert_file = pyiges.batch._convert_file
+
+
+def _exit_on_crash_file(path, *args):
+    """Convert a file like ``pyiges.batch._convert_file``, killing the process for crash files."""
+    if os.path.basename(path).startswith("crash"):
+        os._exit(1)
+    return _convert_file(path, *args)
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork", reason="the patch reaches forked workers only"
+)
+def test_convert_many_worker_dies(tmp_path, monkeypatch):
+    monkeypatch.setattr(pyiges.batch, "_convert_file", _exit_on_crash_file)
+    crash = tmp_path / "crash.igs"
+    crash.write_bytes(pathlib.Path(examples.impeller).read_bytes() * 2)
+    paths = [examples.sample, crash, examples.impeller, examples.sample]
+    reports = pyiges.convert_many(
+        paths, tmp_path / "out", workers=2, delta=0.2, progress=lambda x, **kw: x
+    )
+    assert "BrokenProcessPool" in reports[1]["error"]
+    assert [report["error"] for i, report in enumerate(reports) if i != 1] == [None] * 3
+    assert all(os.path.isfile(reports[i]["output"]) for i in (0, 2, 3))
+
+
+def test_cli_convert(tmp_path, capsys):
+    from pyiges.cli import main
+
+    assert main(["convert", examples.impeller, "-o", str(tmp_path), "-j", "0", "-d", "0.2"]) == 0
+    assert (tmp_path / "impeller.stl").is_file()
+    assert "triangles" in capsys.readouterr().out